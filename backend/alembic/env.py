@@ -1,3 +1,4 @@
+from logging.config import fileConfig
 from alembic import context
 from sqlalchemy import engine_from_config, pool
 from app.database import Base
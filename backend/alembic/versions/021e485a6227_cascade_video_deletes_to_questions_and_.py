@@ -0,0 +1,41 @@
+"""cascade video deletes to questions and progress
+
+Deleting a video row removes its questions and progress in the database, so
+the ORM never loads them to delete them one by one.
+
+Revision ID: 021e485a6227
+Revises: ca17bcdadb1c
+Create Date: 2026-10-19 19:19:07.370540
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '021e485a6227'
+down_revision = 'ca17bcdadb1c'
+branch_labels = None
+depends_on = None
+
+
+# Postgres' default constraint names; on SQLite the batch copy gives the
+# (possibly unnamed) reflected constraints the same ones
+NAMING_CONVENTION = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+TABLES = ("questions", "user_progress")
+
+
+def replace_video_fk(table: str, ondelete=None) -> None:
+    name = f"{table}_video_id_fkey"
+    with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch:
+        batch.drop_constraint(name, type_="foreignkey")
+        batch.create_foreign_key(name, "videos", ["video_id"], ["id"], ondelete=ondelete)
+
+
+def upgrade():
+    for table in TABLES:
+        replace_video_fk(table, ondelete="CASCADE")
+
+
+def downgrade():
+    for table in TABLES:
+        replace_video_fk(table)
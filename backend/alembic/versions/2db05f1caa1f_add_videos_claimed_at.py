@@ -0,0 +1,27 @@
+"""add videos.claimed_at
+
+The ingest lease: videos stuck in an ingest stage for INGEST_LEASE_SECONDS are
+reclaimed by a worker. Rows mid-ingest when this runs have no lease and are
+reclaimed at once.
+
+Revision ID: 2db05f1caa1f
+Revises: 633abf33907d
+Create Date: 2026-10-19 19:21:29.232405
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '2db05f1caa1f'
+down_revision = '633abf33907d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("videos", sa.Column("claimed_at", sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("videos", "claimed_at")
@@ -0,0 +1,26 @@
+"""add videos.storage_key
+
+The key of the upload in the media storage backend.
+
+Revision ID: 325eef3afa62
+Revises: b1fdbcbd0183
+Create Date: 2026-10-19 19:20:25.841284
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '325eef3afa62'
+down_revision = 'b1fdbcbd0183'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows keep NULL: their media is found from video_url (see video_storage_key)
+    op.add_column("videos", sa.Column("storage_key", sa.String(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("videos", "storage_key")
@@ -0,0 +1,34 @@
+"""add question variants
+
+Retry variants point at their checkpoint's primary question. Existing
+questions become primaries: variant_of_id NULL, variant_index 0.
+
+Revision ID: 5214c72ff08b
+Revises: 6a4caa16d585
+Create Date: 2026-10-19 19:20:07.490898
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5214c72ff08b'
+down_revision = '6a4caa16d585'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("questions") as batch:
+        batch.add_column(sa.Column("variant_of_id", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("variant_index", sa.Integer(), server_default="0", nullable=True))
+        batch.create_foreign_key("questions_variant_of_id_fkey", "questions", ["variant_of_id"], ["id"], ondelete="CASCADE")
+        batch.create_index("ix_questions_variant_of_id", ["variant_of_id"])
+
+
+def downgrade():
+    with op.batch_alter_table("questions") as batch:
+        batch.drop_index("ix_questions_variant_of_id")
+        batch.drop_constraint("questions_variant_of_id_fkey", type_="foreignkey")
+        batch.drop_column("variant_index")
+        batch.drop_column("variant_of_id")
@@ -0,0 +1,30 @@
+"""soft-delete videos
+
+Deleted videos are hidden at once and purged in the background.
+
+Revision ID: 633abf33907d
+Revises: f81accd3034b
+Create Date: 2026-10-19 19:21:23.158781
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '633abf33907d'
+down_revision = 'f81accd3034b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("videos", sa.Column("deleted_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_videos_deleted_at", "videos", ["deleted_at"])
+    # The purge deletes progress by video in batches
+    op.create_index("ix_user_progress_video_id", "user_progress", ["video_id"])
+
+
+def downgrade():
+    op.drop_index("ix_user_progress_video_id", table_name="user_progress")
+    op.drop_index("ix_videos_deleted_at", table_name="videos")
+    op.drop_column("videos", "deleted_at")
@@ -0,0 +1,39 @@
+"""add transcript_chunks
+
+Embedded transcript chunks for prompt retrieval. Videos ingested earlier have
+their index built in memory from the transcript when first used.
+
+Revision ID: 6a4caa16d585
+Revises: e08873c8982e
+Create Date: 2026-10-19 19:19:56.271186
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '6a4caa16d585'
+down_revision = 'e08873c8982e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "transcript_chunks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("video_id", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("start_time", sa.Float(), nullable=True),
+        sa.Column("end_time", sa.Float(), nullable=True),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("embedding", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(["video_id"], ["videos.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_transcript_chunks_id", "transcript_chunks", ["id"])
+    op.create_index("ix_transcript_chunks_video_id", "transcript_chunks", ["video_id"])
+
+
+def downgrade():
+    op.drop_table("transcript_chunks")
@@ -0,0 +1,50 @@
+"""add analytics counters
+
+Per-question and per-video counters moved by atomic upserts as answers are
+graded. Fill them for existing progress with python scripts/rebuild_analytics.py.
+
+Revision ID: 80f558d4782a
+Revises: 325eef3afa62
+Create Date: 2026-10-19 19:20:34.720806
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '80f558d4782a'
+down_revision = '325eef3afa62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "question_stats",
+        sa.Column("question_id", sa.Integer(), nullable=False),
+        sa.Column("video_id", sa.Integer(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("learners_reached", sa.Integer(), nullable=False),
+        sa.Column("first_try_correct", sa.Integer(), nullable=False),
+        sa.Column("completions", sa.Integer(), nullable=False),
+        sa.Column("failures_before_success", sa.Integer(), nullable=False),
+        sa.Column("exhausted_retries", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["question_id"], ["questions.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["video_id"], ["videos.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("question_id"),
+    )
+    op.create_index("ix_question_stats_video_id", "question_stats", ["video_id"])
+    op.create_table(
+        "video_stats",
+        sa.Column("video_id", sa.Integer(), nullable=False),
+        sa.Column("learners_started", sa.Integer(), nullable=False),
+        sa.Column("learners_completed", sa.Integer(), nullable=False),
+        sa.Column("final_score_sum", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["video_id"], ["videos.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("video_id"),
+    )
+
+
+def downgrade():
+    op.drop_table("video_stats")
+    op.drop_table("question_stats")
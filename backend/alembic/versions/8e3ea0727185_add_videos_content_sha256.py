@@ -0,0 +1,28 @@
+"""add videos.content_sha256
+
+Hash of the uploaded file, so bulk imports skip recordings already in the
+catalog. Videos uploaded earlier have none and are not matched.
+
+Revision ID: 8e3ea0727185
+Revises: cb4970d14370
+Create Date: 2026-10-19 19:21:02.353110
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '8e3ea0727185'
+down_revision = 'cb4970d14370'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("videos", sa.Column("content_sha256", sa.String(length=64), nullable=True))
+    op.create_index("ix_videos_content_sha256", "videos", ["content_sha256"])
+
+
+def downgrade():
+    op.drop_index("ix_videos_content_sha256", table_name="videos")
+    op.drop_column("videos", "content_sha256")
@@ -0,0 +1,31 @@
+"""add progress start and completion times
+
+When a learner opened and completed a video, for the completion-time
+leaderboards.
+
+Revision ID: 972f3fb6a8f9
+Revises: 8e3ea0727185
+Create Date: 2026-10-19 19:21:10.265911
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '972f3fb6a8f9'
+down_revision = '8e3ea0727185'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Left NULL on existing rows: their learners rank by accuracy but not by time
+    with op.batch_alter_table("user_progress") as batch:
+        batch.add_column(sa.Column("started_at", sa.DateTime(), nullable=True))
+        batch.add_column(sa.Column("completed_at", sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("user_progress") as batch:
+        batch.drop_column("completed_at")
+        batch.drop_column("started_at")
@@ -0,0 +1,25 @@
+"""index questions by video and timestamp
+
+Serves the per-video checkpoint lookups in timestamp order.
+
+Revision ID: b0f0345313b4
+Revises: 021e485a6227
+Create Date: 2026-10-19 19:19:35.444302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b0f0345313b4'
+down_revision = '021e485a6227'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_questions_video_id_timestamp", "questions", ["video_id", "timestamp"])
+
+
+def downgrade():
+    op.drop_index("ix_questions_video_id_timestamp", table_name="questions")
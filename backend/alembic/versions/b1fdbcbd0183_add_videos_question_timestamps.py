@@ -0,0 +1,25 @@
+"""add videos.question_timestamps
+
+Checkpoints requested at upload, read by whichever process runs the ingest.
+
+Revision ID: b1fdbcbd0183
+Revises: 5214c72ff08b
+Create Date: 2026-10-19 19:20:18.658018
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b1fdbcbd0183'
+down_revision = '5214c72ff08b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("videos", sa.Column("question_timestamps", sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("videos", "question_timestamps")
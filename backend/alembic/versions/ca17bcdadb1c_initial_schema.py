@@ -0,0 +1,94 @@
+"""initial schema
+
+Users, videos, questions and progress as they were before migrations were
+kept. A database already holding these tables is stamped with this revision
+(`alembic stamp ca17bcdadb1c`) and upgraded from there.
+
+Revision ID: ca17bcdadb1c
+Revises: 
+Create Date: 2026-10-19 19:18:56.554706
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'ca17bcdadb1c'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("is_admin", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "videos",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("video_url", sa.String(), nullable=False),
+        sa.Column("thumbnail_url", sa.String(), nullable=True),
+        sa.Column("duration", sa.Float(), nullable=True),
+        sa.Column("transcript", sa.Text(), nullable=True),
+        sa.Column("is_published", sa.Boolean(), nullable=True),
+        sa.Column("uploader_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["uploader_id"], ["users.id"], name="videos_uploader_id_fkey"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_videos_id", "videos", ["id"])
+
+    op.create_table(
+        "questions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("video_id", sa.Integer(), nullable=True),
+        sa.Column("timestamp", sa.Float(), nullable=False),
+        sa.Column("question_type", sa.String(), nullable=False),
+        sa.Column("question_text", sa.Text(), nullable=False),
+        sa.Column("options", sa.JSON(), nullable=True),
+        sa.Column("correct_answer", sa.String(), nullable=False),
+        sa.Column("explanation", sa.Text(), nullable=True),
+        sa.Column("retry_limit", sa.Integer(), nullable=True),
+        sa.Column("rewind_seconds", sa.Float(), nullable=True),
+        sa.Column("is_final_quiz", sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(["video_id"], ["videos.id"], name="questions_video_id_fkey"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_questions_id", "questions", ["id"])
+
+    op.create_table(
+        "user_progress",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("video_id", sa.Integer(), nullable=True),
+        sa.Column("current_timestamp", sa.Float(), nullable=True),
+        sa.Column("completed_questions", sa.JSON(), nullable=True),
+        sa.Column("failed_attempts", sa.JSON(), nullable=True),
+        sa.Column("is_completed", sa.Boolean(), nullable=True),
+        sa.Column("final_score", sa.Float(), nullable=True),
+        sa.Column("last_updated", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], name="user_progress_user_id_fkey"),
+        sa.ForeignKeyConstraint(["video_id"], ["videos.id"], name="user_progress_video_id_fkey"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_user_progress_id", "user_progress", ["id"])
+
+
+def downgrade():
+    op.drop_table("user_progress")
+    op.drop_table("questions")
+    op.drop_table("videos")
+    op.drop_table("users")
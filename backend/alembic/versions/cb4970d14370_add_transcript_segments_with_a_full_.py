@@ -0,0 +1,63 @@
+"""add transcript_segments with a full-text index
+
+Whisper segments for catalog-wide search: a generated tsvector with a GIN
+index on Postgres, an external-content FTS5 table kept in sync by triggers on
+SQLite. Index videos ingested earlier with python scripts/reindex_search.py.
+
+Revision ID: cb4970d14370
+Revises: 80f558d4782a
+Create Date: 2026-10-19 19:20:46.435260
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'cb4970d14370'
+down_revision = '80f558d4782a'
+branch_labels = None
+depends_on = None
+
+
+POSTGRES_SEARCH_INDEX = (
+    "ALTER TABLE transcript_segments ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', text)) STORED",
+    "CREATE INDEX ix_transcript_segments_search_vector ON transcript_segments USING GIN (search_vector)",
+)
+SQLITE_SEARCH_INDEX = (
+    "CREATE VIRTUAL TABLE transcript_segments_fts USING fts5("
+    "text, content='transcript_segments', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER transcript_segments_ai AFTER INSERT ON transcript_segments BEGIN "
+    "INSERT INTO transcript_segments_fts(rowid, text) VALUES (new.id, new.text); END",
+    "CREATE TRIGGER transcript_segments_ad AFTER DELETE ON transcript_segments BEGIN "
+    "INSERT INTO transcript_segments_fts(transcript_segments_fts, rowid, text) VALUES ('delete', old.id, old.text); END",
+    "CREATE TRIGGER transcript_segments_au AFTER UPDATE ON transcript_segments BEGIN "
+    "INSERT INTO transcript_segments_fts(transcript_segments_fts, rowid, text) VALUES ('delete', old.id, old.text); "
+    "INSERT INTO transcript_segments_fts(rowid, text) VALUES (new.id, new.text); END",
+)
+
+
+def upgrade():
+    op.create_table(
+        "transcript_segments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("video_id", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("start_time", sa.Float(), nullable=True),
+        sa.Column("end_time", sa.Float(), nullable=True),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(["video_id"], ["videos.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_transcript_segments_video_id", "transcript_segments", ["video_id"])
+    # The full-text index as app.models.transcript creates it with the table
+    dialect = op.get_bind().dialect.name
+    for statement in {"postgresql": POSTGRES_SEARCH_INDEX, "sqlite": SQLITE_SEARCH_INDEX}.get(dialect, ()):
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS transcript_segments_fts")
+    # The Postgres search column and GIN index go with the table; so do the SQLite triggers
+    op.drop_table("transcript_segments")
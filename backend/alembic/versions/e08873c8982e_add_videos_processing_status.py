@@ -0,0 +1,26 @@
+"""add videos.processing_status
+
+The ingest stage, streamed to admins while a video is processed.
+
+Revision ID: e08873c8982e
+Revises: b0f0345313b4
+Create Date: 2026-10-19 19:19:48.539936
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e08873c8982e'
+down_revision = 'b0f0345313b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Videos from before ingest stages existed are finished
+    op.add_column("videos", sa.Column("processing_status", sa.String(), server_default="ready", nullable=True))
+
+
+def downgrade():
+    op.drop_column("videos", "processing_status")
@@ -0,0 +1,25 @@
+"""add videos.storyboard
+
+Seek-preview sprite sheets and their layout; NULL until generated at ingest.
+
+Revision ID: f81accd3034b
+Revises: 972f3fb6a8f9
+Create Date: 2026-10-19 19:21:19.786999
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f81accd3034b'
+down_revision = '972f3fb6a8f9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("videos", sa.Column("storyboard", sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("videos", "storyboard")
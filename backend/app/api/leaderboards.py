@@ -0,0 +1,98 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.auth import get_current_user
+from app.database import get_db
+from app.models import User
+from app.schemas import LeaderboardResponse, MyRankResponse
+from app.services.leaderboard import (
+    GLOBAL_METRICS, VIDEO_METRICS, ensure_built, global_board, leaderboard, ranked_entries, video_board,
+)
+from app.utils.responses import json_response
+
+router = APIRouter()
+
+MAX_PAGE_SIZE = 100
+
+
+def check_metric(metric: str, allowed) -> None:
+    if metric not in allowed:
+        raise HTTPException(status_code=422, detail=f"metric must be one of: {', '.join(allowed)}")
+
+
+def read_page(db: Session, board: str, label: str, metric: str, limit: int, offset: int) -> LeaderboardResponse:
+    ensure_built(db)
+    top = leaderboard.top(board, limit, offset)
+    ranked = [(user_id, (offset + position, score)) for position, (user_id, score) in enumerate(top)]
+    return LeaderboardResponse(
+        board=label,
+        metric=metric,
+        total=leaderboard.size(board),
+        offset=offset,
+        limit=limit,
+        entries=ranked_entries(db, board, ranked),
+    )
+
+
+def read_my_rank(db: Session, board: str, label: str, metric: str, user: User) -> MyRankResponse:
+    ensure_built(db)
+    found = leaderboard.rank(board, user.id)
+    entries = ranked_entries(db, board, [(user.id, found)]) if found else []
+    return MyRankResponse(
+        board=label,
+        metric=metric,
+        total=leaderboard.size(board),
+        entry=entries[0] if entries else None,
+    )
+
+
+@router.get("/videos/{video_id}", response_model=LeaderboardResponse)
+async def video_leaderboard(
+    video_id: int,
+    metric: str = "accuracy",
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Top learners of one video by first-try accuracy (ties: faster first) or completion time."""
+    check_metric(metric, VIDEO_METRICS)
+    page = await run_in_threadpool(read_page, db, video_board(video_id, metric), f"video:{video_id}", metric, limit, offset)
+    return json_response(page, LeaderboardResponse)
+
+
+@router.get("/videos/{video_id}/me", response_model=MyRankResponse)
+async def my_video_rank(
+    video_id: int,
+    metric: str = "accuracy",
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    check_metric(metric, VIDEO_METRICS)
+    rank = await run_in_threadpool(read_my_rank, db, video_board(video_id, metric), f"video:{video_id}", metric, current_user)
+    return json_response(rank, MyRankResponse)
+
+
+@router.get("/global", response_model=LeaderboardResponse)
+async def global_leaderboard(
+    metric: str = "accuracy",
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Top learners over all videos by first-try accuracy (ties: more videos first) or videos completed."""
+    check_metric(metric, GLOBAL_METRICS)
+    page = await run_in_threadpool(read_page, db, global_board(metric), "global", metric, limit, offset)
+    return json_response(page, LeaderboardResponse)
+
+
+@router.get("/global/me", response_model=MyRankResponse)
+async def my_global_rank(
+    metric: str = "accuracy",
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    check_metric(metric, GLOBAL_METRICS)
+    rank = await run_in_threadpool(read_my_rank, db, global_board(metric), "global", metric, current_user)
+    return json_response(rank, MyRankResponse)
@@ -1,34 +1,50 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.auth import get_current_user
-from app.models import User, UserProgress
+from app.models import User, UserProgress, Video
 from app.schemas import ProgressResponse, ProgressUpdate
+from app.utils.responses import json_response
 
 router = APIRouter()
 
+def find_progress(db: Session, user_id: int, video_id: int):
+    """The caller's progress row (None if there is none yet) in the same query that
+    checks the video exists and is not deleted; 404 otherwise."""
+    row = (
+        db.query(Video.id, UserProgress)
+        .outerjoin(UserProgress, and_(UserProgress.video_id == Video.id, UserProgress.user_id == user_id))
+        .filter(Video.id == video_id, Video.deleted_at.is_(None))
+        .first()
+    )
+    if not row:
+        raise HTTPException(status_code=404, detail="Video not found")
+    return row[1]
+
 @router.get("/{video_id}", response_model=ProgressResponse)
 async def get_progress(
     video_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    progress = db.query(UserProgress).filter(
-        UserProgress.user_id == current_user.id,
-        UserProgress.video_id == video_id
-    ).first()
+    progress = find_progress(db, current_user.id, video_id)
     
     if not progress:
-        # Create new progress record
+        # Create new progress record; the first visit starts the completion clock
         progress = UserProgress(
             user_id=current_user.id,
             video_id=video_id
         )
         db.add(progress)
+        # Validate after the INSERT (which fills in the column defaults) and before
+        # the commit, which would expire the row and cost a SELECT to reload it
+        db.flush()
+        response = ProgressResponse.model_validate(progress)
         db.commit()
-        db.refresh(progress)
+        return json_response(response, ProgressResponse)
     
-    return progress
+    return json_response(ProgressResponse.model_validate(progress), ProgressResponse)
 
 @router.put("/{video_id}")
 async def update_progress(
@@ -37,10 +53,7 @@ async def update_progress(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    progress = db.query(UserProgress).filter(
-        UserProgress.user_id == current_user.id,
-        UserProgress.video_id == video_id
-    ).first()
+    progress = find_progress(db, current_user.id, video_id)
     
     if not progress:
         progress = UserProgress(
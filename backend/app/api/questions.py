@@ -1,10 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, raiseload
+from typing import Optional
 from app.database import get_db
-from app.auth import get_current_user
-from app.models import User, Question, UserProgress
-from app.schemas import AnswerSubmit, AnswerResponse
+from app.models import User, Question, UserProgress, Video
+from app.schemas import AnswerSubmit, AnswerResponse, QuestionResponse
+from app.services.analytics import AnswerStats
 from app.services.gemini_service import GeminiService
+from app.services.leaderboard import completion_for, record_completion
+from app.services.idempotency import request_fingerprint, run_idempotent
+from app.services.grading import grade_answer, copy_json_columns, record_attempt, update_completion
+from app.services.rate_limit import enforce_llm_budget, rate_limited, try_spend_llm_budget
+from app.services.retrieval import retrieve_context
+from app.services.variants import select_variant
 
 router = APIRouter()
 
@@ -12,31 +21,51 @@ router = APIRouter()
 async def submit_answer(
     question_id: int,
     answer_data: AnswerSubmit,
-    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None),
+    current_user: User = Depends(rate_limited("answer")),
     db: Session = Depends(get_db)
 ):
-    # Get question
-    question = db.query(Question).filter(Question.id == question_id).first()
-    if not question:
+    """Grades one answer. A retry sent with the same Idempotency-Key gets the first
+    response back instead of being counted as another attempt."""
+    return await run_idempotent(
+        idempotency_key,
+        f"answer:{current_user.id}",
+        request_fingerprint("answer", question_id, answer_data),
+        lambda: answer_question(question_id, answer_data, current_user, db),
+    )
+
+
+async def answer_question(question_id: int, answer_data: AnswerSubmit, current_user: User, db: Session) -> AnswerResponse:
+    # Get the checkpoint question together with its variants (primary first), unless its video is deleted
+    pool = (
+        db.query(Question)
+        .join(Video, Video.id == Question.video_id)
+        .options(raiseload("*"))
+        .filter(or_(Question.id == question_id, Question.variant_of_id == question_id), Video.deleted_at.is_(None))
+        .order_by(Question.variant_index)
+        .all()
+    )
+    if not pool or pool[0].id != question_id or pool[0].variant_of_id is not None:
         raise HTTPException(status_code=404, detail="Question not found")
+    checkpoint = pool[0]
     
     # Get or create user progress
     progress = db.query(UserProgress).filter(
         UserProgress.user_id == current_user.id,
-        UserProgress.video_id == question.video_id
-    ).first()
+        UserProgress.video_id == checkpoint.video_id
+    ).options(raiseload("*")).first()
     
     if not progress:
+        # Inserted together with the grading result on the single commit below
         progress = UserProgress(
             user_id=current_user.id,
-            video_id=question.video_id
+            video_id=checkpoint.video_id
         )
         db.add(progress)
-        db.commit()
-        db.refresh(progress)
+    copy_json_columns(progress)
     
     # Check if already completed
-    if question_id in (progress.completed_questions or []):
+    if question_id in progress.completed_questions:
         return AnswerResponse(
             correct=True,
             explanation="Already completed",
@@ -44,62 +73,83 @@ async def submit_answer(
             retries_left=0
         )
     
-    # Grade the answer
-    grading_result = GeminiService.grade_answer(
-        question.question_text,
+    # Grade against the variant this user was shown on this attempt
+    question = select_variant(pool, current_user.id, question_id, progress.failed_attempts.get(str(question_id), 0))
+    
+    # Grade the answer; Gemini is only called (off the event loop) for free-text answers
+    grading_result = await run_in_threadpool(
+        grade_answer,
+        question,
         answer_data.answer,
-        question.correct_answer
+        lambda: retrieve_context(db, question.video_id, question.question_text, timestamp=question.timestamp),
+        # A 429 here happens before the attempt is recorded, so the learner can simply resubmit
+        lambda: enforce_llm_budget(current_user.id)
     )
     
-    # Update failed attempts
-    failed_attempts = progress.failed_attempts or {}
-    attempts = failed_attempts.get(str(question_id), 0)
+    stats = AnswerStats(progress)
+    failed_before = progress.failed_attempts.get(str(question_id), 0)
+    attempts = record_attempt(progress, question_id, grading_result["correct"], answer_data.current_timestamp, checkpoint.retry_limit)
+    stats.attempt(question_id, failed_before, grading_result["correct"], checkpoint.retry_limit)
     
     if grading_result["correct"]:
-        # Mark as completed
-        completed_questions = progress.completed_questions or []
-        completed_questions.append(question_id)
-        progress.completed_questions = completed_questions
-        
-        # Update current timestamp
-        progress.current_timestamp = answer_data.current_timestamp
-        
-        db.commit()
-        
-        return AnswerResponse(
+        question_ids = [
+            qid for (qid,) in db.query(Question.id).filter(
+                Question.video_id == checkpoint.video_id,
+                Question.variant_of_id.is_(None)
+            )
+        ]
+        update_completion(progress, question_ids)
+        response = AnswerResponse(
             correct=True,
             explanation=grading_result["explanation"],
             rewind_seconds=0,
-            retries_left=question.retry_limit - attempts
+            retries_left=checkpoint.retry_limit - attempts
         )
-    else:
-        # Increment failed attempts
-        attempts += 1
-        failed_attempts[str(question_id)] = attempts
-        progress.failed_attempts = failed_attempts
-        
+        completion = completion_for(progress, question_ids) if stats.completed_now else None
+        stats.flush(db)
         db.commit()
-        
-        retries_left = max(0, question.retry_limit - attempts)
-        
-        if retries_left == 0:
-            # Generate summary for failed question
-            summary = GeminiService.generate_summary(
-                question.video.transcript or "",
-                question.question_text
-            )
-            
-            return AnswerResponse(
-                correct=False,
-                explanation=grading_result["explanation"],
-                rewind_seconds=question.rewind_seconds,
-                retries_left=0,
-                summary=summary
-            )
-        else:
-            return AnswerResponse(
-                correct=False,
-                explanation=grading_result["explanation"],
-                rewind_seconds=0,
-                retries_left=retries_left
+        if completion:
+            await run_in_threadpool(record_completion, completion)
+        return response
+    
+    # Read what the response needs before the commit expires the question
+    retries_left = max(0, checkpoint.retry_limit - attempts)
+    rewind_seconds = checkpoint.rewind_seconds
+    question_text = question.question_text
+    video_id = question.video_id
+    timestamp = question.timestamp
+    next_question = None
+    if retries_left > 0 and len(pool) > 1:
+        # Serve a different pre-generated question on the retry, no LLM call needed
+        next_variant = select_variant(pool, current_user.id, question_id, attempts)
+        next_question = QuestionResponse.model_validate(next_variant).model_copy(update={"id": question_id})
+    stats.flush(db)
+    db.commit()
+    
+    if retries_left == 0:
+        summary = None
+        # The attempt is already saved, so without LLM budget the summary is skipped rather than refused
+        if try_spend_llm_budget(current_user.id) == 0:
+            # Summarize only the transcript chunks relevant to the failed question
+            context = await run_in_threadpool(retrieve_context, db, video_id, question_text, timestamp=timestamp)
+            summary = await run_in_threadpool(
+                GeminiService.generate_summary,
+                context,
+                question_text
             )
+        
+        return AnswerResponse(
+            correct=False,
+            explanation=grading_result["explanation"],
+            rewind_seconds=rewind_seconds,
+            retries_left=0,
+            summary=summary
+        )
+    
+    return AnswerResponse(
+        correct=False,
+        explanation=grading_result["explanation"],
+        rewind_seconds=0,
+        retries_left=retries_left,
+        next_question=next_question
+    )
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.auth import get_current_user
+from app.models import User
+from app.schemas import SearchResponse, SearchResult
+from app.services.search import search_transcripts
+from app.utils.responses import json_response
+
+router = APIRouter()
+
+MAX_OFFSET = 1000
+
+@router.get("/", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=MAX_OFFSET),
+    video_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Searches lecture transcripts; each result points at the moment in the video it was said.
+
+    Learners search published videos, admins every video. A very common term is
+    ranked among its first matches only; the response then has `truncated` set.
+    """
+    rows, has_more, truncated = search_transcripts(
+        db, q, limit, offset, video_id=video_id, include_unpublished=current_user.is_admin
+    )
+    return json_response(SearchResponse(
+        query=q,
+        results=[
+            SearchResult(
+                video_id=row["video_id"],
+                video_title=row["title"],
+                start_time=row["start_time"],
+                end_time=row["end_time"],
+                snippet=row["snippet"],
+                rank=row["rank"],
+                link=f"/video/{row['video_id']}?t={int(row['start_time'] or 0)}"
+            )
+            for row in rows
+        ],
+        offset=offset,
+        limit=limit,
+        has_more=has_more and offset + limit <= MAX_OFFSET,
+        truncated=truncated
+    ), SearchResponse)
@@ -1,82 +1,149 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.database import get_db
-from app.auth import get_current_admin_user
-from app.models import User, Video, Question
-from app.schemas import VideoResponse, QuestionResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, status, UploadFile, File, Form, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import and_
+from sqlalchemy.orm import Session, defer, raiseload, selectinload
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+from app.database import get_db, SessionLocal
+from app.auth import get_current_admin_user, get_current_user, get_admin_user_for_stream
+from app.models import User, Video, Question, UserProgress
+from app.schemas import (
+    VideoResponse, QuestionResponse, ProgressResponse, LearnerSessionResponse, VideoAnalyticsResponse,
+    CheckpointResponse, CheckpointWindowResponse,
+    BatchAnswerSubmit, BatchAnswerResult, BatchAnswerResponse
+)
 from app.services.gemini_service import GeminiService
+from app.services.analytics import AnswerStats, get_video_analytics
+from app.services.catalog_cache import catalog_cache, CatalogEntry
+from app.services.leaderboard import completion_for, record_completion
+from app.services.lifecycle import purge_video, soft_delete_video, unrank_video
+from app.services.idempotency import request_fingerprint, run_idempotent
+from app.services.ingest import ingest_video
+from app.services.events import event_broker, ingest_channel, publish_ingest_event, TERMINAL_STAGES
+from app.services.grading import grade_locally, copy_json_columns, record_attempt, update_completion
+from app.services.rate_limit import enforce_llm_budget, rate_limited, try_spend_llm_budget
+from app.services.retrieval import retrieve_context, index_cache
+from app.services.storage import storage, content_sha256, media_url
+from app.services.storyboard import render_vtt, storyboard_cache_control, storyboard_url
+from app.services.variants import group_variant_pools, select_variant
+from app.utils.responses import json_response
+import asyncio
 import os
-import whisper
 import uuid
 import json
-import subprocess
 
-WHISPER_MODEL = whisper.load_model("base")
+def to_video_response(video: Video) -> VideoResponse:
+    """Validates a video with the URL learners load it from (static path, CDN or presigned)."""
+    response = VideoResponse.model_validate(video)
+    response.video_url = media_url(video.storage_key, video.video_url)
+    response.storyboard_url = storyboard_url(video.id, video.storyboard)
+    return response
 
-def generate_local_transcript(video_path: str) -> str | None:
-    """Uses the local Whisper model to transcribe the video file."""
-    if not os.path.exists(video_path):
-        print(f"Error: Video file not found at {video_path}")
-        return None
-    
-    try:
-        print(f"Starting local transcription using Whisper for {video_path}...")
-        # Whisper automatically handles many video formats due to FFmpeg being available
-        result = WHISPER_MODEL.transcribe(video_path)
-        
-        # Whisper returns a dictionary containing the transcribed text
-        transcript_text = result["text"].strip()
-        print("Local transcription completed successfully.")
-        return transcript_text
-        
-    except Exception as e:
-        print(f"Error during Whisper transcription: {e}")
-        return None
-
-def get_video_duration(video_path: str) -> float:
-    """Uses ffprobe (installed in Dockerfile) to extract duration reliably."""
-    try:
-        # Command to run ffprobe and output duration in seconds
-        cmd = [
-            'ffprobe',
-            '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            video_path
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        duration = float(result.stdout.strip())
-        return duration
-    except Exception as e:
-        print(f"Error calculating video duration: {e}")
-        return 0.0
+def build_catalog_entry(video: Video) -> CatalogEntry:
+    """Validates a video with its (timestamp-ordered) questions into a cacheable entry.
+
+    Only primary questions are listed as checkpoints; variants go into per-checkpoint pools.
+    """
+    pools = group_variant_pools(video.questions)
+    return CatalogEntry(
+        # Presigned URLs outlive the catalog TTL (MEDIA_URL_EXPIRY_SECONDS vs CATALOG_CACHE_TTL_SECONDS)
+        video=to_video_response(video),
+        questions=[QuestionResponse.model_validate(q) for q in video.questions if q.variant_of_id is None],
+        variant_pools={
+            checkpoint_id: [QuestionResponse.model_validate(q) for q in pool]
+            for checkpoint_id, pool in pools.items()
+            if len(pool) > 1
+        },
+    )
+
+def get_catalog_entry(db: Session, video_id: int) -> CatalogEntry:
+    """Returns the cached video + questions, loading them with two queries on a miss."""
+    entry = catalog_cache.get(video_id)
+    if entry is not None:
+        return entry
+    video = (
+        db.query(Video)
+        .options(
+            defer(Video.transcript),
+            selectinload(Video.questions).raiseload("*"),
+            raiseload("*"),
+        )
+        .filter(Video.id == video_id, Video.deleted_at.is_(None))
+        .first()
+    )
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+    return catalog_cache.set(video_id, build_catalog_entry(video))
 
 router = APIRouter()
 
 @router.get("/", response_model=List[VideoResponse])
 async def get_videos(db: Session = Depends(get_db)):
-    videos = db.query(Video).filter(Video.is_published == True).all()
-    return videos
+    # The transcript is never part of VideoResponse, so keep it out of the row
+    videos = db.query(Video).options(defer(Video.transcript), raiseload("*")).filter(
+        Video.is_published == True, Video.deleted_at.is_(None)
+    ).all()
+    return json_response([to_video_response(video) for video in videos], List[VideoResponse])
 
 @router.get("/{video_id}", response_model=VideoResponse)
 async def get_video(video_id: int, db: Session = Depends(get_db)):
-    video = db.query(Video).filter(Video.id == video_id).first()
+    video = db.query(Video).options(defer(Video.transcript), raiseload("*")).filter(
+        Video.id == video_id, Video.deleted_at.is_(None)
+    ).first()
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
-    return video
+    return json_response(to_video_response(video), VideoResponse)
+
+@router.get("/{video_id}/storyboard.vtt")
+async def get_storyboard(video_id: int, db: Session = Depends(get_db)):
+    """WebVTT seek-preview index: each cue is a sprite URL with the tile's #xywh fragment.
+
+    Unauthenticated like the media it points to, so a <track> or fetch can load it.
+    """
+    row = db.query(Video.storyboard).filter(Video.id == video_id, Video.deleted_at.is_(None)).first()
+    if not row or not row.storyboard:
+        raise HTTPException(status_code=404, detail="Storyboard not found")
+    return Response(
+        content=render_vtt(row.storyboard, storage.url),
+        media_type="text/vtt",
+        headers={"Cache-Control": storyboard_cache_control()},
+    )
 
 
 @router.post("/upload", response_model=dict)
 async def upload_video(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     description: Optional[str] = Form(None),
     question_timestamps: str = Form(...),  # JSON string
     video_file: UploadFile = File(...),
+    idempotency_key: Optional[str] = Header(None),
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
+    """Stores an uploaded video and starts its ingest. A retry sent with the same
+    Idempotency-Key returns the first video instead of creating (and transcribing) another."""
+    return await run_idempotent(
+        idempotency_key,
+        f"upload:{current_user.id}",
+        request_fingerprint(
+            "upload", title, description, question_timestamps,
+            video_file.filename, video_file.content_type, video_file.size
+        ),
+        lambda: create_video(background_tasks, title, description, question_timestamps, video_file, current_user, db),
+    )
+
+
+async def create_video(
+    background_tasks: BackgroundTasks,
+    title: str,
+    description: Optional[str],
+    question_timestamps: str,
+    video_file: UploadFile,
+    current_user: User,
+    db: Session
+) -> dict:
     # Parse question timestamps
     try:
         timestamps = json.loads(question_timestamps)
@@ -87,151 +154,397 @@ async def upload_video(
     except Exception:
         timestamps = []
 
-    # Save video file
-    video_filename = f"{uuid.uuid4()}_{video_file.filename}"
-    uploads_dir = os.path.join(os.getcwd(), "uploads", "videos")
-    os.makedirs(uploads_dir, exist_ok=True)
-    video_path = os.path.join(uploads_dir, video_filename)
-
-    with open(video_path, "wb") as buffer:
-        content = await video_file.read()
-        buffer.write(content)
+    # Stream the upload into media storage without holding it in memory
+    storage_key = f"videos/{uuid.uuid4()}_{os.path.basename(video_file.filename or 'video')}"
+    content_hash = await run_in_threadpool(content_sha256, video_file.file)
+    await run_in_threadpool(storage.put, storage_key, video_file.file, video_file.content_type)
 
-    # Create video record
+    # Create video record; it stays unpublished until ingest has generated its questions
     video = Video(
         title=title,
         description=description,
-        video_url=f"/uploads/videos/{video_filename}",
+        # Responses resolve the URL from storage_key; video_url only matters for older rows
+        video_url=storage_key,
+        storage_key=storage_key,
+        content_sha256=content_hash,
         uploader_id=current_user.id,
-        is_published=True
+        is_published=False,
+        processing_status="uploaded",
+        question_timestamps=timestamps
     )
     db.add(video)
     db.commit()
     db.refresh(video)
+    publish_ingest_event(video.id, "uploaded")
 
-    print(f"Starting transcript generation for file at: {video_path}")
-    # Call the local Whisper function you just defined
-    transcript = generate_local_transcript(video_path)
-    
-    if transcript:
-        # Store the generated transcript
-        video.transcript = transcript
-
-        video.duration = get_video_duration(video_path) 
-        print(f"Video duration calculated: {video.duration} seconds")
-        
-        # Commit the changes (transcript update) to the database
-        db.add(video)
-        db.commit()
-        print("Transcript successfully saved to database.")
-    else:
-        # If transcription fails, the video.transcript remains None, and the 
-        # fallback logic in the next section will handle question generation.
-        print("Warning: Transcript generation failed or returned empty. Using fallback questions.")
-        
-    # Create questions for each timestamp. If transcript is available use OpenAI, otherwise create fallback questions.
-    if timestamps:
-        for timestamp in timestamps:
-            if video.transcript:
-                transcript_segment = video.transcript[:int(timestamp * 10)]  # Rough estimate
-
-                # question_data = GeminiService.generate_question(transcript_segment, timestamp, "mcq")
-                # question_text = question_data.get("question_text")
-                # options = question_data.get("options")
-                # correct_answer = question_data.get("correct_answer")
-                # explanation = question_data.get("explanation")
-                try:
-                    question_data = GeminiService.generate_question(transcript_segment, timestamp, "mcq")
-                    question_text = question_data.get("question_text")
-                    options = question_data.get("options")
-                    correct_answer = question_data.get("correct_answer")
-                    explanation = question_data.get("explanation")
-                except Exception:
-                    question_text = f"At {int(timestamp)}s: What is the main idea discussed around this time?"
-                    options = ["Main idea A", "Main idea B", "Main idea C", "Main idea D"]
-                    correct_answer = "Main idea A"
-                    explanation = "Fallback question generated because Gemini failed."
-            else:
-                # Fallback simple question when no transcript available
-                question_text = f"At {int(timestamp)}s: What is the main idea discussed around this time?"
-                options = ["Main idea A", "Main idea B", "Main idea C", "Main idea D"]
-                correct_answer = "Main idea A"
-                explanation = "Fallback question generated because no transcript was available."
-
-            question = Question(
-                video_id=video.id,
-                timestamp=timestamp,
-                question_type="mcq",
-                question_text=question_text,
-                options=options,
-                correct_answer=correct_answer,
-                explanation=explanation,
+    # Transcription and question generation run after the response is sent, here or
+    # in the ingest worker; progress is streamed on GET /videos/{video_id}/events
+    if settings.ingest_mode == "inline":
+        background_tasks.add_task(ingest_video, video.id, storage_key, timestamps)
+
+    return {"video_id": video.id, "status": "processing"}
+
+
+@router.delete("/{video_id}", status_code=status.HTTP_202_ACCEPTED)
+async def delete_video(
+    video_id: int,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Hides the video at once, then takes it off the leaderboards and purges its
+    rows and media in the background.
+
+    The purge runs after the response here, or in the ingest worker in worker mode;
+    scripts/collect_garbage.py catches up on any it missed.
+    """
+    if not soft_delete_video(db, video_id):
+        raise HTTPException(status_code=404, detail="Video not found")
+    catalog_cache.invalidate(video_id)
+    index_cache.invalidate(video_id)
+    background_tasks.add_task(unrank_video, video_id)
+    if settings.ingest_mode == "inline":
+        background_tasks.add_task(purge_video, video_id)
+    return {"video_id": video_id, "status": "deleting"}
+
+@router.get("/{video_id}/analytics", response_model=VideoAnalyticsResponse)
+async def get_analytics(
+    video_id: int,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Per-checkpoint difficulty and drop-off, read from counters kept up to date while answers are graded."""
+    analytics = get_video_analytics(db, video_id)
+    if analytics is None:
+        raise HTTPException(status_code=404, detail="Video not found or has no questions")
+    return json_response(analytics, VideoAnalyticsResponse)
+
+@router.get("/{video_id}/questions", response_model=List[QuestionResponse])
+async def get_video_questions(video_id: int, db: Session = Depends(get_db)):
+    # Outer join from the video, so a missing or deleted one is a 404 in the same query
+    rows = (
+        db.query(Video.id, Question)
+        .outerjoin(Question, and_(Question.video_id == Video.id, Question.variant_of_id.is_(None)))
+        .options(raiseload("*"))
+        .filter(Video.id == video_id, Video.deleted_at.is_(None))
+        .order_by(Question.timestamp)
+        .all()
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail="Video not found")
+    questions = [question for _, question in rows if question is not None]
+    return json_response([QuestionResponse.model_validate(q) for q in questions], List[QuestionResponse])
+
+@router.get("/{video_id}/session", response_model=LearnerSessionResponse)
+async def get_learner_session(
+    video_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Everything the player needs on open: video, ordered questions and the caller's progress."""
+    entry = catalog_cache.get(video_id)
+    if entry is None:
+        # One query for the video joined with the caller's progress, one for its questions
+        row = (
+            db.query(Video, UserProgress)
+            .outerjoin(
+                UserProgress,
+                and_(UserProgress.video_id == Video.id, UserProgress.user_id == current_user.id)
+            )
+            .options(
+                defer(Video.transcript),
+                selectinload(Video.questions).raiseload("*"),
+                raiseload("*"),
             )
-            db.add(question)
-        db.commit()
+            .filter(Video.id == video_id, Video.deleted_at.is_(None))
+            .first()
+        )
+        if not row:
+            raise HTTPException(status_code=404, detail="Video not found")
+        video, progress = row
+        entry = catalog_cache.set(video_id, build_catalog_entry(video))
+    else:
+        progress = db.query(UserProgress).options(raiseload("*")).filter(
+            UserProgress.user_id == current_user.id,
+            UserProgress.video_id == video_id
+        ).first()
 
-    # Generate a final quiz question at the end of the video
-    try:
-        final_timestamp = video.duration or 0
-        if video.transcript:
-            transcript_segment = video.transcript[-1000:] if video.transcript else ""
-            final_q = GeminiService.generate_question(transcript_segment, final_timestamp, "mcq")
-            fq_text = final_q.get("question_text")
-            fq_options = final_q.get("options")
-            fq_answer = final_q.get("correct_answer")
-            fq_explanation = final_q.get("explanation")
-        else:
-            fq_text = "Final quiz: What is the main takeaway from this video?"
-            fq_options = ["Takeaway A", "Takeaway B", "Takeaway C", "Takeaway D"]
-            fq_answer = "Takeaway A"
-            fq_explanation = "Fallback final quiz question."
-
-        final_question = Question(
-            video_id=video.id,
-            timestamp=final_timestamp,
-            question_type="mcq",
-            question_text=fq_text,
-            options=fq_options,
-            correct_answer=fq_answer,
-            explanation=fq_explanation,
-            is_final_quiz=True,
+    failed_attempts = (progress.failed_attempts or {}) if progress else {}
+    if progress:
+        progress_response = ProgressResponse.model_validate(progress)
+    else:
+        # No row yet; the first progress update creates it
+        progress_response = ProgressResponse(
+            current_timestamp=0.0,
+            completed_questions=[],
+            failed_attempts={},
+            is_completed=False,
+            final_score=None
         )
-        db.add(final_question)
-        db.commit()
-    except Exception:
-        db.rollback()
 
-    return {"video_id": video.id, "status": "success"}
+    return json_response(LearnerSessionResponse(
+        video=entry.video,
+        questions=[
+            entry.serve(q, current_user.id, failed_attempts.get(str(q.id), 0))
+            for q in entry.questions
+        ],
+        progress=progress_response
+    ), LearnerSessionResponse)
 
+@router.get("/{video_id}/checkpoints", response_model=CheckpointWindowResponse)
+async def get_next_checkpoints(
+    video_id: int,
+    after: float = Query(0.0, ge=0),
+    limit: int = Query(3, ge=1, le=50),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Returns the next `limit` checkpoints strictly after position `after` with the caller's state."""
+    entry = get_catalog_entry(db, video_id)
+    upcoming = entry.next_checkpoints(after, limit)
 
-@router.delete("/{video_id}")
-async def delete_video(
+    progress = db.query(UserProgress).options(raiseload("*")).filter(
+        UserProgress.user_id == current_user.id,
+        UserProgress.video_id == video_id
+    ).first()
+    completed = set(progress.completed_questions or []) if progress else set()
+    failed_attempts = (progress.failed_attempts or {}) if progress else {}
+
+    return json_response(CheckpointWindowResponse(
+        video_id=video_id,
+        after=after,
+        checkpoints=[
+            CheckpointResponse(
+                question=entry.serve(q, current_user.id, failed_attempts.get(str(q.id), 0)),
+                completed=q.id in completed,
+                failed_attempts=failed_attempts.get(str(q.id), 0)
+            )
+            for q in upcoming
+        ],
+        has_more=entry.has_checkpoints_after(after, len(upcoming))
+    ), CheckpointWindowResponse)
+
+@router.post("/{video_id}/answers:batch", response_model=BatchAnswerResponse)
+async def submit_answers_batch(
     video_id: int,
-    current_user: User = Depends(get_current_admin_user),
+    batch: BatchAnswerSubmit,
+    idempotency_key: Optional[str] = Header(None),
+    current_user: User = Depends(rate_limited("answers_batch")),
     db: Session = Depends(get_db)
 ):
-    video = db.query(Video).filter(Video.id == video_id).first()
-    if not video:
+    """Grades a list of answers (final quiz, offline replay) and writes progress once.
+
+    Answers are applied in submission order, so repeated attempts at the same
+    question count like separate calls to /questions/{id}/answer would. A retry
+    sent with the same Idempotency-Key gets the first response back.
+    """
+    return await run_idempotent(
+        idempotency_key,
+        f"answers_batch:{current_user.id}",
+        request_fingerprint("answers_batch", video_id, batch),
+        lambda: grade_batch(video_id, batch, current_user, db),
+    )
+
+
+def retrieve_contexts(db: Session, video_id: int, queries: Dict[int, Tuple[str, float]]) -> Dict[int, str]:
+    """retrieve_context for each `{key: (question_text, timestamp)}`, keyed the same way.
+
+    Blocking (it may build the video's index), so callers run it in the threadpool.
+    """
+    return {
+        key: retrieve_context(db, video_id, question_text, timestamp=timestamp)
+        for key, (question_text, timestamp) in queries.items()
+    }
+
+
+async def grade_batch(video_id: int, batch: BatchAnswerSubmit, current_user: User, db: Session):
+    # Every question of the video, variants included, in one query; none once it is deleted
+    pools = group_variant_pools(
+        db.query(Question)
+        .join(Video, Video.id == Question.video_id)
+        .options(raiseload("*"))
+        .filter(Question.video_id == video_id, Video.deleted_at.is_(None))
+    )
+    if not pools:
         raise HTTPException(status_code=404, detail="Video not found")
+    questions = {checkpoint_id: pool[0] for checkpoint_id, pool in pools.items()}
+    for item in batch.answers:
+        if item.question_id not in questions:
+            raise HTTPException(status_code=404, detail=f"Question {item.question_id} not found for this video")
 
-    # Delete the physical video file
-    try:
-        video_path = os.path.join(os.getcwd(), video.video_url.lstrip('/'))
-        if os.path.exists(video_path):
-            os.remove(video_path)
-    except Exception as e:
-        print(f"Error deleting video file: {e}")
-
-    # Delete associated questions first (due to foreign key constraints)
-    db.query(Question).filter(Question.video_id == video_id).delete()
-    
-    # Delete the video record
-    db.delete(video)
+    progress = db.query(UserProgress).options(raiseload("*")).filter(
+        UserProgress.user_id == current_user.id,
+        UserProgress.video_id == video_id
+    ).first()
+    if not progress:
+        progress = UserProgress(user_id=current_user.id, video_id=video_id)
+        db.add(progress)
+    copy_json_columns(progress)
+
+    # The variant each answer was given for: an earlier answer in the batch either
+    # completed the checkpoint (later ones are moot) or was one more failed attempt
+    already_completed = set(progress.completed_questions)
+    attempt_counts = {}
+    served = {}
+    for index, item in enumerate(batch.answers):
+        attempt = attempt_counts.get(item.question_id, progress.failed_attempts.get(str(item.question_id), 0))
+        served[index] = select_variant(pools[item.question_id], current_user.id, item.question_id, attempt)
+        attempt_counts[item.question_id] = min(attempt + 1, questions[item.question_id].retry_limit)
+
+    # Fast path for locally gradable answers, Gemini calls for the rest run concurrently
+    grades = {}
+    llm_pending = []
+    for index, item in enumerate(batch.answers):
+        if item.question_id in already_completed:
+            continue
+        local_result = grade_locally(served[index], item.answer)
+        if local_result is not None:
+            grades[index] = local_result
+        else:
+            llm_pending.append(index)
+    if llm_pending:
+        # One budget check for the whole batch, before anything is recorded
+        enforce_llm_budget(current_user.id, len(llm_pending))
+        contexts = await run_in_threadpool(retrieve_contexts, db, video_id, {
+            served[index].id: (served[index].question_text, served[index].timestamp) for index in llm_pending
+        })
+        llm_results = await asyncio.gather(*(
+            run_in_threadpool(
+                GeminiService.grade_answer,
+                served[index].question_text,
+                batch.answers[index].answer,
+                served[index].correct_answer,
+                contexts[served[index].id]
+            )
+            for index in llm_pending
+        ))
+        grades.update(zip(llm_pending, llm_results))
+
+    results = []
+    # Checkpoints that ran out of retries: the failed variant's text and timestamp, and the result positions to summarize
+    exhausted: Dict[int, Tuple[str, float, List[int]]] = {}
+    stats = AnswerStats(progress)
+    for index, item in enumerate(batch.answers):
+        question = questions[item.question_id]
+        if question.id in progress.completed_questions:
+            results.append(BatchAnswerResult(
+                question_id=question.id,
+                correct=True,
+                explanation="Already completed",
+                rewind_seconds=0,
+                retries_left=0
+            ))
+            continue
+
+        grading_result = grades[index]
+        failed_before = progress.failed_attempts.get(str(question.id), 0)
+        attempts = record_attempt(progress, question.id, grading_result["correct"], item.current_timestamp, question.retry_limit)
+        stats.attempt(question.id, failed_before, grading_result["correct"], question.retry_limit)
+        if grading_result["correct"]:
+            retries_left = question.retry_limit - attempts
+        else:
+            retries_left = max(0, question.retry_limit - attempts)
+            if retries_left == 0:
+                exhausted.setdefault(question.id, (served[index].question_text, question.timestamp, []))[2].append(len(results))
+        results.append(BatchAnswerResult(
+            question_id=question.id,
+            correct=grading_result["correct"],
+            explanation=grading_result["explanation"],
+            rewind_seconds=question.rewind_seconds if not grading_result["correct"] and retries_left == 0 else 0,
+            retries_left=retries_left
+        ))
+
+    update_completion(progress, questions.keys())
+    completion = completion_for(progress, questions.keys()) if stats.completed_now else None
+    stats.flush(db)
+    db.flush()
+    progress_response = ProgressResponse.model_validate(progress)
     db.commit()
+    if completion:
+        await run_in_threadpool(record_completion, completion)
 
-    return {"status": "success", "message": "Video deleted successfully"}
+    # Summaries are extras: without LLM budget they are left out, the grading stands.
+    # One per checkpoint, shared by every answer that hit its retry limit
+    if exhausted and try_spend_llm_budget(current_user.id, len(exhausted)) > 0:
+        exhausted = {}
+    if exhausted:
+        contexts = await run_in_threadpool(retrieve_contexts, db, video_id, {
+            checkpoint_id: (question_text, timestamp)
+            for checkpoint_id, (question_text, timestamp, _) in exhausted.items()
+        })
+        summaries = await asyncio.gather(*(
+            run_in_threadpool(GeminiService.generate_summary, contexts[checkpoint_id], question_text)
+            for checkpoint_id, (question_text, _, _) in exhausted.items()
+        ))
+        for (_, _, positions), summary in zip(exhausted.values(), summaries):
+            for position in positions:
+                results[position].summary = summary
 
-@router.get("/{video_id}/questions", response_model=List[QuestionResponse])
-async def get_video_questions(video_id: int, db: Session = Depends(get_db)):
-    questions = db.query(Question).filter(Question.video_id == video_id).all()
-    return questions
+    return json_response(BatchAnswerResponse(results=results, progress=progress_response), BatchAnswerResponse)
+
+# How often a stream re-reads the stage when events cannot reach this process
+STATUS_POLL_SECONDS = 5
+KEEP_ALIVE_SECONDS = 15
+
+def format_sse(event: dict) -> str:
+    return f"event: {event['stage']}\ndata: {json.dumps(event)}\n\n"
+
+def read_processing_status(video_id: int) -> Optional[str]:
+    db = SessionLocal()
+    try:
+        row = db.query(Video.processing_status).filter(Video.id == video_id).first()
+        return row.processing_status if row else None
+    finally:
+        db.close()
+
+@router.get("/{video_id}/events")
+async def stream_ingest_events(
+    video_id: int,
+    request: Request,
+    current_user: User = Depends(get_admin_user_for_stream)
+):
+    """Server-Sent Events stream of ingest stage transitions for one video.
+
+    Holds no database connection while open; the stream ends once the video is
+    ready or failed.
+    """
+    if await run_in_threadpool(read_processing_status, video_id) is None:
+        raise HTTPException(status_code=404, detail="Video not found")
+    channel = ingest_channel(video_id)
+    # A separate ingest worker only reaches this process's subscribers through Redis;
+    # without it, stage changes are picked up by polling the row
+    poll_status = settings.ingest_mode == "worker" and not settings.redis_url
+
+    async def event_stream():
+        subscription = await event_broker.subscribe(channel)
+        try:
+            # Read the current stage after subscribing so no transition falls in between
+            initial = await event_broker.last_event(channel) or {
+                "video_id": video_id,
+                "stage": await run_in_threadpool(read_processing_status, video_id) or "failed"
+            }
+            yield format_sse(initial)
+            if initial["stage"] in TERMINAL_STAGES:
+                return
+            last_stage = initial["stage"]
+            while not await request.is_disconnected():
+                event = await subscription.next_event(timeout=STATUS_POLL_SECONDS if poll_status else KEEP_ALIVE_SECONDS)
+                if event is None and poll_status:
+                    stage = await run_in_threadpool(read_processing_status, video_id) or "failed"
+                    if stage != last_stage:
+                        event = {"video_id": video_id, "stage": stage}
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                last_stage = event["stage"]
+                yield format_sse(event)
+                if event["stage"] in TERMINAL_STAGES:
+                    return
+        finally:
+            await subscription.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -2,15 +2,16 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from app.models.user import User
 from app.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -62,3 +63,20 @@ def get_current_admin_user(current_user: User = Depends(get_current_user)):
             detail="Not enough permissions"
         )
     return current_user
+
+def get_admin_user_for_stream(
+    token: Optional[str] = Depends(oauth2_scheme_optional),
+    access_token: Optional[str] = Query(None)
+):
+    """Admin check for long-lived streaming responses.
+
+    EventSource cannot set headers, so the token may also be passed as
+    ?access_token=. A short-lived session is used so an open stream does not
+    keep a database connection checked out.
+    """
+    db = SessionLocal()
+    try:
+        user = get_current_user(token or access_token or "", db)
+    finally:
+        db.close()
+    return get_current_admin_user(user)
@@ -1,16 +1,87 @@
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
-from typing import List, Union
+from typing import List, Optional, Union
 import os
 
 class Settings(BaseSettings):
     database_url: str
     gemini_api_key: str
+    gemini_base_url: Optional[str] = None
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     cors_origins: Union[str, List[str]] = "http://localhost:3000,http://localhost:5173"
     environment: str = "development"
+    catalog_cache_ttl_seconds: int = 60
+    redis_url: Optional[str] = None
+    # Token budgets for the transcript/context part of each Gemini prompt
+    prompt_budget_question: int = 1200
+    prompt_budget_final_quiz: int = 1500
+    prompt_budget_grading: int = 600
+    prompt_budget_summary: int = 1000
+    # Extra questions generated per checkpoint (same Gemini call) for retries
+    question_variants_per_checkpoint: int = 2
+    # Transcription: "whisper" (local), "gemini" (Gemini Files API) or "auto", which keeps jobs
+    # local until the Whisper workers are busy and then sends long clips to whichever finishes first
+    transcription_backend: str = "auto"
+    whisper_workers: int = 1
+    # Estimates for "auto": Whisper seconds per second of audio on this machine, and Gemini's
+    # fixed cost (upload, file processing) plus seconds per second of audio
+    whisper_realtime_factor: float = 0.5
+    gemini_transcription_overhead_seconds: float = 30.0
+    gemini_transcription_realtime_factor: float = 0.1
+    remote_transcription_min_duration_seconds: float = 120.0
+    # "gemini", or "local" for the offline extractive generator (no network, e.g. bulk imports)
+    question_generator: str = "gemini"
+    # "inline" runs ingest in the API process; "worker" leaves uploads for `python -m app.worker`
+    ingest_mode: str = "inline"
+    # A video whose ingest has not reached a new stage in this long is reclaimed by a
+    # worker; keep it above the slowest stage (transcribing the longest video)
+    ingest_lease_seconds: int = 3600
+    create_tables_on_startup: bool = True
+    # Token buckets per user: every answer request, and separately the ones that call Gemini
+    rate_limit_enabled: bool = True
+    rate_limit_requests_per_minute: int = 60
+    rate_limit_request_burst: int = 20
+    rate_limit_llm_calls_per_minute: int = 6
+    rate_limit_llm_burst: int = 5
+    # Media storage: "local" (files under local_storage_root) or "s3" (any S3-compatible service)
+    storage_backend: str = "local"
+    local_storage_root: str = "uploads"
+    local_storage_url: str = "/uploads"
+    s3_bucket: Optional[str] = None
+    s3_endpoint_url: Optional[str] = None
+    s3_region: Optional[str] = None
+    s3_access_key_id: Optional[str] = None
+    s3_secret_access_key: Optional[str] = None
+    # Public base URL of a CDN in front of the bucket; presigned URLs are used without one
+    media_cdn_url: Optional[str] = None
+    media_url_expiry_seconds: int = 3600
+    # Responses smaller than this many bytes are sent uncompressed
+    compression_minimum_size: int = 1024
+    # Idempotency-Key records: how long responses are replayed, how long a request may
+    # hold its key, and how long a repeat waits for the request it duplicates
+    idempotency_ttl_seconds: int = 86400
+    idempotency_lease_seconds: int = 600
+    idempotency_wait_seconds: float = 30.0
+    idempotency_poll_seconds: float = 0.1
+    # Seek previews made at ingest: a frame every interval (stretched so a video never
+    # exceeds max_frames), tiled columns x rows per JPEG sprite sheet
+    storyboard_enabled: bool = True
+    storyboard_interval_seconds: float = 10.0
+    storyboard_max_frames: int = 300
+    storyboard_tile_width: int = 160
+    storyboard_tile_height: int = 90
+    storyboard_columns: int = 10
+    storyboard_rows: int = 10
+    storyboard_jpeg_quality: int = 5  # ffmpeg -q:v, 2 (best) to 31
+    storyboard_timeout_seconds: float = 300.0
+    # Deleted videos are purged in batches of this many rows per table; storage files no
+    # video points at are collected once older than the grace period (uploads in flight)
+    purge_batch_size: int = 1000
+    storage_gc_min_age_seconds: int = 86400
+    # How often the ingest worker runs purges and storage collection while idle
+    lifecycle_interval_seconds: int = 3600
     
     class Config:
         env_file = ".env"
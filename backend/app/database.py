@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
@@ -8,6 +8,19 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+if engine.dialect.name == "sqlite":
+    # SQLite ignores ON DELETE CASCADE unless foreign keys are switched on per connection
+    @event.listens_for(engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+def init_db():
+    """Creates missing tables. Called from the API's startup hook, never at import time."""
+    import app.models  # noqa: F401  registers every table on Base.metadata
+    Base.metadata.create_all(bind=engine)
+
 def get_db():
     db = SessionLocal()
     try:
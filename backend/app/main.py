@@ -1,17 +1,28 @@
 from fastapi import FastAPI, Depends
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 import os
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.database import engine, Base
-from app.api import auth, videos, questions, progress
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-
-app = FastAPI(title="TubeTutor API", version="1.0.0")
-app.mount("/uploads", StaticFiles(directory="/app/uploads"), name="uploads")
+from app.database import init_db
+from app.services.storyboard import IMMUTABLE_CACHE_CONTROL
+from app.utils.compression import CompressionMiddleware
+from app.utils.static_files import MediaStaticFiles
+from app.api import auth, videos, questions, progress, search, leaderboards
+
+
+# orjson for every response built from plain dicts; payload-heavy routes hand over
+# pre-serialized schema objects instead (app.utils.responses.json_response)
+app = FastAPI(title="TubeTutor API", version="1.0.0", default_response_class=ORJSONResponse)
+if settings.storage_backend == "local":
+    # Only local storage is served by the API; S3 media goes straight from the bucket or CDN
+    app.mount(
+        settings.local_storage_url,
+        MediaStaticFiles(
+            directory=settings.local_storage_root, check_dir=False,
+            immutable_dirs=["storyboards"], cache_control=IMMUTABLE_CACHE_CONTROL,
+        ),
+        name="uploads",
+    )
 
 # ✅ Simplified and correct CORS middleware
 allowed_origins = [
@@ -26,12 +37,21 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
 
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(videos.router, prefix="/videos", tags=["videos"])
 app.include_router(questions.router, prefix="/questions", tags=["questions"])
 app.include_router(progress.router, prefix="/progress", tags=["progress"])
+app.include_router(search.router, prefix="/search", tags=["search"])
+app.include_router(leaderboards.router, prefix="/leaderboards", tags=["leaderboards"])
+
+@app.on_event("startup")
+def create_tables():
+    # At startup rather than import, so importing the app stays cheap; off when migrations own the schema
+    if settings.create_tables_on_startup:
+        init_db()
 
 @app.get("/")
 async def root():
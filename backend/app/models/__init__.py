@@ -3,5 +3,7 @@ from app.models.user import User
 from app.models.video import Video
 from app.models.question import Question
 from app.models.progress import UserProgress
+from app.models.transcript import TranscriptChunk, TranscriptSegment
+from app.models.analytics import QuestionStats, VideoStats
 
-__all__ = ["User", "Video", "Question", "UserProgress"]
+__all__ = ["User", "Video", "Question", "UserProgress", "TranscriptChunk", "TranscriptSegment", "QuestionStats", "VideoStats"]
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey
+from app.database import Base
+
+# Counters only ever move by atomic increments (see app.services.analytics), so
+# reading them costs the same however many learners answered.
+
+class QuestionStats(Base):
+    __tablename__ = "question_stats"
+
+    # The checkpoint (primary question); answers to its variants count here too
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    video_id = Column(Integer, ForeignKey("videos.id", ondelete="CASCADE"), index=True, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    learners_reached = Column(Integer, default=0, nullable=False)  # learners with at least one attempt
+    first_try_correct = Column(Integer, default=0, nullable=False)
+    completions = Column(Integer, default=0, nullable=False)  # learners who eventually answered correctly
+    failures_before_success = Column(Integer, default=0, nullable=False)  # summed over completions
+    exhausted_retries = Column(Integer, default=0, nullable=False)  # learners who used up retry_limit
+
+
+class VideoStats(Base):
+    __tablename__ = "video_stats"
+
+    video_id = Column(Integer, ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True)
+    learners_started = Column(Integer, default=0, nullable=False)
+    learners_completed = Column(Integer, default=0, nullable=False)
+    final_score_sum = Column(Float, default=0.0, nullable=False)
@@ -8,13 +8,15 @@ class UserProgress(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    video_id = Column(Integer, ForeignKey("videos.id"))
+    video_id = Column(Integer, ForeignKey("videos.id", ondelete="CASCADE"), index=True)
     current_timestamp = Column(Float, default=0.0)
     completed_questions = Column(JSON, default=list)  # [question_id, ...]
     failed_attempts = Column(JSON, default=dict)  # {question_id: count}
     is_completed = Column(Boolean, default=False)
     final_score = Column(Float)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime)
     last_updated = Column(DateTime, default=datetime.utcnow)
     
-    user = relationship("User", back_populates="progress")
-    video = relationship("Video", back_populates="progress")
+    user = relationship("User", back_populates="progress", lazy="raise")
+    video = relationship("Video", back_populates="progress", lazy="raise")
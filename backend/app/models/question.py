@@ -1,12 +1,16 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (
+        # Serves per-video checkpoint lookups in timestamp order
+        Index("ix_questions_video_id_timestamp", "video_id", "timestamp"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    video_id = Column(Integer, ForeignKey("videos.id"))
+    video_id = Column(Integer, ForeignKey("videos.id", ondelete="CASCADE"))
     timestamp = Column(Float, nullable=False)  # seconds into video
     question_type = Column(String, nullable=False)  # "mcq", "fill_in", "one_word"
     question_text = Column(Text, nullable=False)
@@ -16,5 +20,9 @@ class Question(Base):
     retry_limit = Column(Integer, default=3)
     rewind_seconds = Column(Float, default=30.0)
     is_final_quiz = Column(Boolean, default=False)
+    # Variants are alternative questions for the same checkpoint, served on retries;
+    # they point at the checkpoint's primary question, which has variant_of_id = None
+    variant_of_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), index=True)
+    variant_index = Column(Integer, default=0)
     
-    video = relationship("Video", back_populates="questions")
+    video = relationship("Video", back_populates="questions", lazy="raise")
@@ -0,0 +1,53 @@
+from sqlalchemy import Column, Integer, Text, Float, ForeignKey, LargeBinary, DDL, event
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+class TranscriptChunk(Base):
+    __tablename__ = "transcript_chunks"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    video_id = Column(Integer, ForeignKey("videos.id", ondelete="CASCADE"), index=True, nullable=False)
+    position = Column(Integer, nullable=False)  # order within the transcript
+    start_time = Column(Float)  # seconds; None when the transcript has no timing
+    end_time = Column(Float)
+    text = Column(Text, nullable=False)
+    embedding = Column(LargeBinary, nullable=False)  # float16 hashed term weights
+    
+    video = relationship("Video", back_populates="chunks", lazy="raise")
+
+
+class TranscriptSegment(Base):
+    """One Whisper segment (a sentence or so), the unit of catalog-wide search."""
+    __tablename__ = "transcript_segments"
+
+    id = Column(Integer, primary_key=True)
+    video_id = Column(Integer, ForeignKey("videos.id", ondelete="CASCADE"), index=True, nullable=False)
+    position = Column(Integer, nullable=False)
+    start_time = Column(Float)
+    end_time = Column(Float)
+    text = Column(Text, nullable=False)
+
+
+# The full-text index lives outside the ORM and is maintained by the database itself:
+# a generated tsvector with a GIN index on Postgres, an external-content FTS5 table
+# kept in sync by triggers on SQLite. Both are created with the table.
+_segments = TranscriptSegment.__table__
+for statement in (
+    "ALTER TABLE transcript_segments ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', text)) STORED",
+    "CREATE INDEX ix_transcript_segments_search_vector ON transcript_segments USING GIN (search_vector)",
+):
+    event.listen(_segments, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in (
+    "CREATE VIRTUAL TABLE transcript_segments_fts USING fts5("
+    "text, content='transcript_segments', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER transcript_segments_ai AFTER INSERT ON transcript_segments BEGIN "
+    "INSERT INTO transcript_segments_fts(rowid, text) VALUES (new.id, new.text); END",
+    "CREATE TRIGGER transcript_segments_ad AFTER DELETE ON transcript_segments BEGIN "
+    "INSERT INTO transcript_segments_fts(transcript_segments_fts, rowid, text) VALUES ('delete', old.id, old.text); END",
+    "CREATE TRIGGER transcript_segments_au AFTER UPDATE ON transcript_segments BEGIN "
+    "INSERT INTO transcript_segments_fts(transcript_segments_fts, rowid, text) VALUES ('delete', old.id, old.text); "
+    "INSERT INTO transcript_segments_fts(rowid, text) VALUES (new.id, new.text); END",
+):
+    event.listen(_segments, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(_segments, "before_drop", DDL("DROP TABLE IF EXISTS transcript_segments_fts").execute_if(dialect="sqlite"))
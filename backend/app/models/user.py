@@ -13,5 +13,5 @@ class User(Base):
     is_admin = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     
-    videos = relationship("Video", back_populates="uploader")
-    progress = relationship("UserProgress", back_populates="user")
+    videos = relationship("Video", back_populates="uploader", lazy="raise")
+    progress = relationship("UserProgress", back_populates="user", lazy="raise")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, JSON
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import datetime
@@ -10,13 +10,58 @@ class Video(Base):
     title = Column(String, nullable=False)
     description = Column(Text)
     video_url = Column(String, nullable=False)
+    # Key in the media storage backend; learners get a URL for it at response time
+    storage_key = Column(String)
+    # SHA-256 of the uploaded file, so the same recording is not ingested twice
+    content_sha256 = Column(String(64), index=True)
     thumbnail_url = Column(String)
+    # Seek-preview sprite sheets and their layout (app.services.storyboard); None until generated
+    storyboard = Column(JSON)
     duration = Column(Float)  # in seconds
     transcript = Column(Text)
     is_published = Column(Boolean, default=False)
+    # uploaded -> transcribing -> generating_storyboard -> generating_questions -> ready (or failed)
+    processing_status = Column(String, default="ready")
+    # When an ingest last claimed the row or moved it to a new stage; a worker that
+    # crashed mid-ingest leaves it to expire, and another worker reclaims the video
+    claimed_at = Column(DateTime)
+    # Checkpoints requested at upload, read by whichever process runs the ingest
+    question_timestamps = Column(JSON)
     uploader_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Set by DELETE /videos/{id}; the row, its children and its media are purged in the background
+    deleted_at = Column(DateTime, index=True)
     
-    uploader = relationship("User", back_populates="videos")
-    questions = relationship("Question", back_populates="video")
-    progress = relationship("UserProgress", back_populates="video")
+    # Relationships never load implicitly; endpoints opt in with selectinload/joinedload.
+    # Children are removed by ON DELETE CASCADE, so deleting a video never loads them.
+    uploader = relationship("User", back_populates="videos", lazy="raise")
+    questions = relationship(
+        "Question",
+        back_populates="video",
+        lazy="raise",
+        order_by="Question.timestamp",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    progress = relationship(
+        "UserProgress",
+        back_populates="video",
+        lazy="raise",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    chunks = relationship(
+        "TranscriptChunk",
+        back_populates="video",
+        lazy="raise",
+        order_by="TranscriptChunk.position",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    segments = relationship(
+        "TranscriptSegment",
+        lazy="raise",
+        order_by="TranscriptSegment.position",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
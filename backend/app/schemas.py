@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -38,8 +38,11 @@ class VideoResponse(BaseModel):
     description: Optional[str]
     video_url: str
     thumbnail_url: Optional[str]
+    # WebVTT index of seek-preview thumbnails; None for videos without a storyboard
+    storyboard_url: Optional[str] = None
     duration: Optional[float]
     is_published: bool
+    processing_status: Optional[str] = None
     uploader_id: int
     created_at: datetime
     
@@ -61,6 +64,7 @@ class QuestionResponse(BaseModel):
     retry_limit: int
     rewind_seconds: float
     is_final_quiz: bool
+    variant_index: int = 0
     
     class Config:
         from_attributes = True
@@ -75,6 +79,18 @@ class AnswerResponse(BaseModel):
     rewind_seconds: float
     retries_left: int
     summary: Optional[str] = None
+    next_question: Optional[QuestionResponse] = None  # variant to show on the next retry
+
+class BatchAnswerItem(BaseModel):
+    question_id: int
+    answer: str
+    current_timestamp: float
+
+class BatchAnswerSubmit(BaseModel):
+    answers: List[BatchAnswerItem] = Field(..., min_length=1, max_length=100)
+
+class BatchAnswerResult(AnswerResponse):
+    question_id: int
 
 # Progress schemas
 class ProgressResponse(BaseModel):
@@ -89,3 +105,87 @@ class ProgressResponse(BaseModel):
 
 class ProgressUpdate(BaseModel):
     current_timestamp: float
+
+class BatchAnswerResponse(BaseModel):
+    results: List[BatchAnswerResult]
+    progress: ProgressResponse
+
+# Learner session schemas
+class LearnerSessionResponse(BaseModel):
+    video: VideoResponse
+    questions: List[QuestionResponse]
+    progress: ProgressResponse
+
+
+# Checkpoint schemas
+class CheckpointResponse(BaseModel):
+    question: QuestionResponse
+    completed: bool
+    failed_attempts: int
+
+class CheckpointWindowResponse(BaseModel):
+    video_id: int
+    after: float
+    checkpoints: List[CheckpointResponse]
+    has_more: bool
+
+# Analytics schemas
+class QuestionAnalytics(BaseModel):
+    question_id: int
+    timestamp: float
+    question_text: str
+    is_final_quiz: bool
+    attempts: int
+    learners_reached: int
+    completions: int
+    exhausted_retries: int
+    first_try_correct_rate: Optional[float]  # None until someone has answered
+    average_failures_before_success: Optional[float]
+    dropped_after: int  # reached this checkpoint but not the next one (or the end)
+
+class VideoAnalyticsResponse(BaseModel):
+    video_id: int
+    learners_started: int
+    learners_completed: int
+    average_final_score: Optional[float]
+    drop_off_timestamp: Optional[float]  # checkpoint after which the most learners stopped
+    questions: List[QuestionAnalytics]
+
+# Search schemas
+class SearchResult(BaseModel):
+    video_id: int
+    video_title: str
+    start_time: Optional[float]  # None for transcripts without timing
+    end_time: Optional[float]
+    snippet: str  # matched words wrapped in <mark></mark>
+    rank: float
+    link: str  # player path that opens the video at start_time
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchResult]
+    offset: int
+    limit: int
+    has_more: bool
+    truncated: bool  # the query matched too many segments to rank them all
+
+# Leaderboard schemas
+class LeaderboardEntry(BaseModel):
+    rank: int  # 1-based
+    user_id: int
+    username: str
+    value: float  # accuracy in percent, completion time in seconds, or completed videos
+
+class LeaderboardResponse(BaseModel):
+    board: str  # "video:12" or "global"
+    metric: str
+    total: int  # learners on the board
+    offset: int
+    limit: int
+    entries: List[LeaderboardEntry]
+
+class MyRankResponse(BaseModel):
+    board: str
+    metric: str
+    total: int
+    entry: Optional[LeaderboardEntry]  # None until the learner has completed a video on this board
@@ -0,0 +1,270 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.models import Question, QuestionStats, UserProgress, VideoStats
+from app.schemas import QuestionAnalytics, VideoAnalyticsResponse
+
+
+class AnswerStats:
+    """Counter deltas from the answers graded in one request.
+
+    Created after the learner's progress is loaded and before any attempt is
+    recorded, so it can tell whether this is the learner's first answer on the
+    video and whether the request completes it. `flush` adds the deltas with
+    one upsert per table, in the same transaction as the progress write.
+    """
+
+    def __init__(self, progress: UserProgress):
+        self.progress = progress
+        self.video_id = progress.video_id
+        self.new_learner = not progress.completed_questions and not progress.failed_attempts
+        self.was_completed = bool(progress.is_completed)
+        self.questions: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def attempt(self, checkpoint_id: int, failed_before: int, correct: bool, retry_limit: int) -> None:
+        """Counts one graded attempt; `failed_before` is the learner's failed count before it."""
+        deltas = self.questions[checkpoint_id]
+        deltas["attempts"] += 1
+        if failed_before == 0:
+            deltas["learners_reached"] += 1
+        if correct:
+            deltas["completions"] += 1
+            deltas["failures_before_success"] += failed_before
+            if failed_before == 0:
+                deltas["first_try_correct"] += 1
+        elif failed_before + 1 == retry_limit:
+            deltas["exhausted_retries"] += 1
+
+    @property
+    def completed_now(self) -> bool:
+        """Whether the answers in this request completed the video."""
+        return bool(self.progress.is_completed) and not self.was_completed
+
+    def flush(self, db: Session) -> None:
+        if self.questions:
+            increment_questions(db, self.video_id, self.questions)
+        video_deltas = {}
+        if self.new_learner and self.questions:
+            video_deltas["learners_started"] = 1
+        if self.completed_now:
+            video_deltas["learners_completed"] = 1
+            video_deltas["final_score_sum"] = self.progress.final_score or 0.0
+        if video_deltas:
+            increment(db, VideoStats, {"video_id": self.video_id}, video_deltas)
+        self.questions.clear()
+
+
+def upsert_statement(db: Session, model):
+    """INSERT for `model` in the dialect of `db` if it supports ON CONFLICT DO UPDATE, else None."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(model)
+
+
+def increment_rows(db: Session, model, rows: List[dict], counters: List[str]) -> None:
+    """Adds the `counters` of each row to the stored ones, creating missing rows, in one statement.
+
+    INSERT ... ON CONFLICT (primary key) DO UPDATE SET column = column + excluded.column:
+    the same single statement whether the rows exist or not, and concurrent API
+    processes never lose each other's counts. Every row carries every counter
+    (0 where it has no delta) plus the columns a new row needs. Other dialects
+    fall back to `increment_rows_locked`.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    statement = upsert_statement(db, model)
+    if statement is None:
+        increment_rows_locked(db, model, rows, counters)
+        return
+    statement = statement.values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[column.name for column in table.primary_key.columns],
+        set_={column: table.c[column] + statement.excluded[column] for column in counters},
+    )
+    db.execute(statement)
+
+
+def increment_rows_locked(db: Session, model, rows: List[dict], counters: List[str]) -> None:
+    """`increment_rows` as a read-modify-write, for dialects without ON CONFLICT.
+
+    The existing rows are read with SELECT ... FOR UPDATE, so concurrent requests
+    wait for each other instead of losing counts; missing rows are added to the session.
+    """
+    key_columns = [column.name for column in model.__table__.primary_key.columns]
+    key_of = lambda values: tuple(values[column] for column in key_columns)
+    stored = {}
+    for row in sorted(rows, key=key_of):
+        instance = db.query(model).filter_by(**{column: row[column] for column in key_columns}).with_for_update().first()
+        if instance is not None:
+            stored[key_of(row)] = instance
+    for row in rows:
+        instance = stored.get(key_of(row))
+        if instance is None:
+            db.add(model(**row))
+            continue
+        for column in counters:
+            setattr(instance, column, (getattr(instance, column) or 0) + row[column])
+    db.flush()
+
+
+def increment(db: Session, model, key: dict, deltas: dict, **insert_values) -> None:
+    """Adds `deltas` to the counters of one row, creating it on first use."""
+    deltas = {column: value for column, value in deltas.items() if value}
+    if deltas:
+        increment_rows(db, model, [{**key, **insert_values, **deltas}], list(deltas))
+
+
+def increment_questions(db: Session, video_id: int, deltas_by_question: Dict[int, Dict[str, int]]) -> None:
+    """Adds per-question deltas for all of them with one statement.
+
+    Rows are created at ingest; videos ingested before analytics get theirs on first use.
+    """
+    counters = sorted({column for deltas in deltas_by_question.values() for column, value in deltas.items() if value})
+    if not counters:
+        return
+    rows = [
+        {"question_id": question_id, "video_id": video_id, **{column: deltas.get(column, 0) for column in counters}}
+        for question_id, deltas in deltas_by_question.items()
+    ]
+    increment_rows(db, QuestionStats, rows, counters)
+
+
+def initialize_stats(db: Session, video_id: int) -> None:
+    """Creates zeroed counter rows for a video's checkpoints (answers create any that are missing).
+
+    Adds rows to the session; the caller commits.
+    """
+    existing = {qid for (qid,) in db.query(QuestionStats.question_id).filter(QuestionStats.video_id == video_id)}
+    checkpoints = db.query(Question.id).filter(Question.video_id == video_id, Question.variant_of_id.is_(None))
+    db.add_all(QuestionStats(question_id=qid, video_id=video_id) for (qid,) in checkpoints if qid not in existing)
+    if db.get(VideoStats, video_id) is None:
+        db.add(VideoStats(video_id=video_id))
+
+
+def rebuild_stats(db: Session, video_id: Optional[int] = None) -> int:
+    """Recomputes the counters from UserProgress (backfill, or repair after manual edits).
+
+    Progress only keeps failed counts and completions, so the attempt totals of
+    learners who kept answering after running out of retries are lower bounds.
+    Returns the number of progress rows read.
+    """
+    checkpoints = db.query(Question.id, Question.video_id, Question.retry_limit).filter(Question.variant_of_id.is_(None))
+    if video_id is not None:
+        checkpoints = checkpoints.filter(Question.video_id == video_id)
+    retry_limits: Dict[int, Dict[int, int]] = defaultdict(dict)
+    for question_id, question_video_id, retry_limit in checkpoints:
+        retry_limits[question_video_id][question_id] = retry_limit or 0
+
+    question_stats: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    video_stats: Dict[int, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    rows = db.query(
+        UserProgress.video_id, UserProgress.completed_questions, UserProgress.failed_attempts,
+        UserProgress.is_completed, UserProgress.final_score
+    )
+    if video_id is not None:
+        rows = rows.filter(UserProgress.video_id == video_id)
+    read = 0
+    for row in rows.yield_per(1000):
+        read += 1
+        completed = set(row.completed_questions or [])
+        failed_attempts = row.failed_attempts or {}
+        started = False
+        for question_id, retry_limit in retry_limits.get(row.video_id, {}).items():
+            failed = failed_attempts.get(str(question_id), 0)
+            is_done = question_id in completed
+            if not failed and not is_done:
+                continue
+            started = True
+            stats = question_stats[question_id]
+            stats["attempts"] += failed + (1 if is_done else 0)
+            stats["learners_reached"] += 1
+            if is_done:
+                stats["completions"] += 1
+                stats["failures_before_success"] += failed
+                stats["first_try_correct"] += 1 if failed == 0 else 0
+            if retry_limit and failed >= retry_limit:
+                stats["exhausted_retries"] += 1
+        if started:
+            video_stats[row.video_id]["learners_started"] += 1
+        if row.is_completed:
+            video_stats[row.video_id]["learners_completed"] += 1
+            video_stats[row.video_id]["final_score_sum"] += row.final_score or 0.0
+
+    stale_questions = db.query(QuestionStats)
+    stale_videos = db.query(VideoStats)
+    if video_id is not None:
+        stale_questions = stale_questions.filter(QuestionStats.video_id == video_id)
+        stale_videos = stale_videos.filter(VideoStats.video_id == video_id)
+    stale_questions.delete(synchronize_session=False)
+    stale_videos.delete(synchronize_session=False)
+    video_of = {qid: vid for vid, limits in retry_limits.items() for qid in limits}
+    db.add_all(
+        QuestionStats(question_id=qid, video_id=video_of[qid], **stats)
+        for qid, stats in question_stats.items()
+    )
+    db.add_all(VideoStats(video_id=vid, **stats) for vid, stats in video_stats.items())
+    db.commit()
+    return read
+
+
+def get_video_analytics(db: Session, video_id: int) -> Optional[VideoAnalyticsResponse]:
+    """Reads the counters of one video: one row per checkpoint plus one, whatever the learner count.
+
+    Returns None when the video has no checkpoints (or does not exist).
+    """
+    rows = (
+        db.query(Question.id, Question.timestamp, Question.question_text, Question.is_final_quiz, QuestionStats)
+        .outerjoin(QuestionStats, QuestionStats.question_id == Question.id)
+        .filter(Question.video_id == video_id, Question.variant_of_id.is_(None))
+        .order_by(Question.timestamp)
+        .all()
+    )
+    if not rows:
+        return None
+    video = db.get(VideoStats, video_id)
+    learners_started = video.learners_started if video else 0
+    learners_completed = video.learners_completed if video else 0
+
+    questions: List[QuestionAnalytics] = []
+    for index, (question_id, timestamp, question_text, is_final_quiz, stats) in enumerate(rows):
+        reached = stats.learners_reached if stats else 0
+        completions = stats.completions if stats else 0
+        # Learners who got here but no further: the next checkpoint, or the end of the video
+        if index + 1 < len(rows):
+            next_stats = rows[index + 1][4]
+            reached_next = next_stats.learners_reached if next_stats else 0
+        else:
+            reached_next = learners_completed
+        questions.append(QuestionAnalytics(
+            question_id=question_id,
+            timestamp=timestamp,
+            question_text=question_text,
+            is_final_quiz=bool(is_final_quiz),
+            attempts=stats.attempts if stats else 0,
+            learners_reached=reached,
+            completions=completions,
+            exhausted_retries=stats.exhausted_retries if stats else 0,
+            first_try_correct_rate=round(stats.first_try_correct / reached, 4) if reached else None,
+            average_failures_before_success=(
+                round(stats.failures_before_success / completions, 2) if completions else None
+            ),
+            dropped_after=max(0, reached - reached_next),
+        ))
+
+    drop_off = max(questions, key=lambda q: q.dropped_after)
+    return VideoAnalyticsResponse(
+        video_id=video_id,
+        learners_started=learners_started,
+        learners_completed=learners_completed,
+        average_final_score=(
+            round(video.final_score_sum / learners_completed, 2) if video and learners_completed else None
+        ),
+        drop_off_timestamp=drop_off.timestamp if drop_off.dropped_after > 0 else None,
+        questions=questions,
+    )
@@ -0,0 +1,91 @@
+import bisect
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+from app.schemas import VideoResponse, QuestionResponse
+from app.services.variants import select_variant
+
+# Ingest stages and "failed" change the video's questions later; rows predating the stages have no status
+CACHEABLE_STATUSES = ("ready", None)
+
+
+class CatalogEntry:
+    """The shared, user-independent part of a learner session.
+
+    `questions` must already be sorted by timestamp; `timestamps` mirrors it so
+    checkpoint lookups are a bisect instead of a scan.
+    """
+
+    def __init__(
+        self,
+        video: VideoResponse,
+        questions: List[QuestionResponse],
+        variant_pools: Optional[Dict[int, List[QuestionResponse]]] = None
+    ):
+        self.video = video
+        self.questions = questions
+        self.timestamps = [q.timestamp for q in questions]
+        # checkpoint id -> [primary, variants...], only for checkpoints that have variants
+        self.variant_pools = variant_pools or {}
+
+    def serve(self, question: QuestionResponse, user_id: int, attempt: int) -> QuestionResponse:
+        """The variant `user_id` sees on `attempt`, presented under the checkpoint's id."""
+        pool = self.variant_pools.get(question.id)
+        if not pool:
+            return question
+        variant = select_variant(pool, user_id, question.id, attempt)
+        return variant.model_copy(update={"id": question.id})
+
+    def next_checkpoints(self, position: float, limit: int) -> List[QuestionResponse]:
+        """Returns up to `limit` questions whose timestamp is strictly after `position`."""
+        start = bisect.bisect_right(self.timestamps, position)
+        return self.questions[start:start + limit]
+
+    def has_checkpoints_after(self, position: float, count: int) -> bool:
+        return bisect.bisect_right(self.timestamps, position) + count < len(self.questions)
+
+
+class CatalogCache:
+    """In-process TTL cache of validated video + question payloads, keyed by video id.
+
+    Entries are invalidated locally on upload/delete; the TTL bounds how long
+    other workers can serve a stale copy. Only ready videos are cached: an ingest
+    finishing in another process cannot invalidate this one, and an entry taken
+    mid-ingest would lack the questions for a whole TTL.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, Tuple[float, CatalogEntry]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, video_id: int) -> Optional[CatalogEntry]:
+        with self._lock:
+            item = self._entries.get(video_id)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at < time.monotonic():
+                del self._entries[video_id]
+                return None
+            return entry
+
+    def set(self, video_id: int, entry: CatalogEntry) -> CatalogEntry:
+        """Caches `entry` if its video is ready; returns it either way."""
+        if entry.video.processing_status not in CACHEABLE_STATUSES:
+            return entry
+        with self._lock:
+            self._entries[video_id] = (time.monotonic() + self.ttl_seconds, entry)
+        return entry
+
+    def invalidate(self, video_id: int) -> None:
+        with self._lock:
+            self._entries.pop(video_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+catalog_cache = CatalogCache(ttl_seconds=settings.catalog_cache_ttl_seconds)
@@ -0,0 +1,153 @@
+import asyncio
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import settings
+
+# Stages an ingest job moves through, in order
+INGEST_STAGES = ["uploaded", "transcribing", "generating_storyboard", "generating_questions", "ready"]
+TERMINAL_STAGES = {"ready", "failed"}
+
+
+def ingest_channel(video_id: int) -> str:
+    return f"ingest:{video_id}"
+
+
+class InProcessEventBroker:
+    """Fan-out pub/sub for a single API process.
+
+    `publish` may be called from worker threads; events are handed to each
+    subscriber's asyncio queue on the loop that subscribed. The last event per
+    channel is kept so late subscribers start from the current stage.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._last_event: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, event: Dict[str, Any]) -> None:
+        with self._lock:
+            if event.get("stage") in TERMINAL_STAGES:
+                self._last_event.pop(channel, None)
+            else:
+                self._last_event[channel] = event
+            subscribers = list(self._subscribers.get(channel, []))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._offer, queue, event)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        # A subscriber that stopped reading only ever needs the newest stage
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    async def last_event(self, channel: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._last_event.get(channel)
+
+    async def subscribe(self, channel: str) -> "InProcessSubscription":
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(entry)
+        return InProcessSubscription(self, channel, entry)
+
+    def _unsubscribe(self, channel: str, entry) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(channel, [])
+            if entry in subscribers:
+                subscribers.remove(entry)
+            if not subscribers:
+                self._subscribers.pop(channel, None)
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(channel, []))
+
+
+class InProcessSubscription:
+    """A registered subscriber; events published after `subscribe` returns are never missed."""
+
+    def __init__(self, broker: InProcessEventBroker, channel: str, entry):
+        self._broker = broker
+        self._channel = channel
+        self._entry = entry
+
+    async def next_event(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Waits up to `timeout` seconds; None means nothing happened (send a keep-alive)."""
+        try:
+            return await asyncio.wait_for(self._entry[1].get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self) -> None:
+        self._broker._unsubscribe(self._channel, self._entry)
+
+
+class RedisSubscription:
+    def __init__(self, pubsub, channel: str):
+        self._pubsub = pubsub
+        self._channel = channel
+
+    async def next_event(self, timeout: float) -> Optional[Dict[str, Any]]:
+        message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        return json.loads(message["data"])
+
+    async def close(self) -> None:
+        await self._pubsub.unsubscribe(self._channel)
+        await self._pubsub.close()
+
+
+class RedisEventBroker:
+    """Redis pub/sub broker so events published on one node reach subscribers on all nodes."""
+
+    def __init__(self, redis_url: str):
+        # Imported lazily: redis is only needed when REDIS_URL is configured
+        import redis
+        import redis.asyncio as redis_asyncio
+
+        self._client = redis.Redis.from_url(redis_url)
+        self._async_client = redis_asyncio.Redis.from_url(redis_url)
+
+    def publish(self, channel: str, event: Dict[str, Any]) -> None:
+        payload = json.dumps(event)
+        pipe = self._client.pipeline()
+        pipe.publish(channel, payload)
+        if event.get("stage") in TERMINAL_STAGES:
+            pipe.delete(f"{channel}:last")
+        else:
+            pipe.set(f"{channel}:last", payload, ex=3600)
+        pipe.execute()
+
+    async def last_event(self, channel: str) -> Optional[Dict[str, Any]]:
+        # Read on the event loop by SSE streams, so never with the blocking client
+        payload = await self._async_client.get(f"{channel}:last")
+        return json.loads(payload) if payload else None
+
+    async def subscribe(self, channel: str) -> RedisSubscription:
+        pubsub = self._async_client.pubsub()
+        await pubsub.subscribe(channel)
+        return RedisSubscription(pubsub, channel)
+
+
+def create_event_broker():
+    if settings.redis_url:
+        return RedisEventBroker(settings.redis_url)
+    return InProcessEventBroker()
+
+
+event_broker = create_event_broker()
+
+
+def publish_ingest_event(video_id: int, stage: str, **details: Any) -> None:
+    """Publishes an ingest stage transition; failures never break the ingest job."""
+    event = {"video_id": video_id, "stage": stage, **details}
+    try:
+        event_broker.publish(ingest_channel(video_id), event)
+    except Exception as e:
+        print(f"Error publishing ingest event: {e}")
@@ -1,22 +1,14 @@
 import json
-from typing import Dict, Any
-# from app.config import settings
-from google import genai
-from google.genai.errors import APIError
+from typing import Dict, Any, List
 import os
-import time
+from app.services.local_questions import generate_local_questions
+from app.services.prompt_builder import compact_context, record_usage
+from app.services.resilience import gemini_caller
 
-# # Initialize the Gemini Client. It automatically picks up the GEMINI_API_KEY.
-# try:
-#     client = genai.Client()
-# except Exception as e:
-#     # Client will be None if the key is not available, requiring fallback logic
-#     client = None 
-
-# MODEL = "gemini-2.5-flash" 
-# JSON_CONFIG = genai.types.GenerateContentConfig(
-#     response_mime_type="application/json",
-# )
+def _genai():
+    """google.genai, imported on first use so processes that never call Gemini do not load it."""
+    from google import genai
+    return genai
 
 
 class GeminiService:
@@ -37,38 +29,57 @@ class GeminiService:
             print("FATAL: Key was found but was empty after stripping quotes.")
             return None
 
-        # Print the result of the stripping for final diagnostic, if necessary
-        print(f"DIAGNOSTIC: Cleaned Key Length: {len(cleaned_api_key)}")
+        # GEMINI_BASE_URL points the client at a stand-in server for load and outage testing
+        base_url = os.getenv("GEMINI_BASE_URL")
+        if base_url:
+            return _genai().Client(api_key=cleaned_api_key, http_options=_genai().types.HttpOptions(base_url=base_url))
 
         # Use the cleaned key for initialization
-        return genai.Client(api_key=cleaned_api_key)
+        return _genai().Client(api_key=cleaned_api_key)
 
     @staticmethod
-    def generate_question(transcript_segment: str, timestamp: float, question_type: str) -> Dict[str, Any]:
-        """Generates a question (MCQ, fill_in, etc.) and options based on a transcript segment."""
-        MODEL = "gemini-2.5-flash" 
-        JSON_CONFIG = genai.types.GenerateContentConfig(
-            response_mime_type="application/json",
+    def _request_config(timeout_seconds: float, json_output: bool = True):
+        """Per-call config carrying the time left before the operation's deadline."""
+        types = _genai().types
+        return types.GenerateContentConfig(
+            response_mime_type="application/json" if json_output else None,
+            http_options=types.HttpOptions(timeout=int(timeout_seconds * 1000)),
         )
+
+    @staticmethod
+    def _local_questions(transcript_segment: str, timestamp: float, question_type: str, count: int, reason: str) -> List[Dict[str, Any]]:
+        """Extractive questions built on the CPU when Gemini cannot be used.
+
+        Only if the segment has no usable sentences does this fall back to a placeholder.
+        """
+        questions = generate_local_questions(transcript_segment, timestamp, question_type, count)
+        if questions:
+            return questions
+        return [{
+            "question_text": f"API Error Fallback: What is the main topic at {int(timestamp)}s?",
+            "options": ["Topic A", "Topic B", "Topic C", "Topic D"] if question_type == "mcq" else [],
+            "correct_answer": "Topic A",
+            "explanation": reason
+        }]
+
+    @staticmethod
+    def generate_question(transcript_segment: str, timestamp: float, question_type: str, final_quiz: bool = False) -> Dict[str, Any]:
+        """Generates a question (MCQ, fill_in, etc.) and options based on a transcript segment.
+
+        The segment is trimmed to its token budget keeping the most recent sentences.
+        """
+        MODEL = "gemini-2.5-flash" 
         client = GeminiService._get_client_or_fallback()
-        # if not client:
-        #     # Fallback for uninitialized client
-        #     return {
-        #         "question_text": f"Fallback: What is the main topic discussed at the {int(timestamp)}s mark?",
-        #         "options": ["Topic A", "Topic B", "Topic C", "Topic D"] if question_type == "mcq" else [],
-        #         "correct_answer": "Topic A",
-        #         "explanation": "Service unavailable: Gemini client not initialized."
-        #     }
         
-        #Trying to find the error, if client is initialized or not?
+        operation = "generate_final_quiz" if final_quiz else "generate_question"
+        transcript_segment = compact_context(transcript_segment, operation, keep="tail")
+
         if client is None:
-            return {
-                "question_text": f"FATAL ERROR: Client could not initialize for question at {int(timestamp)}s.",
-                "options": ["Check .env", "Check Docker-Compose", "Check Quota", "Check Firewall"], 
-                "correct_answer": "Check .env",
-                "explanation": "Client failed to initialize. Review container logs for specific API error details."
-            }
-            
+            return GeminiService._local_questions(
+                transcript_segment, timestamp, question_type, 1,
+                "Client failed to initialize. Review container logs for specific API error details."
+            )[0]
+
         prompt = f"""
         Generate a {question_type} question based on the following text content, which covers material up to {timestamp} seconds into a lecture.
         
@@ -88,44 +99,92 @@ class GeminiService:
         }}
         """
         
-        # response = client.generate_content(
-        #         model=MODEL,
-        #         contents=[prompt],
-        #         config=JSON_CONFIG,
-        #     )
-        # return json.loads(response.text)
         try:
-            response = client.models.generate_content(
+            response = gemini_caller.call(operation, lambda timeout: client.models.generate_content(
                 model=MODEL,
                 contents=[prompt],
-                config=JSON_CONFIG,
-            )
+                config=GeminiService._request_config(timeout),
+            ))
+            record_usage(operation, prompt, response)
             return json.loads(response.text)
         except Exception as e:
             print(f"Gemini API Call Failed: {e}")
             # Fallback for API call error
-            return {
-                "question_text": f"API Error Fallback: What is the main topic at {int(timestamp)}s?",
-                "options": ["Topic A", "Topic B", "Topic C", "Topic D"] if question_type == "mcq" else [],
-                "correct_answer": "Topic A",
-                "explanation": "Question generation failed due to service error."
-            }
+            return GeminiService._local_questions(
+                transcript_segment, timestamp, question_type, 1,
+                "Question generation failed due to service error."
+            )[0]
+
+    @staticmethod
+    def generate_question_variants(transcript_segment: str, timestamp: float, question_type: str, count: int) -> List[Dict[str, Any]]:
+        """Generates `count` distinct questions on the same material in a single call.
+
+        The first is the checkpoint's question, the rest are served on retries. One
+        call per checkpoint keeps ingest cost to extra output tokens, not extra requests.
+        """
+        if count <= 1:
+            return [GeminiService.generate_question(transcript_segment, timestamp, question_type)]
+
+        MODEL = "gemini-2.5-flash" 
+        client = GeminiService._get_client_or_fallback()
+        transcript_segment = compact_context(transcript_segment, "generate_question", keep="tail")
+        if client is None:
+            return GeminiService._local_questions(
+                transcript_segment, timestamp, question_type, count,
+                "Client failed to initialize. Review container logs for specific API error details."
+            )
+
+        prompt = f"""
+        Generate {count} different {question_type} questions based on the following text content, which covers material up to {timestamp} seconds into a lecture.
+        
+        Text Content: {transcript_segment}
+        
+        Requirements:
+        1. Each question must test understanding of a key concept in the text, and no two questions may be rewordings of each other.
+        2. For MCQ, provide exactly 4 options with only one correct answer.
+        3. Keep each explanation concise and clear.
+        
+        Return the result as a single JSON object (no markdown or extra text):
+        {{
+            "questions": [
+                {{
+                    "question_text": "string (the question)",
+                    "options": ["option1", "option2", "option3", "option4"], 
+                    "correct_answer": "string (the text of the correct option)",
+                    "explanation": "string (brief explanation)"
+                }}
+            ]
+        }}
+        """
+
+        try:
+            response = gemini_caller.call("generate_question", lambda timeout: client.models.generate_content(
+                model=MODEL,
+                contents=[prompt],
+                config=GeminiService._request_config(timeout),
+            ))
+            record_usage("generate_question", prompt, response)
+            questions = [
+                q for q in json.loads(response.text).get("questions", [])
+                if q.get("question_text") and q.get("correct_answer")
+            ]
+            if not questions:
+                raise ValueError("No usable questions in response")
+            return questions[:count]
+        except Exception as e:
+            print(f"Gemini API Call Failed: {e}")
+            # Fallback for API call error
+            return GeminiService._local_questions(
+                transcript_segment, timestamp, question_type, count,
+                "Question generation failed due to service error."
+            )
 
     @staticmethod
-    def grade_answer(question: str, user_answer: str, correct_answer: str) -> Dict[str, Any]:
+    def grade_answer(question: str, user_answer: str, correct_answer: str, context: str = "") -> Dict[str, Any]:
         """Grades a user's answer against the correct answer and provides an explanation."""
         MODEL = "gemini-2.5-flash" 
-        JSON_CONFIG = genai.types.GenerateContentConfig(
-            response_mime_type="application/json",
-        )
         client = GeminiService._get_client_or_fallback()
-        # if not client:
-        #     is_correct = user_answer.lower().strip() == correct_answer.lower().strip()
-        #     return {
-        #         "correct": is_correct,
-        #         "explanation": "Service unavailable. Grading based on simple string match." if not is_correct else "Answer correct.",
-        #         "hint": ""
-        #     }
+        context = compact_context(context, "grade_answer", keep="head")
             
         prompt = f"""
         Grade the user's answer. 
@@ -133,6 +192,7 @@ class GeminiService:
         Question: {question}
         Correct Answer: {correct_answer}
         User Answer: {user_answer}
+        Lecture Context: {context or "Not available"}
         
         Instructions:
         1. Respond with a boolean for the 'correct' field.
@@ -148,11 +208,12 @@ class GeminiService:
         """
         
         try:
-            response = client.models.generate_content(
+            response = gemini_caller.call("grade_answer", lambda timeout: client.models.generate_content(
                 model=MODEL,
                 contents=[prompt],
-                config=JSON_CONFIG,
-            )
+                config=GeminiService._request_config(timeout),
+            ))
+            record_usage("grade_answer", prompt, response)
             return json.loads(response.text)
         except Exception as e:
             # Fallback for API call error
@@ -167,111 +228,24 @@ class GeminiService:
     def generate_summary(transcript_segment: str, failed_question: str) -> str:
         """Generates a brief summary when a student fails all attempts."""
         MODEL = "gemini-2.5-flash" 
-        JSON_CONFIG = genai.types.GenerateContentConfig(
-            response_mime_type="application/json",
-        )
         client = GeminiService._get_client_or_fallback()
-        # if not client:
-        #     return "Please review the video content to better understand the concepts discussed."
+        transcript_segment = compact_context(transcript_segment, "generate_summary", keep="head")
             
         prompt = f"""
         The student failed the question: "{failed_question}".
         
-        Based on the content segment: {transcript_segment}
+        Based on the most relevant parts of the lecture: {transcript_segment}
         
         Provide a concise summary (2-3 sentences) of the core concepts in the text that would help the student answer the question. Keep it encouraging.
         """
         
         try:
-            response = client.models.generate_content(
+            response = gemini_caller.call("generate_summary", lambda timeout: client.models.generate_content(
                 model=MODEL,
                 contents=[prompt],
-            )
+                config=GeminiService._request_config(timeout, json_output=False),
+            ))
+            record_usage("generate_summary", prompt, response)
             return response.text.strip()
         except Exception as e:
             return "Summary generation failed. Please review the video content."
-    
-    @staticmethod
-    def generate_transcript(video_path: str) -> str | None:
-        """Uploads a video file and requests a full transcript from the Gemini API."""
-        if not os.path.exists(video_path):
-            print(f"Error: Video file not found at {video_path}")
-            return None
-        
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            print("Error: GEMINI_API_KEY environment variable is not set.")
-            return None
-
-        client = genai.Client(api_key=api_key)
-        file = None
-        try:
-            # 1. Upload the file to the Gemini API
-            print(f"Uploading file: {video_path}...")
-            file = client.files.upload(file=video_path)
-
-            # --- GUARANTEED POLLING FIX ---
-            print(f"Waiting for file {file.name} to become active...")
-            
-            # Poll the file status, waiting up to 5 minutes (300 seconds)
-            timeout = time.time() + 300 
-            
-            # Get the initial file object with the 'state' property
-            current_file = client.files.get(name=file.name)
-            
-            while current_file.state.name != "ACTIVE" and time.time() < timeout:
-                # Check the file state every 5 seconds
-                time.sleep(5) 
-                current_file = client.files.get(name=file.name)
-
-                if current_file.state.name == "FAILED":
-                    print(f"File processing failed: {current_file.error.message}")
-                    client.files.delete(name=current_file.name)
-                    return None
-            
-            if current_file.state.name != "ACTIVE":
-                print("Error: File did not become active within the timeout period.")
-                client.files.delete(name=current_file.name)
-                return None
-            # --- END GUARANTEED POLLING FIX ---
-
-            # print(f"Waiting for file {file.name} to become active...")
-            # # Poll the file status, waiting up to 5 minutes (300 seconds)
-            # timeout = time.time() + 300 
-            # while file.state.name != "ACTIVE" and time.time() < timeout:
-            #     file = client.files.get(name=file.name)
-            #     if file.state.name == "FAILED":
-            #         print(f"File processing failed: {file.error.message}")
-            #         client.files.delete(name=file.name)
-            #         return None
-            #     if file.state.name != "ACTIVE":
-            #         time.sleep(5) # Wait 5 seconds before checking again
-            
-            # if file.state.name != "ACTIVE":
-            #     print("Error: File did not become active within the timeout period.")
-            #     client.files.delete(name=file.name)
-            #     return None
-
-            # 2. Call the model to transcribe the video
-            print("Requesting transcription...")
-            response = client.models.generate_content(
-                model='gemini-2.5-flash', # Or a model optimized for long context/video
-                contents=[
-                    file,
-                    "Provide a complete, accurate, and time-stamped transcript of the entire video. Focus on the spoken content and do not include any introductory or concluding remarks about the transcription process itself."
-                ],
-            )
-            
-            # 3. Clean up the uploaded file (Best practice to clean up API files immediately)
-            client.files.delete(name=file.name)
-            
-            return response.text.strip()
-            
-        except APIError as e:
-            print(f"Gemini API Error during transcription: {e}")
-            if file:
-                client.files.delete(name=file.name)
-            return None
-        except Exception as e:
-            print(f"An unexpected error occurred during transcription: {e}")
-            return None
\ No newline at end of file
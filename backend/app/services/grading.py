@@ -0,0 +1,86 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from app.models import Question, UserProgress
+from app.services.gemini_service import GeminiService
+
+
+def normalize_answer(answer: Optional[str]) -> str:
+    return " ".join((answer or "").lower().split())
+
+
+def grade_locally(question: Question, user_answer: str) -> Optional[Dict[str, Any]]:
+    """Grades without the LLM when possible; returns None if the answer needs Gemini.
+
+    MCQ answers are one of the listed options, so an exact (normalized) match is
+    authoritative. Free-text answers that match exactly are also accepted locally;
+    anything else goes to the LLM, which is lenient with spelling.
+    """
+    is_match = normalize_answer(user_answer) == normalize_answer(question.correct_answer)
+    if is_match:
+        return {"correct": True, "explanation": question.explanation or "Answer correct.", "hint": ""}
+    if question.question_type == "mcq" and question.options:
+        return {
+            "correct": False,
+            "explanation": question.explanation or "That is not the correct option.",
+            "hint": "Review the video content."
+        }
+    return None
+
+
+def grade_answer(
+    question: Question,
+    user_answer: str,
+    get_context: Callable[[], str],
+    before_llm: Optional[Callable[[], None]] = None
+) -> Dict[str, Any]:
+    """Local fast path first, Gemini only for free-text answers that need judgement.
+
+    `get_context` and `before_llm` (e.g. a rate limit check that may raise) are
+    only called when Gemini is, so local grading never touches the index or the budget.
+    """
+    result = grade_locally(question, user_answer)
+    if result is not None:
+        return result
+    if before_llm:
+        before_llm()
+    return GeminiService.grade_answer(question.question_text, user_answer, question.correct_answer, get_context())
+
+
+def copy_json_columns(progress: UserProgress) -> UserProgress:
+    """Replaces the JSON columns with copies so reassignment is detected as a change."""
+    progress.completed_questions = list(progress.completed_questions or [])
+    progress.failed_attempts = dict(progress.failed_attempts or {})
+    return progress
+
+
+def record_attempt(progress: UserProgress, checkpoint_id: int, correct: bool, current_timestamp: float, retry_limit: int) -> int:
+    """Applies one graded attempt to `progress` and returns the failed attempt count.
+
+    Progress is keyed by the checkpoint (primary question) id, whichever variant was answered.
+    The count stops at `retry_limit`: wrong answers after that only rewind again.
+    """
+    attempts = progress.failed_attempts.get(str(checkpoint_id), 0)
+    if correct:
+        progress.completed_questions = progress.completed_questions + [checkpoint_id]
+        progress.current_timestamp = current_timestamp
+    else:
+        attempts = min(attempts + 1, retry_limit)
+        progress.failed_attempts = {**progress.failed_attempts, str(checkpoint_id): attempts}
+    return attempts
+
+
+def update_completion(progress: UserProgress, question_ids: Iterable[int]) -> None:
+    """Sets is_completed and final_score once every question of the video is answered.
+
+    final_score is first-try accuracy in percent: the share of questions that were
+    completed without any failed attempt.
+    """
+    question_ids: List[int] = list(question_ids)
+    completed = set(progress.completed_questions or [])
+    if not question_ids or not completed.issuperset(question_ids):
+        return
+    failed_attempts = progress.failed_attempts or {}
+    first_try = sum(1 for qid in question_ids if failed_attempts.get(str(qid), 0) == 0)
+    progress.is_completed = True
+    progress.final_score = round(100.0 * first_try / len(question_ids), 2)
+    progress.completed_at = datetime.utcnow()
@@ -0,0 +1,190 @@
+import asyncio
+import base64
+import hashlib
+import json
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse, Response
+from app.config import settings
+
+MAX_TRACKED_KEYS = 100_000
+MAX_KEY_LENGTH = 255
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+IN_FLIGHT = "in_flight"
+DONE = "done"
+
+
+def request_fingerprint(*parts: Any) -> str:
+    """Hash of what makes two requests the same (route, path parameters, body)."""
+    payload = json.dumps(jsonable_encoder(parts), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class InProcessIdempotencyStore:
+    """Idempotency records held in memory; duplicates are only recognised by the process that saw the first request."""
+
+    def __init__(self, max_keys: int = MAX_TRACKED_KEYS):
+        self.max_keys = max_keys
+        self._records: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._records.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._records[key]
+            return None
+        return entry[1]
+
+    def _set(self, key: str, record: Dict[str, Any], ttl: float) -> None:
+        self._records[key] = (time.monotonic() + ttl, record)
+        self._records.move_to_end(key)
+        while len(self._records) > self.max_keys:
+            self._records.popitem(last=False)
+
+    async def claim(self, key: str, record: Dict[str, Any], lease: float) -> Optional[Dict[str, Any]]:
+        """Stores `record` unless the key is taken; returns the existing record if it is."""
+        existing = self._get(key)
+        if existing is not None:
+            return existing
+        self._set(key, record, lease)
+        return None
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._get(key)
+
+    async def complete(self, key: str, record: Dict[str, Any], ttl: float) -> None:
+        self._set(key, record, ttl)
+
+    async def release(self, key: str, record: Dict[str, Any]) -> None:
+        if self._get(key) == record:
+            del self._records[key]
+
+
+# Deletes the in-flight record only if it is still ours (the lease may have run out and been taken over)
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisIdempotencyStore:
+    """Idempotency records shared by every API node, with Redis expiring them."""
+
+    def __init__(self, redis_url: str):
+        # Imported lazily: redis is only needed when REDIS_URL is configured
+        import redis.asyncio as redis_asyncio
+
+        self._client = redis_asyncio.Redis.from_url(redis_url)
+        self._release = self._client.register_script(RELEASE_SCRIPT)
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return f"idempotency:{key}"
+
+    @staticmethod
+    def _encode(record: Dict[str, Any]) -> str:
+        return json.dumps(record, sort_keys=True)
+
+    async def claim(self, key: str, record: Dict[str, Any], lease: float) -> Optional[Dict[str, Any]]:
+        while True:
+            if await self._client.set(self._key(key), self._encode(record), nx=True, px=int(lease * 1000)):
+                return None
+            existing = await self._client.get(self._key(key))
+            # Gone between SET and GET (expired or released): try to claim it again
+            if existing is not None:
+                return json.loads(existing)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        existing = await self._client.get(self._key(key))
+        return json.loads(existing) if existing is not None else None
+
+    async def complete(self, key: str, record: Dict[str, Any], ttl: float) -> None:
+        await self._client.set(self._key(key), self._encode(record), px=int(ttl * 1000))
+
+    async def release(self, key: str, record: Dict[str, Any]) -> None:
+        await self._release(keys=[self._key(key)], args=[self._encode(record)])
+
+
+def create_idempotency_store():
+    if settings.redis_url:
+        return RedisIdempotencyStore(settings.redis_url)
+    return InProcessIdempotencyStore()
+
+
+idempotency_store = create_idempotency_store()
+
+
+def replay(record: Dict[str, Any]) -> Response:
+    return Response(
+        content=base64.b64decode(record["body"]),
+        status_code=record["status_code"],
+        media_type=record["media_type"],
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+async def run_idempotent(
+    idempotency_key: Optional[str],
+    scope: str,
+    fingerprint: str,
+    work: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Runs `work` once per Idempotency-Key and answers repeats with the stored response.
+
+    `scope` separates users and routes, so keys only have to be unique per client.
+    A repeat that arrives while the first request is still running waits for it
+    (up to idempotency_wait_seconds, then 409) instead of doing the work again;
+    the same key with a different request is refused with 422. Only responses
+    are stored: if `work` raises, the key is freed so the client can retry.
+    Without a key, `work` simply runs.
+    """
+    if idempotency_key is None:
+        return await work()
+    if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Idempotency-Key header")
+
+    key = f"{scope}:{idempotency_key}"
+    claim = {"state": IN_FLIGHT, "fingerprint": fingerprint, "owner": uuid.uuid4().hex}
+    deadline = time.monotonic() + settings.idempotency_wait_seconds
+    while True:
+        existing = await idempotency_store.claim(key, claim, settings.idempotency_lease_seconds)
+        if existing is None:
+            break
+        if existing["fingerprint"] != fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request",
+            )
+        if existing["state"] == DONE:
+            return replay(existing)
+        if time.monotonic() >= deadline:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still being processed",
+                headers={"Retry-After": "1"},
+            )
+        # Attach to the original; if it fails the key is freed and this request claims it
+        await asyncio.sleep(settings.idempotency_poll_seconds)
+
+    try:
+        result = await work()
+    except BaseException:
+        await idempotency_store.release(key, claim)
+        raise
+    response = result if isinstance(result, Response) else ORJSONResponse(jsonable_encoder(result))
+    await idempotency_store.complete(key, {
+        "state": DONE,
+        "fingerprint": fingerprint,
+        "status_code": response.status_code,
+        "media_type": response.media_type,
+        "body": base64.b64encode(response.body).decode(),
+    }, settings.idempotency_ttl_seconds)
+    return response
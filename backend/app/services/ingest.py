@@ -0,0 +1,239 @@
+from contextlib import nullcontext
+from datetime import datetime
+from typing import List, Optional
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Video, Question
+from app.services.gemini_service import GeminiService
+from app.services.analytics import initialize_stats
+from app.services.catalog_cache import catalog_cache
+from app.services.events import publish_ingest_event
+from app.services.local_questions import generate_local_questions
+from app.services.prompt_builder import compact_context
+from app.services.retrieval import index_transcript, segments_from_text
+from app.services.search import index_segments
+from app.services.storage import storage
+from app.services.storyboard import create_storyboard
+from app.services.transcription import transcription_scheduler
+import subprocess
+import threading
+
+def get_video_duration(video_path: str) -> float:
+    """Uses ffprobe (installed in Dockerfile) to extract duration reliably."""
+    try:
+        # Command to run ffprobe and output duration in seconds
+        cmd = [
+            'ffprobe',
+            '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1',
+            video_path
+        ]
+
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        duration = float(result.stdout.strip())
+        return duration
+    except Exception as e:
+        print(f"Error calculating video duration: {e}")
+        return 0.0
+
+def set_stage(db, video: Video, stage: str, **details) -> None:
+    """Persists the coarse stage on the video row and pushes the transition to subscribers.
+
+    Every stage renews the worker's claim (`claimed_at`) on the video.
+    """
+    video.processing_status = stage
+    video.claimed_at = datetime.utcnow()
+    db.commit()
+    publish_ingest_event(video.id, stage, **details)
+
+def generate_checkpoint_questions(
+    generator: str,
+    transcript_segment: str,
+    transcript: str,
+    timestamp: float,
+    count: int,
+    final_quiz: bool = False
+) -> List[dict]:
+    """The question pool for one checkpoint, from Gemini or the local extractive generator.
+
+    "local" never calls the network; its distractors come from the whole transcript.
+    Both generators trim the segment to the same budget, the final quiz's for `final_quiz`.
+    """
+    if generator == "local":
+        operation = "generate_final_quiz" if final_quiz else "generate_question"
+        segment = compact_context(transcript_segment, operation, keep="tail")
+        questions = generate_local_questions(segment, timestamp, "mcq", count, corpus=transcript)
+        if questions:
+            return questions
+    if final_quiz:
+        return [GeminiService.generate_question(transcript_segment, timestamp, "mcq", final_quiz=True)]
+    return GeminiService.generate_question_variants(transcript_segment, timestamp, "mcq", count)
+
+def ingest_video(
+    video_id: int,
+    storage_key: str,
+    timestamps: List[float],
+    generator: Optional[str] = None,
+    generation_slots: Optional[threading.Semaphore] = None,
+) -> None:
+    """Transcribes an uploaded video (read from media storage) and generates its questions.
+
+    Runs outside the upload request (as a background task) with its own session.
+    Per-question progress is only published, not written, to keep DB writes to
+    one per stage. `generator` is "gemini" or "local" (defaults to QUESTION_GENERATOR).
+    Transcription goes through the shared scheduler (local Whisper or Gemini);
+    callers ingesting many videos at once bound question calls with `generation_slots`.
+    """
+    generator = generator or settings.question_generator
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.id == video_id).first()
+        if not video:
+            print(f"Error: Video {video_id} no longer exists, skipping ingest.")
+            return
+
+        set_stage(db, video, "transcribing", percent=0)
+        print(f"Starting transcript generation for: {storage_key}")
+        # Whisper and ffprobe need a file; remote storage downloads it for this block only
+        with storage.local_path(storage_key) as video_path:
+            # The clip length decides where it is transcribed
+            duration = get_video_duration(video_path)
+            transcription = transcription_scheduler.transcribe(video_path, duration)
+            publish_ingest_event(video.id, "transcribing", percent=100)
+            # Seek previews from the same local copy; a failure only leaves the video without them
+            set_stage(db, video, "generating_storyboard")
+            video.storyboard = create_storyboard(video.id, video_path, duration)
+        segments = []
+        
+        if transcription and transcription["text"]:
+            # Store the generated transcript
+            video.transcript = transcription["text"]
+            # Embed transcript chunks so prompts can use only the relevant parts
+            segments = transcription["segments"] or segments_from_text(transcription["text"])
+            chunk_count = index_transcript(db, video.id, segments)
+            segment_count = index_segments(db, video.id, segments)
+            print(f"Indexed {chunk_count} transcript chunks and {segment_count} searchable segments.")
+
+            video.duration = duration
+            print(f"Video duration calculated: {video.duration} seconds")
+            print("Transcript successfully saved to database.")
+        else:
+            # If transcription fails, the video.transcript remains None, and the 
+            # fallback logic in the next section will handle question generation.
+            print("Warning: Transcript generation failed or returned empty. Using fallback questions.")
+
+        # One question per timestamp plus the final quiz
+        total_questions = len(timestamps) + 1
+        set_stage(db, video, "generating_questions", question=0, total=total_questions)
+
+        # Create questions for each timestamp. If transcript is available use Gemini, otherwise create fallback questions.
+        # All pools are generated before any is written, so no transaction stays open across LLM calls.
+        question_pools = []
+        for index, timestamp in enumerate(timestamps):
+            if video.transcript:
+                if segments and segments[0].get("start") is not None:
+                    # Everything said before the checkpoint; the prompt builder keeps the latest part
+                    transcript_segment = " ".join(s["text"] for s in segments if s["start"] < timestamp)
+                else:
+                    transcript_segment = video.transcript[:int(timestamp * 10)]  # Rough estimate
+                try:
+                    # The checkpoint question plus its retry variants, in one Gemini call
+                    with generation_slots or nullcontext():
+                        question_pool = generate_checkpoint_questions(
+                            generator, transcript_segment, video.transcript, timestamp,
+                            1 + settings.question_variants_per_checkpoint
+                        )
+                except Exception:
+                    question_pool = [{
+                        "question_text": f"At {int(timestamp)}s: What is the main idea discussed around this time?",
+                        "options": ["Main idea A", "Main idea B", "Main idea C", "Main idea D"],
+                        "correct_answer": "Main idea A",
+                        "explanation": "Fallback question generated because Gemini failed."
+                    }]
+            else:
+                # Fallback simple question when no transcript available
+                question_pool = [{
+                    "question_text": f"At {int(timestamp)}s: What is the main idea discussed around this time?",
+                    "options": ["Main idea A", "Main idea B", "Main idea C", "Main idea D"],
+                    "correct_answer": "Main idea A",
+                    "explanation": "Fallback question generated because no transcript was available."
+                }]
+            question_pools.append((timestamp, question_pool))
+            publish_ingest_event(video.id, "generating_questions", question=index + 1, total=total_questions)
+
+        # A reclaimed ingest replaces whatever the crashed one wrote
+        db.query(Question).filter(Question.video_id == video.id).delete(synchronize_session=False)
+        for timestamp, question_pool in question_pools:
+            checkpoint = None
+            for variant_index, question_data in enumerate(question_pool):
+                question = Question(
+                    video_id=video.id,
+                    timestamp=timestamp,
+                    question_type=question_data.get("question_type", "mcq"),
+                    question_text=question_data.get("question_text"),
+                    options=question_data.get("options"),
+                    correct_answer=question_data.get("correct_answer"),
+                    explanation=question_data.get("explanation"),
+                    variant_of_id=checkpoint.id if checkpoint else None,
+                    variant_index=variant_index,
+                )
+                db.add(question)
+                if checkpoint is None:
+                    # Variants reference the primary question, so it needs its id first
+                    db.flush()
+                    checkpoint = question
+        db.commit()
+
+        # Generate a final quiz question at the end of the video
+        try:
+            final_timestamp = video.duration or 0
+            if video.transcript:
+                # Trimmed to the final-quiz budget on sentence boundaries, keeping the end
+                with generation_slots or nullcontext():
+                    final_q = generate_checkpoint_questions(
+                        generator, video.transcript, video.transcript, final_timestamp, 1, final_quiz=True
+                    )[0]
+                fq_type = final_q.get("question_type", "mcq")
+                fq_text = final_q.get("question_text")
+                fq_options = final_q.get("options")
+                fq_answer = final_q.get("correct_answer")
+                fq_explanation = final_q.get("explanation")
+            else:
+                fq_type = "mcq"
+                fq_text = "Final quiz: What is the main takeaway from this video?"
+                fq_options = ["Takeaway A", "Takeaway B", "Takeaway C", "Takeaway D"]
+                fq_answer = "Takeaway A"
+                fq_explanation = "Fallback final quiz question."
+
+            final_question = Question(
+                video_id=video.id,
+                timestamp=final_timestamp,
+                question_type=fq_type,
+                question_text=fq_text,
+                options=fq_options,
+                correct_answer=fq_answer,
+                explanation=fq_explanation,
+                is_final_quiz=True,
+            )
+            db.add(final_question)
+            db.commit()
+        except Exception:
+            db.rollback()
+        publish_ingest_event(video.id, "generating_questions", question=total_questions, total=total_questions)
+
+        initialize_stats(db, video.id)
+        # Learners only see the video once its questions exist
+        video.is_published = True
+        set_stage(db, video, "ready")
+    except Exception as e:
+        print(f"Error during ingest of video {video_id}: {e}")
+        db.rollback()
+        video = db.query(Video).filter(Video.id == video_id).first()
+        if video:
+            set_stage(db, video, "failed", error=str(e))
+        else:
+            publish_ingest_event(video_id, "failed", error=str(e))
+    finally:
+        db.close()
+        catalog_cache.invalidate(video_id)
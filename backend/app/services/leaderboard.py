@@ -0,0 +1,520 @@
+import bisect
+import logging
+import math
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import Question, User, UserProgress, Video
+
+# Boards are sorted sets of user id -> score, higher is better on every board, so a
+# rank is always ZREVRANK. Scores pack the tie-breaker into the low digits:
+#   video:{id}:accuracy  first-try accuracy (basis points), then faster completion
+#   video:{id}:time      negated completion seconds (learners with a known start only)
+#   global:accuracy      first-try accuracy over all completed videos, then completions
+#   global:completions   completed videos
+VIDEO_METRICS = ("accuracy", "time")
+GLOBAL_METRICS = ("accuracy", "completions")
+TIME_SLOTS = 10_000_000  # completion times are capped just under ~116 days
+COMPLETION_SLOTS = 1_000_000
+
+logger = logging.getLogger(__name__)
+
+
+class Completion(NamedTuple):
+    user_id: int
+    video_id: int
+    first_try: int
+    questions: int
+    seconds: Optional[int]  # None when the progress row predates started_at
+
+
+def video_board(video_id: int, metric: str) -> str:
+    return f"video:{video_id}:{metric}"
+
+
+def global_board(metric: str) -> str:
+    return f"global:{metric}"
+
+
+def basis_points(first_try: int, questions: int) -> int:
+    # floor(x + 0.5) rather than round(): the Redis script must compute the same value
+    return math.floor(10000 * first_try / questions + 0.5) if questions else 0
+
+
+def video_accuracy_score(completion: Completion) -> int:
+    seconds = TIME_SLOTS - 1 if completion.seconds is None else min(completion.seconds, TIME_SLOTS - 1)
+    return basis_points(completion.first_try, completion.questions) * TIME_SLOTS + (TIME_SLOTS - 1 - seconds)
+
+
+def global_accuracy_score(first_try: int, questions: int, completions: int) -> int:
+    return basis_points(first_try, questions) * COMPLETION_SLOTS + min(completions, COMPLETION_SLOTS - 1)
+
+
+def board_value(board: str, score: float) -> float:
+    """The metric shown to learners for a stored score."""
+    kind, _, metric = board.rpartition(":")
+    if metric == "accuracy":
+        slots = TIME_SLOTS if kind.startswith("video") else COMPLETION_SLOTS
+        return (int(score) // slots) / 100
+    if metric == "time":
+        return -score
+    return score
+
+
+def elapsed_seconds(started_at: Optional[datetime], completed_at: Optional[datetime]) -> Optional[int]:
+    if started_at is None or completed_at is None:
+        return None
+    return max(0, math.ceil((completed_at - started_at).total_seconds()))
+
+
+def completion_for(progress: UserProgress, question_ids: Iterable[int]) -> Completion:
+    """Reads a just-completed progress row into a Completion, before the commit expires it."""
+    question_ids = list(question_ids)
+    failed_attempts = progress.failed_attempts or {}
+    first_try = sum(1 for qid in question_ids if failed_attempts.get(str(qid), 0) == 0)
+    started_at = progress.started_at
+    if started_at is None and progress.id is None:
+        # Inserted by this very request; the column default is only applied on flush
+        started_at = progress.completed_at
+    seconds = elapsed_seconds(started_at, progress.completed_at)
+    return Completion(progress.user_id, progress.video_id, first_try, len(question_ids), seconds)
+
+
+class BoardSnapshot(NamedTuple):
+    """Everything a rebuild writes: board -> {user_id: score}, user_id -> global totals."""
+    boards: Dict[str, Dict[int, int]]
+    totals: Dict[int, Dict[str, int]]
+
+
+class SortedBoard:
+    """A sorted set: scores by member plus (-score, member) keys kept in rank order."""
+
+    def __init__(self):
+        self.scores: Dict[int, int] = {}
+        self.order: List[Tuple[int, int]] = []
+
+    def add(self, member: int, score: int) -> None:
+        old = self.scores.get(member)
+        if old is not None:
+            del self.order[bisect.bisect_left(self.order, (-old, member))]
+        self.scores[member] = score
+        bisect.insort(self.order, (-score, member))
+
+    def remove(self, member: int) -> None:
+        old = self.scores.pop(member, None)
+        if old is not None:
+            del self.order[bisect.bisect_left(self.order, (-old, member))]
+
+    def rank(self, member: int) -> Optional[int]:
+        score = self.scores.get(member)
+        if score is None:
+            return None
+        return bisect.bisect_left(self.order, (-score, member))
+
+
+class InProcessLeaderboard:
+    """Boards held in memory, for development, tests and single-process deployments.
+
+    Same semantics as RedisLeaderboard; list insertion makes updates O(n) in the
+    worst case, which is fine at the sizes a single process serves.
+    """
+
+    def __init__(self):
+        self._boards: Dict[str, SortedBoard] = defaultdict(SortedBoard)
+        self._totals: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._built = False
+        self._lock = threading.Lock()
+
+    def record_completion(self, completion: Completion) -> bool:
+        """Adds a first completion of a video; False if the learner was already on its board."""
+        member = completion.user_id
+        with self._lock:
+            accuracy = self._boards[video_board(completion.video_id, "accuracy")]
+            if member in accuracy.scores:
+                return False
+            accuracy.add(member, video_accuracy_score(completion))
+            if completion.seconds is not None:
+                self._boards[video_board(completion.video_id, "time")].add(member, -completion.seconds)
+            totals = self._totals[member]
+            totals["first_try"] += completion.first_try
+            totals["questions"] += completion.questions
+            totals["completions"] += 1
+            self._boards[global_board("completions")].add(member, totals["completions"])
+            self._boards[global_board("accuracy")].add(
+                member, global_accuracy_score(totals["first_try"], totals["questions"], totals["completions"])
+            )
+            return True
+
+    def remove_video(self, video_id: int, completions: Iterable[Completion]) -> int:
+        """Drops a video's boards and takes its completions out of the learners'
+        totals; returns how many were removed (those on its board only)."""
+        with self._lock:
+            accuracy = self._boards.pop(video_board(video_id, "accuracy"), None)
+            self._boards.pop(video_board(video_id, "time"), None)
+            if accuracy is None:
+                return 0
+            removed = 0
+            for completion in completions:
+                member = completion.user_id
+                if member not in accuracy.scores:
+                    continue
+                removed += 1
+                totals = self._totals[member]
+                totals["first_try"] -= completion.first_try
+                totals["questions"] -= completion.questions
+                totals["completions"] -= 1
+                if totals["completions"] <= 0:
+                    del self._totals[member]
+                    self._boards[global_board("completions")].remove(member)
+                    self._boards[global_board("accuracy")].remove(member)
+                    continue
+                self._boards[global_board("completions")].add(member, totals["completions"])
+                self._boards[global_board("accuracy")].add(
+                    member, global_accuracy_score(totals["first_try"], totals["questions"], totals["completions"])
+                )
+            return removed
+
+    def top(self, board: str, limit: int, offset: int = 0) -> List[Tuple[int, float]]:
+        with self._lock:
+            entries = self._boards[board].order[offset:offset + limit] if board in self._boards else []
+            return [(member, -negated) for negated, member in entries]
+
+    def rank(self, board: str, user_id: int) -> Optional[Tuple[int, float]]:
+        """(0-based rank, score), or None if the user is not on the board."""
+        with self._lock:
+            if board not in self._boards:
+                return None
+            sorted_board = self._boards[board]
+            rank = sorted_board.rank(user_id)
+            return None if rank is None else (rank, sorted_board.scores[user_id])
+
+    def size(self, board: str) -> int:
+        with self._lock:
+            return len(self._boards[board].scores) if board in self._boards else 0
+
+    def is_built(self) -> bool:
+        return self._built
+
+    def claim_rebuild(self) -> bool:
+        return True
+
+    def replace(self, snapshot: BoardSnapshot) -> None:
+        boards: Dict[str, SortedBoard] = defaultdict(SortedBoard)
+        for name, scores in snapshot.boards.items():
+            board = boards[name]
+            board.scores = dict(scores)
+            board.order = sorted((-score, member) for member, score in scores.items())
+        totals: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for user_id, values in snapshot.totals.items():
+            totals[user_id].update(values)
+        with self._lock:
+            self._boards, self._totals, self._built = boards, totals, True
+
+
+# Same steps as InProcessLeaderboard.record_completion, atomic in Redis.
+# KEYS: video accuracy board, video time board, user totals, global accuracy, global completions
+# ARGV: member, video accuracy score, negated seconds ('' if unknown), first-try count, question count
+RECORD_COMPLETION_SCRIPT = """
+if redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+if ARGV[3] ~= '' then
+    redis.call('ZADD', KEYS[2], ARGV[3], ARGV[1])
+end
+local first_try = redis.call('HINCRBY', KEYS[3], 'first_try', ARGV[4])
+local questions = redis.call('HINCRBY', KEYS[3], 'questions', ARGV[5])
+local completions = redis.call('HINCRBY', KEYS[3], 'completions', 1)
+local accuracy = 0
+if questions > 0 then
+    accuracy = math.floor(10000 * first_try / questions + 0.5)
+end
+redis.call('ZADD', KEYS[5], completions, ARGV[1])
+redis.call('ZADD', KEYS[4], accuracy * %d + math.min(completions, %d), ARGV[1])
+return 1
+""" % (COMPLETION_SLOTS, COMPLETION_SLOTS - 1)
+
+# The reverse of RECORD_COMPLETION_SCRIPT for a deleted video, one learner at a time.
+# Same KEYS; ARGV: member, first-try count, question count
+REMOVE_COMPLETION_SCRIPT = """
+if not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return 0
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+local first_try = redis.call('HINCRBY', KEYS[3], 'first_try', -ARGV[2])
+local questions = redis.call('HINCRBY', KEYS[3], 'questions', -ARGV[3])
+local completions = redis.call('HINCRBY', KEYS[3], 'completions', -1)
+if completions <= 0 then
+    redis.call('DEL', KEYS[3])
+    redis.call('ZREM', KEYS[4], ARGV[1])
+    redis.call('ZREM', KEYS[5], ARGV[1])
+    return 1
+end
+local accuracy = 0
+if questions > 0 then
+    accuracy = math.floor(10000 * first_try / questions + 0.5)
+end
+redis.call('ZADD', KEYS[5], completions, ARGV[1])
+redis.call('ZADD', KEYS[4], accuracy * %d + math.min(completions, %d), ARGV[1])
+return 1
+""" % (COMPLETION_SLOTS, COMPLETION_SLOTS - 1)
+
+KEY_PREFIX = "leaderboard:"
+BUILT_KEY = KEY_PREFIX + "built"
+REBUILDING_KEY = KEY_PREFIX + "rebuilding"
+REBUILD_LEASE_SECONDS = 300
+# Completions committed this long before a rebuild started are replayed after it; covers
+# an answer request that stamped completed_at, then committed while the snapshot was read
+REBUILD_CATCH_UP_SECONDS = 60
+
+
+class RedisLeaderboard:
+    """Boards as Redis sorted sets shared by every API process.
+
+    Rank lookups are ZREVRANK (O(log n)) and top-K pages ZREVRANGE
+    (O(log n + K)); a completion is one script call. Boards are a cache of the
+    database: rebuild_leaderboards repopulates them after a flush.
+    """
+
+    def __init__(self, redis_url: str):
+        # Imported lazily: redis is only needed when REDIS_URL is configured
+        import redis
+
+        self._client = redis.Redis.from_url(redis_url)
+        self._record = self._client.register_script(RECORD_COMPLETION_SCRIPT)
+        self._remove = self._client.register_script(REMOVE_COMPLETION_SCRIPT)
+
+    @staticmethod
+    def _key(board: str) -> str:
+        return KEY_PREFIX + board
+
+    @staticmethod
+    def _totals_key(user_id: int) -> str:
+        return f"{KEY_PREFIX}totals:{user_id}"
+
+    def _completion_keys(self, completion: Completion) -> List[str]:
+        return [
+            self._key(video_board(completion.video_id, "accuracy")),
+            self._key(video_board(completion.video_id, "time")),
+            self._totals_key(completion.user_id),
+            self._key(global_board("accuracy")),
+            self._key(global_board("completions")),
+        ]
+
+    def record_completion(self, completion: Completion) -> bool:
+        keys = self._completion_keys(completion)
+        args = [
+            completion.user_id,
+            video_accuracy_score(completion),
+            "" if completion.seconds is None else -completion.seconds,
+            completion.first_try,
+            completion.questions,
+        ]
+        return bool(self._record(keys=keys, args=args))
+
+    def remove_video(self, video_id: int, completions: Iterable[Completion]) -> int:
+        # Each script skips learners no longer on the board, so a retry never subtracts twice
+        removed = 0
+        for completion in completions:
+            args = [completion.user_id, completion.first_try, completion.questions]
+            removed += self._remove(keys=self._completion_keys(completion), args=args)
+        self._client.delete(self._key(video_board(video_id, "accuracy")), self._key(video_board(video_id, "time")))
+        return removed
+
+    def top(self, board: str, limit: int, offset: int = 0) -> List[Tuple[int, float]]:
+        if limit <= 0:
+            return []
+        entries = self._client.zrevrange(self._key(board), offset, offset + limit - 1, withscores=True)
+        return [(int(member), score) for member, score in entries]
+
+    def rank(self, board: str, user_id: int) -> Optional[Tuple[int, float]]:
+        pipe = self._client.pipeline(transaction=False)
+        pipe.zrevrank(self._key(board), user_id)
+        pipe.zscore(self._key(board), user_id)
+        rank, score = pipe.execute()
+        return None if rank is None else (rank, score)
+
+    def size(self, board: str) -> int:
+        return self._client.zcard(self._key(board))
+
+    def is_built(self) -> bool:
+        return bool(self._client.exists(BUILT_KEY))
+
+    def claim_rebuild(self) -> bool:
+        """Lets one API process rebuild after a flush while the others serve what is there."""
+        return bool(self._client.set(REBUILDING_KEY, 1, nx=True, ex=REBUILD_LEASE_SECONDS))
+
+    def replace(self, snapshot: BoardSnapshot, chunk_size: int = 1000) -> None:
+        """Writes every board and every learner's totals under a staging key, then
+        renames them all into place in one transaction, so readers and
+        record_completion see either the old or the rebuilt state, never a mix."""
+        staging = f"{KEY_PREFIX}rebuild:"
+        staged: Dict[str, str] = {}  # staging key -> live key
+        pipe = self._client.pipeline(transaction=False)
+        for name, scores in snapshot.boards.items():
+            key = staging + name
+            pipe.delete(key)
+            items = list(scores.items())
+            for start in range(0, len(items), chunk_size):
+                pipe.zadd(key, dict(items[start:start + chunk_size]))
+            staged[key] = self._key(name)
+            if len(pipe) >= chunk_size:
+                pipe.execute()
+        for user_id, totals in snapshot.totals.items():
+            key = f"{staging}totals:{user_id}"
+            pipe.delete(key)
+            pipe.hset(key, mapping=totals)
+            staged[key] = self._totals_key(user_id)
+            if len(pipe) >= chunk_size:
+                pipe.execute()
+        pipe.execute()
+        # Boards and totals nobody is on any more (deleted videos, reset progress)
+        live = set(staged.values())
+        stale = [
+            key
+            for pattern in (f"{KEY_PREFIX}video:*", f"{KEY_PREFIX}global:*", f"{KEY_PREFIX}totals:*")
+            for key in self._client.scan_iter(match=pattern, count=1000)
+            if key.decode() not in live
+        ]
+        swap = self._client.pipeline(transaction=True)
+        for key, live_key in staged.items():
+            swap.rename(key, live_key)
+        if stale:
+            swap.delete(*stale)
+        swap.set(BUILT_KEY, datetime.utcnow().isoformat())
+        swap.delete(REBUILDING_KEY)
+        swap.execute()
+
+
+def create_leaderboard():
+    if settings.redis_url:
+        return RedisLeaderboard(settings.redis_url)
+    return InProcessLeaderboard()
+
+
+leaderboard = create_leaderboard()
+
+
+def record_completion(completion: Completion) -> None:
+    """Puts a completion on the boards after its progress is committed.
+
+    Fails open: the database stays the source of truth and the next rebuild
+    catches up, so an unreachable Redis never fails an answer.
+    """
+    try:
+        leaderboard.record_completion(completion)
+    except Exception as e:
+        logger.warning("Error updating leaderboards: %s", e)
+
+
+def remove_video(db: Session, video_id: int) -> None:
+    """Takes a deleted video off the boards: its own boards go and its completions
+    stop counting toward the global ones.
+
+    Only that video's progress is read. Fails open like record_completion; a
+    rebuild (which skips deleted videos) corrects whatever is left.
+    """
+    try:
+        leaderboard.remove_video(video_id, iter_completions(db, UserProgress.video_id == video_id))
+    except Exception as e:
+        logger.warning("Error removing video %s from leaderboards: %s", video_id, e)
+
+
+def iter_completions(db: Session, *conditions) -> Iterator[Completion]:
+    """Completions read from completed progress rows matching `conditions` (on
+    UserProgress or Video), scored against each video's current checkpoints."""
+    rows = (
+        db.query(
+            UserProgress.user_id, UserProgress.video_id, UserProgress.failed_attempts,
+            UserProgress.started_at, UserProgress.completed_at
+        )
+        .join(Video, Video.id == UserProgress.video_id)
+        .filter(UserProgress.is_completed.is_(True), *conditions)
+    )
+    question_ids: Dict[int, List[int]] = defaultdict(list)
+    checkpoints = db.query(Question.video_id, Question.id).filter(
+        Question.variant_of_id.is_(None),
+        Question.video_id.in_(rows.with_entities(UserProgress.video_id).scalar_subquery()),
+    )
+    for video_id, question_id in checkpoints:
+        question_ids[video_id].append(question_id)
+    for row in rows.yield_per(1000):
+        ids = question_ids.get(row.video_id)
+        if not ids:
+            continue
+        failed_attempts = row.failed_attempts or {}
+        first_try = sum(1 for qid in ids if failed_attempts.get(str(qid), 0) == 0)
+        yield Completion(row.user_id, row.video_id, first_try, len(ids), elapsed_seconds(row.started_at, row.completed_at))
+
+
+def build_snapshot(db: Session) -> Tuple[BoardSnapshot, int]:
+    """Computes every board from completed progress rows of videos that are not
+    deleted; returns it with the number of completions read."""
+    boards: Dict[str, Dict[int, int]] = defaultdict(dict)
+    totals: Dict[int, Dict[str, int]] = defaultdict(lambda: {"first_try": 0, "questions": 0, "completions": 0})
+    read = 0
+    for completion in iter_completions(db, Video.deleted_at.is_(None)):
+        read += 1
+        boards[video_board(completion.video_id, "accuracy")][completion.user_id] = video_accuracy_score(completion)
+        if completion.seconds is not None:
+            boards[video_board(completion.video_id, "time")][completion.user_id] = -completion.seconds
+        user_totals = totals[completion.user_id]
+        user_totals["first_try"] += completion.first_try
+        user_totals["questions"] += completion.questions
+        user_totals["completions"] += 1
+    for user_id, user_totals in totals.items():
+        boards[global_board("completions")][user_id] = user_totals["completions"]
+        boards[global_board("accuracy")][user_id] = global_accuracy_score(
+            user_totals["first_try"], user_totals["questions"], user_totals["completions"]
+        )
+    return BoardSnapshot(dict(boards), dict(totals)), read
+
+
+def rebuild_leaderboards(db: Session) -> int:
+    """Replaces every board with one computed from the database; returns the completions read.
+
+    A completion recorded while the snapshot was being read or written is
+    overwritten by it, so completions since just before the rebuild started are
+    recorded again afterwards (record_completion skips those already on a board).
+    """
+    started = datetime.utcnow()
+    snapshot, read = build_snapshot(db)
+    leaderboard.replace(snapshot)
+    since = started - timedelta(seconds=REBUILD_CATCH_UP_SECONDS)
+    for completion in iter_completions(db, UserProgress.completed_at >= since, Video.deleted_at.is_(None)):
+        leaderboard.record_completion(completion)
+    return read
+
+
+_rebuild_lock = threading.Lock()
+
+
+def ensure_built(db: Session) -> None:
+    """Rebuilds the boards on first use: a new process (in-process boards) or a flushed Redis.
+
+    Fails open like record_completion; readers then see whatever the boards hold.
+    """
+    try:
+        if leaderboard.is_built():
+            return
+        with _rebuild_lock:
+            if not leaderboard.is_built() and leaderboard.claim_rebuild():
+                read = rebuild_leaderboards(db)
+                logger.info("Rebuilt leaderboards from %s completed progress rows", read)
+    except Exception as e:
+        logger.warning("Error rebuilding leaderboards: %s", e)
+
+
+def ranked_entries(db: Session, board: str, ranked: List[Tuple[int, Tuple[int, float]]]) -> List[dict]:
+    """Entries for (user_id, (rank, score)) pairs, with usernames from one query."""
+    user_ids = [user_id for user_id, _ in ranked]
+    usernames = dict(db.query(User.id, User.username).filter(User.id.in_(user_ids))) if user_ids else {}
+    return [
+        {"rank": rank + 1, "user_id": user_id, "username": usernames.get(user_id, ""), "value": board_value(board, score)}
+        for user_id, (rank, score) in ranked
+        if user_id in usernames
+    ]
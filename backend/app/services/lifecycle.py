@@ -0,0 +1,249 @@
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Set
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models import (
+    Question, QuestionStats, TranscriptChunk, TranscriptSegment, UserProgress, Video, VideoStats,
+)
+from app.services.leaderboard import remove_video
+from app.services.storage import storage, video_storage_key
+
+# Prefixes the API writes media under; garbage collection never looks elsewhere
+MEDIA_PREFIXES = ("videos/", "storyboards/")
+
+logger = logging.getLogger(__name__)
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def soft_delete_video(db: Session, video_id: int) -> bool:
+    """Hides a video from learners at once; False if there is no such (undeleted) video.
+
+    One UPDATE, so the request returns immediately whatever the video's size; the
+    rows and media go in purge_video.
+    """
+    hidden = (
+        db.query(Video)
+        .filter(Video.id == video_id, Video.deleted_at.is_(None))
+        .update({"deleted_at": datetime.utcnow(), "is_published": False}, synchronize_session=False)
+    )
+    db.commit()
+    return bool(hidden)
+
+
+def unrank_video(video_id: int) -> None:
+    """Takes a soft-deleted video off the leaderboards.
+
+    Run by the API process that deleted it (in-process boards are that process's;
+    Redis boards are shared), well before the purge removes its progress.
+    """
+    db = SessionLocal()
+    try:
+        remove_video(db, video_id)
+    finally:
+        db.close()
+
+
+def media_keys(storage_key: Optional[str], video_url: str, storyboard: Optional[dict]) -> List[str]:
+    """Every stored object a video row owns: the upload and its preview sprites."""
+    return [video_storage_key(storage_key, video_url)] + list((storyboard or {}).get("sprites", []))
+
+
+class PurgeReport(NamedTuple):
+    video_id: int
+    rows: Dict[str, int]  # table -> rows deleted
+    files: int
+    bytes_freed: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return sum(self.rows.values()) / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        tables = ", ".join(f"{table} {count}" for table, count in self.rows.items() if count)
+        return (
+            f"Purged video {self.video_id}: {sum(self.rows.values())} rows ({tables or 'none'}), "
+            f"{self.files} files, {format_bytes(self.bytes_freed)} freed in {self.seconds:.2f}s "
+            f"({self.rows_per_second:.0f} rows/s)"
+        )
+
+
+def delete_in_batches(db: Session, model, condition, batch_size: int) -> int:
+    """Deletes matching rows `batch_size` at a time, committing each batch, so no
+    transaction holds locks on a large share of the table. Returns the rows deleted."""
+    key = model.__mapper__.primary_key[0]
+    deleted = 0
+    while True:
+        ids = [value for (value,) in db.query(key).filter(condition).limit(batch_size)]
+        if not ids:
+            return deleted
+        db.execute(delete(model).where(key.in_(ids)), execution_options={"synchronize_session": False})
+        db.commit()
+        deleted += len(ids)
+
+
+def purge_video(video_id: int, batch_size: Optional[int] = None) -> Optional[PurgeReport]:
+    """Removes a soft-deleted video: its rows in batches, then its media, then the video row.
+
+    Safe to run again after a crash or concurrently (every step skips what is already
+    gone); the video row goes last, so an interrupted purge is picked up by the next
+    purge_deleted_videos. Returns None if the video is not soft-deleted.
+    """
+    batch_size = batch_size or settings.purge_batch_size
+    started = time.monotonic()
+    db = SessionLocal()
+    try:
+        video = (
+            db.query(Video.storage_key, Video.video_url, Video.storyboard)
+            .filter(Video.id == video_id, Video.deleted_at.isnot(None))
+            .first()
+        )
+        if video is None:
+            return None
+        rows = {
+            "user_progress": delete_in_batches(db, UserProgress, UserProgress.video_id == video_id, batch_size),
+            "question_stats": delete_in_batches(db, QuestionStats, QuestionStats.video_id == video_id, batch_size),
+            # Variants before their checkpoints, so no batch cascades into another
+            "questions": delete_in_batches(
+                db, Question, (Question.video_id == video_id) & Question.variant_of_id.isnot(None), batch_size
+            ) + delete_in_batches(db, Question, Question.video_id == video_id, batch_size),
+            "transcript_chunks": delete_in_batches(db, TranscriptChunk, TranscriptChunk.video_id == video_id, batch_size),
+            "transcript_segments": delete_in_batches(db, TranscriptSegment, TranscriptSegment.video_id == video_id, batch_size),
+            "video_stats": delete_in_batches(db, VideoStats, VideoStats.video_id == video_id, batch_size),
+        }
+
+        files = 0
+        bytes_freed = 0
+        for key in media_keys(video.storage_key, video.video_url, video.storyboard):
+            try:
+                size = storage.size(key)
+                if size is None:
+                    continue
+                storage.delete(key)
+            except Exception as e:
+                # The row stays, so the next purge retries this file
+                logger.warning("Error deleting media file %s: %s", key, e)
+                return None
+            files += 1
+            bytes_freed += size
+
+        rows["videos"] = db.query(Video).filter(Video.id == video_id).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+    report = PurgeReport(video_id, rows, files, bytes_freed, time.monotonic() - started)
+    logger.info("%s", report)
+    return report
+
+
+def purge_deleted_videos(batch_size: Optional[int] = None) -> List[PurgeReport]:
+    """Purges every soft-deleted video (catches up after crashes and restarts)."""
+    db = SessionLocal()
+    try:
+        video_ids = [video_id for (video_id,) in db.query(Video.id).filter(Video.deleted_at.isnot(None)).order_by(Video.deleted_at)]
+    finally:
+        db.close()
+    reports = []
+    for video_id in video_ids:
+        report = purge_video(video_id, batch_size)
+        if report is not None:
+            reports.append(report)
+    return reports
+
+
+class StorageReport(NamedTuple):
+    files: int
+    bytes_used: int  # before collection
+    orphans: int
+    orphan_bytes: int
+    deleted: int
+    bytes_freed: int
+    missing: List[int]  # videos whose upload is not in storage
+    seconds: float
+
+    def __str__(self) -> str:
+        return (
+            f"Storage: {self.files} files, {format_bytes(self.bytes_used)}; "
+            f"{self.orphans} orphaned ({format_bytes(self.orphan_bytes)}), "
+            f"{self.deleted} deleted ({format_bytes(self.bytes_freed)} freed); "
+            f"{len(self.missing)} videos missing their file; {self.seconds:.2f}s"
+        )
+
+
+def referenced_keys(db: Session) -> Dict[str, int]:
+    """Storage key -> owning video id, for every video row (soft-deleted ones included:
+    their media is purge_video's to remove, after their rows)."""
+    keys = {}
+    rows = db.query(Video.id, Video.storage_key, Video.video_url, Video.storyboard)
+    for row in rows.yield_per(1000):
+        for key in media_keys(row.storage_key, row.video_url, row.storyboard):
+            keys[key] = row.id
+    return keys
+
+
+def collect_orphans(min_age_seconds: Optional[float] = None, dry_run: bool = False) -> StorageReport:
+    """Reconciles media storage with the videos table and deletes unreferenced files.
+
+    A file counts as orphaned when no video row points at it (a crashed upload, an
+    ingest that died before saving its storyboard, replaced sprites) and it is older
+    than `min_age_seconds`, which protects uploads and ingests still in flight.
+    Rows whose upload is missing are reported, not changed.
+    """
+    min_age_seconds = settings.storage_gc_min_age_seconds if min_age_seconds is None else min_age_seconds
+    started = time.monotonic()
+    db = SessionLocal()
+    try:
+        keys = referenced_keys(db)
+    finally:
+        db.close()
+
+    cutoff = time.time() - min_age_seconds
+    files = bytes_used = orphans = orphan_bytes = deleted = bytes_freed = 0
+    seen: Set[str] = set()
+    for prefix in MEDIA_PREFIXES:
+        for item in storage.list(prefix):
+            files += 1
+            bytes_used += item.size
+            seen.add(item.key)
+            if item.key in keys or item.modified > cutoff:
+                continue
+            orphans += 1
+            orphan_bytes += item.size
+            if dry_run:
+                continue
+            try:
+                storage.delete(item.key)
+            except Exception as e:
+                logger.warning("Error deleting orphaned file %s: %s", item.key, e)
+                continue
+            deleted += 1
+            bytes_freed += item.size
+
+    # Uploads only: sprites are regenerated by a re-ingest, a lost upload is not
+    missing = sorted({video_id for key, video_id in keys.items() if key.startswith("videos/") and key not in seen})
+    report = StorageReport(files, bytes_used, orphans, orphan_bytes, deleted, bytes_freed, missing, time.monotonic() - started)
+    logger.info("%s", report)
+    return report
+
+
+def run_lifecycle_jobs() -> None:
+    """One round of background maintenance: pending purges, then storage garbage collection."""
+    try:
+        purge_deleted_videos()
+    except Exception as e:
+        logger.exception("Error purging deleted videos: %s", e)
+    try:
+        collect_orphans()
+    except Exception as e:
+        logger.exception("Error collecting orphaned media: %s", e)
@@ -0,0 +1,207 @@
+import math
+import random
+import re
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from app.services.retrieval import SENTENCE_PATTERN, STOPWORDS
+
+# Keyphrases are runs of up to this many content words (RAKE splits on stopwords and punctuation)
+MAX_PHRASE_WORDS = 3
+MIN_SENTENCE_WORDS = 6
+MAX_SENTENCE_WORDS = 40
+DISTRACTOR_COUNT = 3
+BLANK = "_____"
+
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9'-]*")
+# Words that make poor answers on top of the retrieval stopwords: prepositions, fillers, generic verbs
+PHRASE_STOPWORDS = STOPWORDS | frozenset("""
+across along among around basically actually anything come comes every everything get gets going gonna got
+inside kind know let lets look lot lots made make makes many much next one onto say says see something sort
+still thing things think today toward towards two upon use used uses using want way well within without
+""".split())
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in SENTENCE_PATTERN.split(text or "") if s.strip()]
+
+
+def candidate_phrases(sentence: str) -> List[str]:
+    """Runs of consecutive content words, split at stopwords and punctuation."""
+    phrases = []
+    run: List[str] = []
+    last_end = None
+    for match in WORD_PATTERN.finditer(sentence):
+        word = match.group()
+        # Anything but whitespace between two words (a comma, a dash) ends the run
+        contiguous = last_end is not None and not sentence[last_end:match.start()].strip()
+        if word.lower() in PHRASE_STOPWORDS or len(word) < 3 or not contiguous:
+            if run:
+                phrases.append(run)
+            run = []
+        if word.lower() not in PHRASE_STOPWORDS and len(word) >= 3:
+            run.append(word)
+        last_end = match.end()
+    if run:
+        phrases.append(run)
+    # Long runs are split so an answer stays a short, typeable phrase
+    return [
+        " ".join(run[i:i + MAX_PHRASE_WORDS])
+        for run in phrases
+        for i in range(0, len(run), MAX_PHRASE_WORDS)
+    ]
+
+
+class PhraseScorer:
+    """TF-IDF word weights over the sentences of one video.
+
+    A phrase scores the sum of its word weights over the square root of its
+    length, so multi-word terms win without every long run beating a repeated keyword.
+    """
+
+    def __init__(self, corpus_sentences: List[str]):
+        self.sentence_count = max(1, len(corpus_sentences))
+        self.document_frequency: Counter = Counter()
+        for sentence in corpus_sentences:
+            self.document_frequency.update({w.lower() for w in WORD_PATTERN.findall(sentence)})
+
+    def idf(self, word: str) -> float:
+        return math.log((1 + self.sentence_count) / (1 + self.document_frequency[word.lower()])) + 1.0
+
+    def rank(self, sentences: List[str]) -> List[Tuple[str, float]]:
+        """Distinct phrases in `sentences`, best first; ties break alphabetically so output is stable."""
+        term_frequency = Counter(w.lower() for s in sentences for w in WORD_PATTERN.findall(s))
+        scores: Dict[str, float] = {}
+        display: Dict[str, str] = {}
+        for sentence in sentences:
+            for phrase in candidate_phrases(sentence):
+                key = phrase.lower()
+                display.setdefault(key, phrase)
+                words = phrase.split()
+                scores[key] = sum(
+                    (1 + math.log(term_frequency[w.lower()])) * self.idf(w) for w in words
+                ) / math.sqrt(len(words))
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(display[key], score) for key, score in ranked]
+
+
+def extract_keyphrases(text: str, corpus: Optional[str] = None, limit: int = 10) -> List[Tuple[str, float]]:
+    """Top keyphrases of `text`, weighted against the sentences of `corpus` (defaults to `text`)."""
+    scorer = PhraseScorer(split_sentences(corpus or text))
+    return scorer.rank(split_sentences(text))[:limit]
+
+
+@lru_cache(maxsize=8)
+def _corpus_ranking(corpus: str) -> Tuple["PhraseScorer", Tuple[Tuple[str, float], ...]]:
+    """Scorer and ranked phrases for a video, shared by all of its checkpoints during one ingest."""
+    corpus_sentences = split_sentences(corpus)
+    scorer = PhraseScorer(corpus_sentences)
+    return scorer, tuple(scorer.rank(corpus_sentences))
+
+
+def _blank_out(sentence: str, phrase: str) -> Optional[str]:
+    pattern = re.compile(r"\b" + re.escape(phrase) + r"\b", re.IGNORECASE)
+    if not pattern.search(sentence):
+        return None
+    return pattern.sub(BLANK, sentence, count=1)
+
+
+def _pick_distractors(answer: str, sentence: str, ranked_corpus: Sequence[Tuple[str, float]]) -> List[str]:
+    """Top phrases from elsewhere in the video that share no word with the answer.
+
+    Phrases of the same length come first so the correct option does not stand out.
+    Stops scanning as soon as enough same-length phrases are found.
+    """
+    answer_words = {w.lower() for w in answer.split()}
+    lowered = sentence.lower()
+    same_length: List[str] = []
+    others: List[str] = []
+    seen = set()
+    for phrase, _ in ranked_corpus:
+        key = phrase.lower()
+        if key in seen or key in lowered or answer_words & set(key.split()):
+            continue
+        seen.add(key)
+        if len(phrase.split()) == len(answer.split()):
+            same_length.append(phrase)
+            if len(same_length) == DISTRACTOR_COUNT:
+                break
+        elif len(others) < DISTRACTOR_COUNT:
+            others.append(phrase)
+    return (same_length + others)[:DISTRACTOR_COUNT]
+
+
+def generate_local_questions(
+    transcript_segment: str,
+    timestamp: float,
+    question_type: str = "mcq",
+    count: int = 1,
+    corpus: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Builds up to `count` cloze questions from the segment without any network call.
+
+    Each question blanks a top keyphrase out of the latest sentence that contains
+    it. For MCQ the distractors are other keyphrases of `corpus` (the whole video
+    transcript when given); if there are too few, the question falls back to
+    fill_in. The output is deterministic for the same input and uses the same
+    dict shape as GeminiService.generate_question. Returns [] if the segment has
+    no usable sentences.
+    """
+    sentences = [
+        s for s in split_sentences(transcript_segment)
+        if MIN_SENTENCE_WORDS <= len(s.split()) <= MAX_SENTENCE_WORDS
+    ]
+    if not sentences:
+        return []
+
+    scorer, ranked_corpus = _corpus_ranking(corpus or transcript_segment)
+    ranked_segment = scorer.rank(sentences)
+
+    questions = []
+    used_sentences = set()
+    for answer, _ in ranked_segment:
+        if len(questions) == count:
+            break
+        # The latest sentence keeps the question on what was just watched
+        for sentence in reversed(sentences):
+            if sentence in used_sentences:
+                continue
+            cloze = _blank_out(sentence, answer)
+            if cloze:
+                break
+        else:
+            continue
+        used_sentences.add(sentence)
+
+        question = {
+            "question_text": f"Fill in the blank: {cloze}",
+            "options": [],
+            "correct_answer": answer,
+            "explanation": f'The video says: "{sentence}"',
+            "question_type": "fill_in",
+        }
+        if question_type == "mcq":
+            distractors = _pick_distractors(answer, sentence, ranked_corpus)
+            if len(distractors) == DISTRACTOR_COUNT:
+                options = [answer] + distractors
+                # Seeded by the answer so the correct option's position is stable but not always first
+                random.Random(zlib.crc32(f"{answer}:{timestamp}".encode())).shuffle(options)
+                question.update({
+                    "question_text": f"Which phrase completes this statement? {cloze}",
+                    "options": options,
+                    "question_type": "mcq",
+                })
+        questions.append(question)
+    return questions
+
+
+def generate_local_question(
+    transcript_segment: str,
+    timestamp: float,
+    question_type: str = "mcq",
+    corpus: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """A single local question, or None if the segment has nothing to ask about."""
+    questions = generate_local_questions(transcript_segment, timestamp, question_type, 1, corpus)
+    return questions[0] if questions else None
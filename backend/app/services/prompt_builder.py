@@ -0,0 +1,136 @@
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Gemini tokenizes English at roughly four characters per token
+CHARS_PER_TOKEN = 4
+
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+# Transcript segments (one per line) end where Whisper paused, even without punctuation
+SEGMENT_PATTERN = re.compile(r"\s*\n\s*")
+BOUNDARY_PATTERN = re.compile(r"(?<=[.!?])\s+|\s*\n\s*")
+# A phrase of up to six words immediately repeated, as Whisper does when it loops
+REPEATED_PHRASE_PATTERN = re.compile(r"\b(\w+(?:\s+\w+){0,5})(?:[\s,.]+\1\b)+", re.IGNORECASE)
+
+
+def prompt_budgets() -> Dict[str, int]:
+    """Token budget for the variable (transcript/context) part of each operation's prompt."""
+    return {
+        "generate_question": settings.prompt_budget_question,
+        "generate_final_quiz": settings.prompt_budget_final_quiz,
+        "grade_answer": settings.prompt_budget_grading,
+        "generate_summary": settings.prompt_budget_summary,
+    }
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text or "") + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def dedupe_filler(text: str) -> str:
+    """Collapses immediately repeated phrases, sentences and segments; keeps one segment per line."""
+    segments: List[str] = []
+    previous = None
+    for segment in SEGMENT_PATTERN.split(text or ""):
+        # Second pass catches repeats that overlapped a collapsed one
+        for _ in range(2):
+            segment = REPEATED_PHRASE_PATTERN.sub(r"\1", segment)
+        sentences: List[str] = []
+        for sentence in SENTENCE_PATTERN.split(segment):
+            normalized = " ".join(sentence.lower().split()).strip(".!? ")
+            if not normalized or normalized == previous:
+                continue
+            sentences.append(sentence.strip())
+            previous = normalized
+        if sentences:
+            segments.append(" ".join(sentences))
+    return "\n".join(segments)
+
+
+def split_boundaries(text: str) -> List[Tuple[int, int]]:
+    """(start, end) of each sentence or segment of `text`, in order."""
+    spans = []
+    start = 0
+    for separator in BOUNDARY_PATTERN.finditer(text):
+        if separator.start() > start:
+            spans.append((start, separator.start()))
+        start = separator.end()
+    if start < len(text):
+        spans.append((start, len(text)))
+    return spans
+
+
+def trim_to_budget(text: str, max_tokens: int, keep: str = "tail") -> str:
+    """Keeps whole sentences or segments from the end ("tail") or start ("head") within `max_tokens`.
+
+    A single sentence longer than the budget is cut on a word boundary.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    spans = split_boundaries(text)
+    if not spans:
+        return ""
+    # The longest run of pieces from the kept end that fits, separators included
+    if keep == "tail":
+        end = spans[-1][1]
+        starts = [start for start, _ in reversed(spans) if estimate_tokens(text[start:end]) <= max_tokens]
+        if starts:
+            return text[starts[-1]:end]
+    else:
+        start = spans[0][0]
+        ends = [end for _, end in spans if estimate_tokens(text[start:end]) <= max_tokens]
+        if ends:
+            return text[start:ends[-1]]
+    piece_start, piece_end = spans[-1] if keep == "tail" else spans[0]
+    words = text[piece_start:piece_end].split()
+    if keep == "tail":
+        words.reverse()
+    kept: List[str] = []
+    budget_chars = max_tokens * CHARS_PER_TOKEN
+    for word in words:
+        if sum(len(w) + 1 for w in kept) + len(word) > budget_chars:
+            break
+        kept.append(word)
+    if keep == "tail":
+        kept.reverse()
+    return " ".join(kept)
+
+
+def compact_context(text: str, operation: str, keep: str = "tail") -> str:
+    """Dedupes filler and trims `text` to the budget configured for `operation`."""
+    return trim_to_budget(dedupe_filler(text), prompt_budgets()[operation], keep=keep)
+
+
+class TokenUsage:
+    """Running input/output token totals per Gemini operation."""
+
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, input_tokens: int, output_tokens: int) -> None:
+        with self._lock:
+            totals = self._totals.setdefault(operation, {"calls": 0, "input_tokens": 0, "output_tokens": 0})
+            totals["calls"] += 1
+            totals["input_tokens"] += input_tokens
+            totals["output_tokens"] += output_tokens
+        logger.debug("Gemini %s: %d input tokens, %d output tokens", operation, input_tokens, output_tokens)
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {operation: dict(totals) for operation, totals in self._totals.items()}
+
+
+token_usage = TokenUsage()
+
+
+def record_usage(operation: str, prompt: str, response: Any) -> None:
+    """Records the SDK's reported usage, falling back to estimates when it is absent."""
+    usage: Optional[Any] = getattr(response, "usage_metadata", None)
+    input_tokens = getattr(usage, "prompt_token_count", None) or estimate_tokens(prompt)
+    output_tokens = getattr(usage, "candidates_token_count", None) or estimate_tokens(getattr(response, "text", "") or "")
+    token_usage.record(operation, input_tokens, output_tokens)
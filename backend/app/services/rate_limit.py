@@ -0,0 +1,148 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Tuple
+from fastapi import Depends, HTTPException, status
+from app.auth import get_current_user
+from app.config import settings
+from app.models import User
+
+MAX_TRACKED_BUCKETS = 100_000
+
+
+class Budget(NamedTuple):
+    capacity: float
+    refill_per_second: float
+
+
+def rate_limit_budgets() -> Dict[str, Budget]:
+    """Bucket sizes: `request` is charged per user and route on every call, `llm`
+    per user only for work that reaches Gemini (free-text grading, summaries)."""
+    return {
+        "request": Budget(settings.rate_limit_request_burst, settings.rate_limit_requests_per_minute / 60),
+        "llm": Budget(settings.rate_limit_llm_burst, settings.rate_limit_llm_calls_per_minute / 60),
+    }
+
+
+class InProcessRateLimiter:
+    """Token buckets held in memory; each API process enforces its own limits.
+
+    A request may cost more than the bucket holds (a large batch): it is let
+    through once the bucket is full and leaves it in debt, so it is delayed
+    rather than refused forever.
+    """
+
+    def __init__(self, max_buckets: int = MAX_TRACKED_BUCKETS):
+        self.max_buckets = max_buckets
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, budget: Budget, cost: float = 1) -> float:
+        """Takes `cost` tokens; returns 0 if granted, else seconds until it would be."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (budget.capacity, now))
+            tokens = min(budget.capacity, tokens + (now - updated) * budget.refill_per_second)
+            needed = min(cost, budget.capacity)
+            wait = 0.0
+            if tokens < needed:
+                wait = (needed - tokens) / budget.refill_per_second
+            else:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # Least recently used buckets are the likeliest to have refilled completely
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+# Same algorithm as InProcessRateLimiter, atomic in Redis and timed by the Redis clock
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local needed = math.min(cost, capacity)
+local wait = 0
+if tokens < needed then
+    wait = (needed - tokens) / rate
+else
+    tokens = tokens - cost
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RedisRateLimiter:
+    """Token buckets shared by every API process through Redis (one round trip per check)."""
+
+    def __init__(self, redis_url: str):
+        # Imported lazily: redis is only needed when REDIS_URL is configured
+        import redis
+
+        self._client = redis.Redis.from_url(redis_url)
+        self._script = self._client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def acquire(self, key: str, budget: Budget, cost: float = 1) -> float:
+        try:
+            return float(self._script(
+                keys=[f"ratelimit:{key}"],
+                args=[budget.capacity, budget.refill_per_second, cost]
+            ))
+        except Exception as e:
+            # Fail open: an unreachable Redis must not take answering down with it
+            print(f"Error checking rate limit: {e}")
+            return 0.0
+
+
+def create_rate_limiter():
+    if settings.redis_url:
+        return RedisRateLimiter(settings.redis_url)
+    return InProcessRateLimiter()
+
+
+rate_limiter = create_rate_limiter()
+
+
+def too_many_requests(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Rate limit exceeded, try again later",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def try_spend_llm_budget(user_id: int, calls: int = 1) -> float:
+    """Spends `calls` from the user's LLM budget; returns 0 if granted, else seconds to wait."""
+    if not settings.rate_limit_enabled:
+        return 0.0
+    return rate_limiter.acquire(f"llm:{user_id}", rate_limit_budgets()["llm"], calls)
+
+
+def enforce_llm_budget(user_id: int, calls: int = 1) -> None:
+    """Raises 429 before a Gemini call the user has no budget for."""
+    wait = try_spend_llm_budget(user_id, calls)
+    if wait > 0:
+        raise too_many_requests(wait)
+
+
+def rate_limited(route: str):
+    """Dependency returning the current user after charging one request to their `route` bucket."""
+
+    def dependency(current_user: User = Depends(get_current_user)) -> User:
+        if settings.rate_limit_enabled:
+            wait = rate_limiter.acquire(f"{route}:{current_user.id}", rate_limit_budgets()["request"])
+            if wait > 0:
+                raise too_many_requests(wait)
+        return current_user
+
+    return dependency
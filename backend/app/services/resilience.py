@@ -0,0 +1,179 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+import httpx
+
+T = TypeVar("T")
+
+# Total time an operation may take, retries included (seconds)
+OPERATION_DEADLINES: Dict[str, float] = {
+    "generate_question": 20.0,
+    "generate_final_quiz": 20.0,
+    "grade_answer": 5.0,
+    "generate_summary": 8.0,
+    # Upload, server-side processing and the transcript itself, for a lecture-length video
+    "generate_transcript": 900.0,
+}
+# Only calls without side effects are retried; a file upload is not
+IDEMPOTENT_OPERATIONS = {"generate_question", "generate_final_quiz", "grade_answer", "generate_summary"}
+MAX_ATTEMPTS = 3
+BACKOFF_BASE_SECONDS = 0.25
+BACKOFF_CAP_SECONDS = 2.0
+
+
+class ServiceUnavailableError(Exception):
+    """Raised instead of calling Gemini when it is known to be unhealthy or saturated."""
+
+
+def is_overload_error(error: Exception) -> bool:
+    """429s, 5xx and timeouts mean the service is unhealthy; other errors are our own."""
+    if isinstance(error, (httpx.TimeoutException, httpx.TransportError, TimeoutError)):
+        return True
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return code == 429 or (isinstance(code, int) and code >= 500)
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive overload failures and fails fast for
+    `reset_timeout` seconds, then lets a single probe call through (half-open)."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Ends a call that says nothing about service health, leaving the state as it is;
+        a half-open breaker lets the next call probe instead."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on in-flight calls: +1/limit per success, halved on overload.
+
+    Calls over the limit are rejected immediately rather than queued, so callers
+    fall back locally instead of piling up behind a slow service.
+    """
+
+    def __init__(self, initial_limit: float = 8, min_limit: float = 1, max_limit: float = 64):
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    def cancel(self) -> None:
+        """Gives back a slot that was never used, without adjusting the limit."""
+        with self._lock:
+            self.in_flight -= 1
+
+    def release(self, overloaded: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if overloaded:
+                self.limit = max(self.min_limit, self.limit / 2)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+class ResilientCaller:
+    """Deadline, circuit breaker, adaptive concurrency and jittered retries around one service."""
+
+    def __init__(self, breaker: CircuitBreaker, limiter: AdaptiveConcurrencyLimiter):
+        self.breaker = breaker
+        self.limiter = limiter
+
+    def deadline_for(self, operation: str) -> float:
+        return OPERATION_DEADLINES.get(operation, 10.0)
+
+    def call(self, operation: str, fn: Callable[[float], T]) -> T:
+        """Runs `fn(timeout_seconds)` under the operation's deadline.
+
+        `fn` receives the time left so it can pass it to the HTTP client. Raises
+        ServiceUnavailableError when the call is shed; callers treat it like any
+        other failure and use their local fallback.
+        """
+        deadline = time.monotonic() + self.deadline_for(operation)
+        attempts = MAX_ATTEMPTS if operation in IDEMPOTENT_OPERATIONS else 1
+        last_error: Optional[Exception] = None
+
+        for attempt in range(attempts):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # Limiter first: a half-open probe slot must never be taken by a call that is then shed
+            if not self.limiter.try_acquire():
+                raise ServiceUnavailableError(f"Concurrency limit reached, skipping {operation}")
+            if not self.breaker.allow():
+                self.limiter.cancel()
+                raise ServiceUnavailableError(f"Circuit open, skipping {operation}")
+
+            overloaded = False
+            try:
+                result = fn(remaining)
+            except Exception as e:
+                overloaded = is_overload_error(e)
+                last_error = e
+                if overloaded:
+                    self.breaker.record_failure()
+                else:
+                    # A bad request says nothing about service health: it neither closes
+                    # nor opens the breaker, and is not retried
+                    self.breaker.release_probe()
+                    raise
+            else:
+                self.breaker.record_success()
+                return result
+            finally:
+                self.limiter.release(overloaded)
+
+            if attempt == attempts - 1:
+                break
+            # Full jitter so concurrent retries do not arrive together
+            backoff = random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+            if time.monotonic() + backoff >= deadline:
+                break
+            time.sleep(backoff)
+
+        raise last_error or ServiceUnavailableError(f"Deadline exceeded for {operation}")
+
+
+gemini_caller = ResilientCaller(CircuitBreaker(), AdaptiveConcurrencyLimiter())
@@ -0,0 +1,205 @@
+import re
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models import Video, TranscriptChunk
+
+# Hashed bag-of-words: every token maps to one of EMBEDDING_DIM buckets (CPU only, no model)
+EMBEDDING_DIM = 512
+CHUNK_TARGET_WORDS = 80
+DEFAULT_TOP_K = 4
+INDEX_CACHE_SIZE = 128
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has
+have having he her here hers him his how i if in into is it its itself just like me more most
+my no nor not now of off on once only or other our out over own really same she should so some
+such than that the their them then there these they this those through to too um uh under until
+up very was we were what when where which while who whom why will with would you your yeah okay
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def embed_texts(texts: Sequence[str]) -> np.ndarray:
+    """Log-scaled term frequencies hashed into EMBEDDING_DIM buckets, one row per text."""
+    matrix = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for token, count in Counter(tokenize(text)).items():
+            # crc32 rather than hash() so embeddings are stable across processes
+            matrix[row, zlib.crc32(token.encode()) % EMBEDDING_DIM] += 1.0 + np.log(count)
+    return matrix
+
+
+def chunk_segments(segments: List[Dict[str, Any]], target_words: int = CHUNK_TARGET_WORDS) -> List[Dict[str, Any]]:
+    """Groups consecutive transcript segments into chunks of roughly `target_words` words.
+
+    Segments are dicts with "text" and optional "start"/"end" seconds (Whisper's format).
+    """
+    chunks = []
+    current = []
+    words = 0
+    for segment in segments:
+        text = segment.get("text", "").strip()
+        if not text:
+            continue
+        current.append(segment)
+        words += len(text.split())
+        if words >= target_words:
+            chunks.append(current)
+            current, words = [], 0
+    if current:
+        chunks.append(current)
+    return [
+        {
+            "start": group[0].get("start"),
+            "end": group[-1].get("end"),
+            "text": " ".join(s["text"].strip() for s in group),
+        }
+        for group in chunks
+    ]
+
+
+def segments_from_text(transcript: str) -> List[Dict[str, Any]]:
+    """Sentence-level segments without timing, for transcripts stored as plain text."""
+    return [{"text": sentence} for sentence in SENTENCE_PATTERN.split(transcript or "") if sentence.strip()]
+
+
+class VectorIndex:
+    """Per-video TF-IDF index over transcript chunks held as one NumPy matrix."""
+
+    def __init__(self, chunks: List[Dict[str, Any]], term_frequencies: np.ndarray):
+        self.chunks = chunks
+        document_frequency = np.count_nonzero(term_frequencies, axis=0)
+        self.idf = np.log((1 + len(chunks)) / (1 + document_frequency)).astype(np.float32) + 1.0
+        weighted = term_frequencies * self.idf
+        norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.matrix = weighted / norms
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def search(self, query: str, k: int = DEFAULT_TOP_K) -> List[Dict[str, Any]]:
+        """Returns up to k chunks most similar to `query`, in transcript order."""
+        if not self.chunks:
+            return []
+        query_vector = embed_texts([query])[0] * self.idf
+        norm = np.linalg.norm(query_vector)
+        if norm == 0:
+            return []
+        scores = self.matrix @ (query_vector / norm)
+        k = min(k, len(self.chunks))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = [int(i) for i in top if scores[i] > 0]
+        return [dict(self.chunks[i], score=float(scores[i])) for i in sorted(top)]
+
+
+class IndexCache:
+    """Small LRU of loaded per-video indexes; invalidated when a video is re-indexed or deleted."""
+
+    def __init__(self, max_entries: int = INDEX_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, VectorIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, video_id: int) -> Optional[VectorIndex]:
+        with self._lock:
+            index = self._entries.get(video_id)
+            if index is not None:
+                self._entries.move_to_end(video_id)
+            return index
+
+    def set(self, video_id: int, index: VectorIndex) -> VectorIndex:
+        with self._lock:
+            self._entries[video_id] = index
+            self._entries.move_to_end(video_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def invalidate(self, video_id: int) -> None:
+        with self._lock:
+            self._entries.pop(video_id, None)
+
+
+index_cache = IndexCache()
+
+
+def index_transcript(db: Session, video_id: int, segments: List[Dict[str, Any]]) -> int:
+    """Chunks and embeds a transcript at ingest time, replacing any previous chunks.
+
+    Adds rows to the session; the caller commits. Returns the number of chunks.
+    """
+    chunks = chunk_segments(segments)
+    term_frequencies = embed_texts([c["text"] for c in chunks])
+    db.query(TranscriptChunk).filter(TranscriptChunk.video_id == video_id).delete(synchronize_session=False)
+    db.add_all([
+        TranscriptChunk(
+            video_id=video_id,
+            position=position,
+            start_time=chunk["start"],
+            end_time=chunk["end"],
+            text=chunk["text"],
+            embedding=term_frequencies[position].astype(np.float16).tobytes(),
+        )
+        for position, chunk in enumerate(chunks)
+    ])
+    index_cache.invalidate(video_id)
+    return len(chunks)
+
+
+def get_index(db: Session, video_id: int) -> VectorIndex:
+    """Loads a video's index (one query), building it in memory from the transcript
+    for videos ingested before chunks were stored."""
+    index = index_cache.get(video_id)
+    if index is not None:
+        return index
+
+    rows = (
+        db.query(TranscriptChunk.start_time, TranscriptChunk.end_time, TranscriptChunk.text, TranscriptChunk.embedding)
+        .filter(TranscriptChunk.video_id == video_id)
+        .order_by(TranscriptChunk.position)
+        .all()
+    )
+    if rows:
+        chunks = [{"start": r.start_time, "end": r.end_time, "text": r.text} for r in rows]
+        term_frequencies = np.vstack([np.frombuffer(r.embedding, dtype=np.float16) for r in rows]).astype(np.float32)
+    else:
+        transcript = db.query(Video.transcript).filter(Video.id == video_id).scalar()
+        chunks = chunk_segments(segments_from_text(transcript))
+        term_frequencies = embed_texts([c["text"] for c in chunks])
+    return index_cache.set(video_id, VectorIndex(chunks, term_frequencies))
+
+
+def retrieve_context(
+    db: Session,
+    video_id: int,
+    query: str,
+    k: int = DEFAULT_TOP_K,
+    timestamp: Optional[float] = None
+) -> str:
+    """The top-k transcript chunks for `query` joined in transcript order.
+
+    If nothing matches, falls back to the chunks leading up to `timestamp`
+    (or the opening chunks), so the prompt is always bounded by k chunks.
+    """
+    index = get_index(db, video_id)
+    chunks = index.search(query, k)
+    if not chunks:
+        end = len(index.chunks)
+        if timestamp is not None:
+            end = next(
+                (i + 1 for i, c in enumerate(index.chunks) if c["end"] is not None and c["end"] >= timestamp),
+                end
+            )
+        chunks = index.chunks[max(0, end - k):end] if timestamp is not None else index.chunks[:k]
+    return "\n".join(chunk["text"] for chunk in chunks)
@@ -0,0 +1,141 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.models import TranscriptSegment
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+SNIPPET_WORDS = 24
+# Ranking reads every match, so a very common term is ranked among its first
+# MAX_RANKED_MATCHES visible matches only (reported as `truncated`); this keeps
+# its latency flat as the catalog grows
+MAX_RANKED_MATCHES = 5000
+QUERY_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Candidates come straight off the GIN index, already limited to the videos the
+# caller may see; only they are ranked, and headlines are built for the returned page alone
+POSTGRES_SEARCH = f"""
+WITH q AS (
+    SELECT websearch_to_tsquery('english', :query) AS query
+), candidates AS (
+    SELECT s.id, s.video_id, s.position, ts_rank_cd(s.search_vector, q.query) AS rank
+    FROM (
+        SELECT s.id, s.video_id, s.position, s.search_vector
+        FROM transcript_segments s
+        JOIN videos v ON v.id = s.video_id
+        CROSS JOIN q
+        WHERE s.search_vector @@ q.query
+          AND v.deleted_at IS NULL AND (:include_unpublished OR v.is_published)
+          AND (CAST(:video_id AS INTEGER) IS NULL OR s.video_id = :video_id)
+        LIMIT :max_candidates + 1
+    ) AS s, q
+), page AS (
+    SELECT id, rank, video_id, position
+    FROM candidates
+    ORDER BY rank DESC, video_id, position
+    LIMIT :limit OFFSET :offset
+)
+SELECT s.video_id, v.title, s.start_time, s.end_time, page.rank,
+       ts_headline('english', s.text, q.query,
+                   'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxWords={SNIPPET_WORDS}, MinWords=8') AS snippet,
+       (SELECT COUNT(*) FROM candidates) > :max_candidates AS truncated
+FROM page
+JOIN transcript_segments s ON s.id = page.id
+JOIN videos v ON v.id = s.video_id
+CROSS JOIN q
+ORDER BY page.rank DESC, page.video_id, page.position
+"""
+
+# bm25 `rank` is lower-is-better; it is negated so both dialects return higher-is-better
+SQLITE_SEARCH = f"""
+WITH candidates AS (
+    SELECT f.rowid AS id, f.rank, s.video_id, s.position
+    FROM transcript_segments_fts f
+    JOIN transcript_segments s ON s.id = f.rowid
+    JOIN videos v ON v.id = s.video_id
+    WHERE transcript_segments_fts MATCH :query
+      AND v.deleted_at IS NULL AND (:include_unpublished OR v.is_published)
+      AND (:video_id IS NULL OR s.video_id = :video_id)
+    LIMIT :max_candidates + 1
+), page AS (
+    SELECT id, rank, video_id, position
+    FROM candidates
+    ORDER BY rank, video_id, position
+    LIMIT :limit OFFSET :offset
+)
+SELECT s.video_id, v.title, s.start_time, s.end_time, -page.rank AS rank,
+       snippet(transcript_segments_fts, 0, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', {SNIPPET_WORDS}) AS snippet,
+       (SELECT COUNT(*) FROM candidates) > :max_candidates AS truncated
+FROM page
+JOIN transcript_segments_fts f ON f.rowid = page.id
+JOIN transcript_segments s ON s.id = page.id
+JOIN videos v ON v.id = s.video_id
+WHERE transcript_segments_fts MATCH :query
+ORDER BY page.rank, page.video_id, page.position
+"""
+
+
+def index_segments(db: Session, video_id: int, segments: List[Dict[str, Any]]) -> int:
+    """Stores a transcript's segments for search at ingest time, replacing previous ones.
+
+    The database updates its full-text index as the rows are written. Adds rows
+    to the session; the caller commits. Returns the number of segments.
+    """
+    db.query(TranscriptSegment).filter(TranscriptSegment.video_id == video_id).delete(synchronize_session=False)
+    rows = [
+        TranscriptSegment(
+            video_id=video_id,
+            position=position,
+            start_time=segment.get("start"),
+            end_time=segment.get("end"),
+            text=segment["text"].strip(),
+        )
+        for position, segment in enumerate(s for s in segments if s.get("text", "").strip())
+    ]
+    db.add_all(rows)
+    return len(rows)
+
+
+def fts5_query(query: str) -> str:
+    """Every word of the query as a quoted FTS5 term (implicitly ANDed), so user input
+    can never be parsed as FTS5 syntax."""
+    return " ".join(f'"{token}"' for token in QUERY_TOKEN_PATTERN.findall(query.lower()))
+
+
+def search_transcripts(
+    db: Session,
+    query: str,
+    limit: int,
+    offset: int = 0,
+    video_id: Optional[int] = None,
+    include_unpublished: bool = False
+) -> Tuple[List[Dict[str, Any]], bool, bool]:
+    """Best-matching transcript segments across the catalog (or one video).
+
+    Returns one page of results, best first, whether another page follows, and
+    whether the term matched more than MAX_RANKED_MATCHES segments, in which case
+    only the first of them were ranked. Snippets mark matched words with
+    HIGHLIGHT_START/HIGHLIGHT_END.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement, search_query = POSTGRES_SEARCH, query
+    elif dialect == "sqlite":
+        statement, search_query = SQLITE_SEARCH, fts5_query(query)
+    else:
+        raise NotImplementedError(f"Transcript search is not available on {dialect}")
+    if not search_query.strip():
+        return [], False, False
+
+    rows = db.execute(text(statement), {
+        "query": search_query,
+        "include_unpublished": include_unpublished,
+        "video_id": video_id,
+        "max_candidates": MAX_RANKED_MATCHES,
+        # One extra row tells whether there is a next page without counting every match
+        "limit": limit + 1,
+        "offset": offset,
+    }).mappings().all()
+    truncated = bool(rows) and bool(rows[0]["truncated"])
+    return [dict(row) for row in rows[:limit]], len(rows) > limit, truncated
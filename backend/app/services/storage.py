@@ -0,0 +1,247 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+from app.config import settings
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class StoredObject(NamedTuple):
+    key: str
+    size: int
+    modified: float  # Unix time of the last write
+
+
+class StorageBackend(ABC):
+    """Where uploaded media lives. Keys are relative paths such as "videos/<uuid>_name.mp4".
+
+    Learners get the bytes from `url` (a static path, CDN or presigned URL), never
+    through the API; `local_path` is for tools that need a file (Whisper, ffprobe).
+    """
+
+    @abstractmethod
+    def put(self, key: str, stream: BinaryIO, content_type: Optional[str] = None, cache_control: Optional[str] = None) -> int:
+        """Stores `stream` under `key` without reading it into memory; returns the size in bytes.
+
+        `cache_control` is sent with the object where the backend serves it (S3);
+        local files get theirs from the static mount.
+        """
+
+    @abstractmethod
+    def get_range(self, key: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Yields bytes `start`..`end` (inclusive, like an HTTP Range) of the object."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Removes the object; a missing object is not an error."""
+
+    @abstractmethod
+    def size(self, key: str) -> Optional[int]:
+        """Size in bytes, or None if there is no such object."""
+
+    @abstractmethod
+    def list(self, prefix: str) -> Iterator[StoredObject]:
+        """Every object whose key starts with `prefix` (e.g. "videos/"), in no particular order."""
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """Where learners fetch the object: a static path, CDN or presigned URL."""
+
+    @abstractmethod
+    def local_path(self, key: str):
+        """Context manager giving a filesystem path to the object for the duration of the block."""
+
+
+class LocalStorage(StorageBackend):
+    """Files under `root`, served by the API's static mount at `base_url` (or a proxy in front of it)."""
+
+    def __init__(self, root: str, base_url: str):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"Storage key escapes the storage root: {key}")
+        return path
+
+    def put(self, key: str, stream: BinaryIO, content_type: Optional[str] = None, cache_control: Optional[str] = None) -> int:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as buffer:
+            shutil.copyfileobj(stream, buffer, CHUNK_SIZE)
+            return buffer.tell()
+
+    def get_range(self, key: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        with open(self._path(key), "rb") as f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def size(self, key: str) -> Optional[int]:
+        try:
+            return os.path.getsize(self._path(key))
+        except FileNotFoundError:
+            return None
+
+    def list(self, prefix: str) -> Iterator[StoredObject]:
+        top = os.path.join(self.root, os.path.dirname(prefix))
+        for directory, _, files in os.walk(top):
+            for name in files:
+                path = os.path.join(directory, name)
+                key = os.path.relpath(path, self.root).replace(os.sep, "/")
+                if not key.startswith(prefix):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield StoredObject(key, stat.st_size, stat.st_mtime)
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[str]:
+        yield self._path(key)
+
+
+class S3Storage(StorageBackend):
+    """An S3-compatible bucket (AWS S3, MinIO, R2). Learners get presigned URLs, or
+    `cdn_url`/key when a CDN fronts the bucket."""
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        cdn_url: Optional[str] = None,
+        url_expiry_seconds: int = 3600
+    ):
+        # Imported lazily: boto3 is only needed when STORAGE_BACKEND=s3
+        import boto3
+
+        self.bucket = bucket
+        self.cdn_url = cdn_url.rstrip("/") if cdn_url else None
+        self.url_expiry_seconds = url_expiry_seconds
+        self._client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+        )
+
+    def put(self, key: str, stream: BinaryIO, content_type: Optional[str] = None, cache_control: Optional[str] = None) -> int:
+        extra = {}
+        if content_type:
+            extra["ContentType"] = content_type
+        if cache_control:
+            extra["CacheControl"] = cache_control
+        # upload_fileobj switches to a multipart upload for large files, reading chunk by chunk
+        self._client.upload_fileobj(stream, self.bucket, key, ExtraArgs=extra or None)
+        return self._client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+
+    def get_range(self, key: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        body = self._client.get_object(Bucket=self.bucket, Key=key, Range=byte_range)["Body"]
+        try:
+            yield from body.iter_chunks(CHUNK_SIZE)
+        finally:
+            body.close()
+
+    def delete(self, key: str) -> None:
+        self._client.delete_object(Bucket=self.bucket, Key=key)
+
+    def size(self, key: str) -> Optional[int]:
+        from botocore.exceptions import ClientError
+
+        try:
+            return self._client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def list(self, prefix: str) -> Iterator[StoredObject]:
+        for page in self._client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=prefix):
+            for item in page.get("Contents", []):
+                yield StoredObject(item["Key"], item["Size"], item["LastModified"].timestamp())
+
+    def url(self, key: str) -> str:
+        if self.cdn_url:
+            return f"{self.cdn_url}/{key}"
+        return self._client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=self.url_expiry_seconds,
+        )
+
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[str]:
+        suffix = os.path.splitext(key)[1]
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+            path = f.name
+        try:
+            self._client.download_file(self.bucket, key, path)
+            yield path
+        finally:
+            os.remove(path)
+
+
+def create_storage() -> StorageBackend:
+    if settings.storage_backend == "s3":
+        return S3Storage(
+            bucket=settings.s3_bucket,
+            endpoint_url=settings.s3_endpoint_url,
+            region=settings.s3_region,
+            access_key_id=settings.s3_access_key_id,
+            secret_access_key=settings.s3_secret_access_key,
+            cdn_url=settings.media_cdn_url,
+            url_expiry_seconds=settings.media_url_expiry_seconds,
+        )
+    return LocalStorage(settings.local_storage_root, settings.local_storage_url)
+
+
+storage = create_storage()
+
+
+def content_sha256(stream: BinaryIO) -> str:
+    """Hex SHA-256 of the rest of `stream`, read in chunks; the stream is rewound afterwards."""
+    start = stream.tell()
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+        digest.update(chunk)
+    stream.seek(start)
+    return digest.hexdigest()
+
+
+def video_storage_key(storage_key: Optional[str], video_url: str) -> str:
+    """The storage key of a video; rows from before storage keys existed derive it from their URL."""
+    if storage_key:
+        return storage_key
+    prefix = settings.local_storage_url.rstrip("/") + "/"
+    return video_url[len(prefix):] if video_url.startswith(prefix) else video_url.lstrip("/")
+
+
+def media_url(storage_key: Optional[str], video_url: str) -> str:
+    """What learners load the video from; legacy rows keep their stored URL."""
+    return storage.url(storage_key) if storage_key else video_url
@@ -0,0 +1,144 @@
+import glob
+import math
+import os
+import subprocess
+import tempfile
+import time
+import uuid
+from typing import Callable, Optional
+from app.config import settings
+from app.services.storage import storage
+
+# Sprite keys carry a fresh token per generation, so their bytes never change under a URL
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def storyboard_interval(duration: float) -> float:
+    """Seconds between preview frames: the configured interval, stretched so a long
+    video still yields at most STORYBOARD_MAX_FRAMES frames."""
+    return max(settings.storyboard_interval_seconds, duration / settings.storyboard_max_frames)
+
+
+def sprite_filter(interval: float) -> str:
+    width, height = settings.storyboard_tile_width, settings.storyboard_tile_height
+    return ",".join([
+        # eof_action=pass keeps the frame of the last interval, which would otherwise be dropped
+        f"fps=1/{interval:g}:eof_action=pass",
+        # Every tile is exactly width x height (letterboxed), so the index needs no probing
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease",
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
+        f"tile={settings.storyboard_columns}x{settings.storyboard_rows}",
+    ])
+
+
+def extract_sprites(video_path: str, duration: float, output_dir: str) -> dict:
+    """Runs ffmpeg once to tile preview frames into JPEG sprite sheets in `output_dir`.
+
+    Only keyframes are decoded (-skip_frame nokey): a preview shows the keyframe at
+    or before its time, and decoding costs a few frames per interval instead of
+    every frame, which keeps generation to seconds per hour of video. The run is
+    killed after STORYBOARD_TIMEOUT_SECONDS. Returns the layout; sprite paths are
+    in "files".
+    """
+    interval = storyboard_interval(duration)
+    per_sheet = settings.storyboard_columns * settings.storyboard_rows
+    frames = max(1, math.ceil(duration / interval))
+    sheets = math.ceil(frames / per_sheet)
+    cmd = [
+        "ffmpeg", "-v", "error", "-nostdin", "-y",
+        "-skip_frame", "nokey",
+        "-i", video_path,
+        "-an", "-sn", "-dn",
+        "-vf", sprite_filter(interval),
+        "-q:v", str(settings.storyboard_jpeg_quality),
+        "-frames:v", str(sheets),
+        os.path.join(output_dir, "sprite-%03d.jpg"),
+    ]
+    subprocess.run(cmd, capture_output=True, check=True, timeout=settings.storyboard_timeout_seconds)
+    files = sorted(glob.glob(os.path.join(output_dir, "sprite-*.jpg")))
+    if not files:
+        raise RuntimeError("ffmpeg produced no sprite sheets")
+    return {
+        "interval": interval,
+        "duration": duration,
+        "frames": min(frames, len(files) * per_sheet),
+        "tile_width": settings.storyboard_tile_width,
+        "tile_height": settings.storyboard_tile_height,
+        "columns": settings.storyboard_columns,
+        "rows": settings.storyboard_rows,
+        "files": files,
+    }
+
+
+def create_storyboard(video_id: int, video_path: str, duration: float) -> Optional[dict]:
+    """Generates the seek-preview sprites for a video and stores them in media storage.
+
+    Returns the layout saved on Video.storyboard (sprite keys, tile geometry, frame
+    interval, generation time), or None when it is disabled or ffmpeg fails:
+    previews are an extra and never fail an ingest.
+    """
+    if not settings.storyboard_enabled or not duration:
+        return None
+    started = time.monotonic()
+    try:
+        with tempfile.TemporaryDirectory(prefix="storyboard-") as output_dir:
+            layout = extract_sprites(video_path, duration, output_dir)
+            elapsed = time.monotonic() - started
+            version = uuid.uuid4().hex
+            prefix = f"storyboards/{video_id}/{version}"
+            sprites = []
+            for path in layout.pop("files"):
+                key = f"{prefix}/{os.path.basename(path)}"
+                with open(path, "rb") as f:
+                    storage.put(key, f, "image/jpeg", cache_control=IMMUTABLE_CACHE_CONTROL)
+                sprites.append(key)
+    except Exception as e:
+        print(f"Error generating storyboard for video {video_id}: {e}")
+        return None
+    layout["version"] = version
+    layout["sprites"] = sprites
+    layout["generation_seconds"] = round(elapsed, 3)
+    print(
+        f"Storyboard for video {video_id}: {layout['frames']} frames in {len(sprites)} sprite(s), "
+        f"{elapsed:.2f}s ({elapsed * 3600 / duration:.1f}s per hour of video)"
+    )
+    return layout
+
+
+def vtt_timestamp(seconds: float) -> str:
+    milliseconds = int(round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+
+
+def render_vtt(layout: dict, sprite_url: Callable[[str], str]) -> str:
+    """The WebVTT thumbnail index: one cue per frame pointing at its tile (url#xywh=x,y,w,h)."""
+    per_sheet = layout["columns"] * layout["rows"]
+    width, height = layout["tile_width"], layout["tile_height"]
+    urls = [sprite_url(key) for key in layout["sprites"]]
+    lines = ["WEBVTT", ""]
+    for frame in range(layout["frames"]):
+        start = frame * layout["interval"]
+        end = min((frame + 1) * layout["interval"], layout["duration"])
+        sheet, position = divmod(frame, per_sheet)
+        row, column = divmod(position, layout["columns"])
+        lines.append(f"{vtt_timestamp(start)} --> {vtt_timestamp(end)}")
+        lines.append(f"{urls[sheet]}#xywh={column * width},{row * height},{width},{height}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def storyboard_url(video_id: int, layout: Optional[dict]) -> Optional[str]:
+    """API path of the index; the version changes whenever the sprites are regenerated."""
+    if not layout:
+        return None
+    return f"/videos/{video_id}/storyboard.vtt?v={layout['version']}"
+
+
+def storyboard_cache_control() -> str:
+    """Cache-Control for the index: immutable unless it embeds presigned sprite URLs, which expire."""
+    if settings.storage_backend == "s3" and not settings.media_cdn_url:
+        return f"private, max-age={settings.media_url_expiry_seconds // 2}"
+    return IMMUTABLE_CACHE_CONTROL
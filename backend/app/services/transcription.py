@@ -0,0 +1,328 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from app.config import settings
+from app.services.gemini_service import GeminiService
+from app.services.resilience import OPERATION_DEADLINES, gemini_caller, is_overload_error
+
+# {"text": ..., "segments": [{"start", "end", "text"}, ...]}
+Transcript = Dict[str, Any]
+
+WHISPER_MODEL_NAME = "base"
+_whisper_model = None
+_whisper_lock = threading.Lock()
+
+def get_whisper_model():
+    """Loads Whisper (and torch) on first use, so only processes that transcribe pay for it."""
+    global _whisper_model
+    with _whisper_lock:
+        if _whisper_model is None:
+            import whisper
+            _whisper_model = whisper.load_model(WHISPER_MODEL_NAME)
+        return _whisper_model
+
+def generate_local_transcript(video_path: str) -> dict | None:
+    """Uses the local Whisper model to transcribe the video file.
+
+    Returns {"text": ..., "segments": [{"start", "end", "text"}, ...]}.
+    """
+    if not os.path.exists(video_path):
+        print(f"Error: Video file not found at {video_path}")
+        return None
+
+    try:
+        print(f"Starting local transcription using Whisper for {video_path}...")
+        # Whisper automatically handles many video formats due to FFmpeg being available
+        result = get_whisper_model().transcribe(video_path)
+
+        # Whisper returns a dictionary containing the transcribed text and timed segments
+        transcript_text = result["text"].strip()
+        segments = [
+            {"start": s["start"], "end": s["end"], "text": s["text"].strip()}
+            for s in result.get("segments", [])
+        ]
+        print("Local transcription completed successfully.")
+        return {"text": transcript_text, "segments": segments}
+
+    except Exception as e:
+        print(f"Error during Whisper transcription: {e}")
+        return None
+
+
+class TranscriptionError(Exception):
+    """A backend could not produce a transcript for the file."""
+
+
+class TranscriptionBackend(ABC):
+    """Turns a media file into a Transcript.
+
+    `transcribe` is a coroutine run on the scheduler's event loop; `estimate_seconds`
+    predicts how long a clip of `duration` seconds submitted now would take,
+    queueing included, so the scheduler can compare backends.
+    """
+
+    name = "backend"
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def estimate_seconds(self, duration: float) -> float:
+        """Seconds until a clip of `duration` seconds submitted now would be transcribed."""
+
+    @abstractmethod
+    async def transcribe(self, video_path: str, duration: float) -> Transcript:
+        """The transcript of the file; raises TranscriptionError when there is none."""
+
+
+class WhisperBackend(TranscriptionBackend):
+    """Local Whisper on a pool of `workers` threads; further jobs queue for a free one.
+
+    `transcribe_file` is a blocking function taking the path (Whisper by default).
+    """
+
+    name = "whisper"
+
+    def __init__(self, workers: int, realtime_factor: float, transcribe_file: Callable[[str], Optional[Transcript]] = generate_local_transcript):
+        self.workers = workers
+        self.realtime_factor = realtime_factor
+        self.transcribe_file = transcribe_file
+        self.jobs = 0
+        self.queued_seconds = 0.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def has_idle_worker(self) -> bool:
+        return self.jobs < self.workers
+
+    def estimate_seconds(self, duration: float) -> float:
+        return (self.queued_seconds + duration) * self.realtime_factor / self.workers
+
+    async def transcribe(self, video_path: str, duration: float) -> Transcript:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="whisper")
+        # Counters are only touched on the scheduler's loop, so they need no lock
+        self.jobs += 1
+        self.queued_seconds += duration
+        try:
+            transcript = await asyncio.get_running_loop().run_in_executor(self._executor, self.transcribe_file, video_path)
+        finally:
+            self.jobs -= 1
+            self.queued_seconds -= duration
+        if not transcript or not transcript.get("text"):
+            raise TranscriptionError("Whisper returned no transcript")
+        return transcript
+
+
+TRANSCRIPT_PROMPT = (
+    "Transcribe the spoken content of this video completely and accurately. Respond with JSON: "
+    '{"segments": [{"start": <seconds>, "end": <seconds>, "text": "<what was said>"}]}, '
+    "one segment per sentence or short phrase, in order. Do not add remarks about the transcription itself."
+)
+
+
+def parse_transcript(text: str) -> Transcript:
+    """Reads the JSON segments asked for by TRANSCRIPT_PROMPT; plain text is kept without timings."""
+    try:
+        payload = json.loads(text)
+        raw_segments = payload.get("segments", []) if isinstance(payload, dict) else payload
+        segments = [
+            {"start": float(s["start"]), "end": float(s["end"]), "text": str(s["text"]).strip()}
+            for s in raw_segments
+            if str(s.get("text", "")).strip()
+        ]
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return {"text": text.strip(), "segments": []}
+    return {"text": " ".join(s["text"] for s in segments), "segments": segments}
+
+
+def _state_name(file) -> str:
+    state = getattr(file, "state", None)
+    return str(getattr(state, "name", state) or "")
+
+
+class GeminiFilesBackend(TranscriptionBackend):
+    """Uploads the file to the Gemini Files API, waits for it to become ACTIVE and asks for a transcript.
+
+    Everything is awaited on the scheduler's loop (the SDK's `aio` client), so
+    waiting on many remote jobs occupies no threads. The file's state is polled
+    with exponential backoff, and the uploaded file is deleted however the job
+    ends: success, FAILED state, timeout, error or cancellation.
+    """
+
+    name = "gemini"
+
+    def __init__(
+        self,
+        overhead_seconds: float,
+        realtime_factor: float,
+        timeout_seconds: float,
+        client_factory: Optional[Callable[[], Any]] = None,
+        poll_initial_seconds: float = 1.0,
+        poll_max_seconds: float = 15.0,
+    ):
+        self.overhead_seconds = overhead_seconds
+        self.realtime_factor = realtime_factor
+        self.timeout_seconds = timeout_seconds
+        self.client_factory = client_factory
+        self.poll_initial_seconds = poll_initial_seconds
+        self.poll_max_seconds = poll_max_seconds
+        self.jobs = 0
+
+    def _client(self):
+        if self.client_factory is not None:
+            return self.client_factory()
+        return GeminiService._get_client_or_fallback()
+
+    def available(self) -> bool:
+        # A struggling Gemini is left to question generation, which has a local fallback
+        return bool(self.client_factory or os.getenv("GEMINI_API_KEY")) and gemini_caller.breaker.state == "closed"
+
+    def estimate_seconds(self, duration: float) -> float:
+        return self.overhead_seconds + duration * self.realtime_factor
+
+    async def transcribe(self, video_path: str, duration: float) -> Transcript:
+        client = self._client()
+        if client is None:
+            raise TranscriptionError("Gemini client is not configured")
+        files = client.aio.files
+        deadline = time.monotonic() + self.timeout_seconds
+        uploaded = None
+        self.jobs += 1
+        try:
+            uploaded = await asyncio.wait_for(files.upload(file=video_path), self._remaining(deadline))
+            await self._wait_until_active(files, uploaded.name, deadline)
+            response = await asyncio.wait_for(
+                client.aio.models.generate_content(
+                    model="gemini-2.5-flash",
+                    contents=[uploaded, TRANSCRIPT_PROMPT],
+                    config={"response_mime_type": "application/json"},
+                ),
+                self._remaining(deadline),
+            )
+            transcript = parse_transcript(response.text or "")
+            if not transcript["text"]:
+                raise TranscriptionError("Gemini returned an empty transcript")
+            return transcript
+        except Exception as e:
+            self._record_health(e)
+            raise
+        finally:
+            self.jobs -= 1
+            if uploaded is not None:
+                await self._delete(files, uploaded.name)
+
+    @staticmethod
+    def _remaining(deadline: float) -> float:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TranscriptionError("Gemini transcription timed out")
+        return remaining
+
+    async def _wait_until_active(self, files, name: str, deadline: float) -> None:
+        delay = self.poll_initial_seconds
+        while True:
+            current = await asyncio.wait_for(files.get(name=name), self._remaining(deadline))
+            state = _state_name(current)
+            if state == "ACTIVE":
+                return
+            if state == "FAILED":
+                error = getattr(current, "error", None)
+                raise TranscriptionError(f"Gemini could not process the file: {getattr(error, 'message', error)}")
+            if time.monotonic() + delay >= deadline:
+                raise TranscriptionError("Gemini file did not become active before the deadline")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.poll_max_seconds)
+
+    @staticmethod
+    async def _delete(files, name: str) -> None:
+        try:
+            # Shielded so a cancelled job still removes its upload
+            await asyncio.shield(files.delete(name=name))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"Error deleting Gemini file {name}: {e}")
+
+    @staticmethod
+    def _record_health(error: Exception) -> None:
+        if is_overload_error(error):
+            gemini_caller.breaker.record_failure()
+
+
+class TranscriptionScheduler:
+    """Sends each transcription to local Whisper or Gemini and runs it on one event loop thread.
+
+    In "auto" mode a job stays local while a Whisper worker is idle or the clip is
+    short; otherwise it goes to whichever backend is expected to finish it first,
+    given the audio already queued locally. A failed remote job is retried locally.
+    """
+
+    def __init__(self, local: WhisperBackend, remote: Optional[TranscriptionBackend] = None,
+                 mode: str = "auto", remote_min_duration: float = 120.0):
+        self.local = local
+        self.remote = remote
+        self.mode = mode
+        self.remote_min_duration = remote_min_duration
+        self.counts: Dict[str, int] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def choose(self, duration: float) -> TranscriptionBackend:
+        if self.remote is None or self.mode == "whisper" or not self.remote.available():
+            return self.local
+        if self.mode == "gemini":
+            return self.remote
+        if duration < self.remote_min_duration or self.local.has_idle_worker():
+            return self.local
+        if self.remote.estimate_seconds(duration) < self.local.estimate_seconds(duration):
+            return self.remote
+        return self.local
+
+    async def run(self, video_path: str, duration: float) -> Transcript:
+        backend = self.choose(duration)
+        self.counts[backend.name] = self.counts.get(backend.name, 0) + 1
+        try:
+            return await backend.transcribe(video_path, duration)
+        except Exception as e:
+            if backend is self.local:
+                raise
+            print(f"{backend.name} transcription failed ({e}), transcribing locally instead")
+            self.counts[self.local.name] = self.counts.get(self.local.name, 0) + 1
+            return await self.local.transcribe(video_path, duration)
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="transcription", daemon=True).start()
+            return self._loop
+
+    def transcribe(self, video_path: str, duration: float) -> Optional[Transcript]:
+        """Blocking entry point for ingest threads; None when no backend produced a transcript."""
+        future = asyncio.run_coroutine_threadsafe(self.run(video_path, duration), self._event_loop())
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"Error during transcription: {e}")
+            return None
+
+
+def create_transcription_scheduler() -> TranscriptionScheduler:
+    return TranscriptionScheduler(
+        local=WhisperBackend(settings.whisper_workers, settings.whisper_realtime_factor),
+        remote=GeminiFilesBackend(
+            overhead_seconds=settings.gemini_transcription_overhead_seconds,
+            realtime_factor=settings.gemini_transcription_realtime_factor,
+            timeout_seconds=OPERATION_DEADLINES["generate_transcript"],
+        ),
+        mode=settings.transcription_backend,
+        remote_min_duration=settings.remote_transcription_min_duration_seconds,
+    )
+
+
+transcription_scheduler = create_transcription_scheduler()
@@ -0,0 +1,28 @@
+import zlib
+from typing import Dict, Iterable, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def group_variant_pools(questions: Iterable) -> Dict[int, List]:
+    """Maps each checkpoint (primary question) id to [primary, variant 1, variant 2, ...]."""
+    questions = list(questions)
+    pools = {q.id: [q] for q in questions if q.variant_of_id is None}
+    variants = sorted((q for q in questions if q.variant_of_id is not None), key=lambda q: q.variant_index)
+    for variant in variants:
+        if variant.variant_of_id in pools:
+            pools[variant.variant_of_id].append(variant)
+    return pools
+
+
+def select_variant(pool: Sequence[T], user_id: int, checkpoint_id: int, attempt: int) -> T:
+    """Picks the question a user sees on a given attempt at a checkpoint.
+
+    Each user starts at a stable offset into the pool and moves one step per
+    failed attempt, so retries never repeat until the pool is exhausted and the
+    server can recompute the choice from the attempt count alone.
+    """
+    if len(pool) == 1:
+        return pool[0]
+    offset = zlib.crc32(f"{user_id}:{checkpoint_id}".encode()) % len(pool)
+    return pool[(offset + attempt) % len(pool)]
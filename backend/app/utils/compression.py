@@ -0,0 +1,120 @@
+import gzip
+from typing import List, Optional, Tuple
+
+# Media and already-compressed formats are left alone, as are event streams,
+# whose events must reach the client as soon as they are sent
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "image/svg+xml", "text/")
+NEVER_COMPRESSED_TYPES = ("text/event-stream",)
+
+
+def parse_accept_encoding(header: str) -> List[str]:
+    """Encodings the client accepts (q > 0), lower-cased."""
+    accepted = []
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name and quality > 0:
+            accepted.append(name.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """Brotli or gzip for complete responses of a compressible type above `minimum_size`.
+
+    Streamed responses (SSE, file downloads) pass through untouched. Brotli is
+    used when the `brotli` package is installed and the client accepts it.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        try:
+            # Optional: without it responses are gzipped only
+            import brotli
+            self._brotli = brotli
+        except ImportError:
+            self._brotli = None
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        accepted = parse_accept_encoding(accept_encoding)
+        if self._brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return self._brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        encoding = self.choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        streaming = False
+
+        async def send_compressed(message):
+            nonlocal start_message, streaming
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or streaming:
+                await send(message)
+                return
+            if start_message is not None and message.get("more_body", False):
+                # A stream: send it as it comes
+                streaming = True
+                await send(start_message)
+                start_message = None
+                await send(message)
+                return
+            response_headers = start_message["headers"]
+            body = message.get("body", b"")
+            if self._should_compress(response_headers, body):
+                body = self.compress(body, encoding)
+                response_headers = _replace_headers(response_headers, [
+                    (b"content-encoding", encoding.encode()),
+                    (b"content-length", str(len(body)).encode()),
+                ])
+                response_headers.append((b"vary", b"Accept-Encoding"))
+                message = {**message, "body": body}
+            await send({**start_message, "headers": response_headers})
+            start_message = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    def _should_compress(self, response_headers: List[Tuple[bytes, bytes]], body: bytes) -> bool:
+        if len(body) < self.minimum_size:
+            return False
+        content_type = b""
+        for name, value in response_headers:
+            lowered = name.lower()
+            if lowered == b"content-encoding":
+                return False
+            if lowered == b"content-type":
+                content_type = value.lower()
+        content_type = content_type.decode("latin-1")
+        if content_type.startswith(NEVER_COMPRESSED_TYPES):
+            return False
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _replace_headers(headers, replacements) -> List[Tuple[bytes, bytes]]:
+    names = {name for name, _ in replacements}
+    return [(name, value) for name, value in headers if name.lower() not in names] + list(replacements)
@@ -0,0 +1,71 @@
+from contextlib import contextmanager
+from typing import List
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.database import engine as default_engine
+
+# Maximum number of SQL statements each hot endpoint may issue per request, on
+# its worst path (cold caches, a learner's first visit); enforced by
+# scripts/check_query_budgets.py. Authentication (user lookup) is included in
+# every budget.
+QUERY_BUDGETS = {
+    "GET /videos/": 1,
+    "GET /videos/{video_id}": 1,
+    "GET /videos/{video_id}/questions": 1,
+    "GET /videos/{video_id}/session": 3,
+    "GET /videos/{video_id}/checkpoints": 4,
+    # user, soft-delete UPDATE; then, after the response, the leaderboard removal
+    # reads the video's checkpoint ids and completed progress
+    "DELETE /videos/{video_id}": 4,
+    # A first visit inserts the progress row: user, progress, INSERT
+    "GET /progress/{video_id}": 3,
+    "PUT /progress/{video_id}": 3,
+    # user, question pool, progress, checkpoint ids (correct answers only), one
+    # counter upsert for the checkpoint, one for the video when the learner starts
+    # or completes it, progress INSERT/UPDATE; counter rows need not exist
+    "POST /questions/{question_id}/answer": 7,
+    # user, questions, progress, the same two counter upserts, progress write
+    "POST /videos/{video_id}/answers:batch": 6,
+}
+
+
+class QueryCounter:
+    """Collects the SQL statements executed on an engine while active."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine: Engine = default_engine):
+    """Counts statements sent to the database inside the block."""
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter._on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter._on_execute)
+
+
+@contextmanager
+def assert_max_queries(limit: int, engine: Engine = default_engine):
+    """Fails if the block issues more than `limit` SQL statements.
+
+    Usage:
+        with assert_max_queries(QUERY_BUDGETS["GET /videos/{video_id}"]):
+            client.get("/videos/1")
+    """
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > limit:
+        executed = "\n".join(counter.statements)
+        raise AssertionError(
+            f"Expected at most {limit} queries, got {counter.count}:\n{executed}"
+        )
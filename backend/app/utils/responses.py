@@ -0,0 +1,23 @@
+from functools import lru_cache
+from typing import Any
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def json_response(content: Any, response_type: Any, status_code: int = 200) -> Response:
+    """Serializes schema objects that were already validated straight to JSON bytes.
+
+    Returning a Response skips FastAPI's response_model pass, which would validate
+    the same objects again, convert them to dicts and only then encode them. The
+    route's response_model still documents the payload; `response_type` must match it.
+    """
+    return Response(
+        content=_adapter(response_type).dump_json(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
@@ -0,0 +1,24 @@
+import os
+from typing import Iterable
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+
+class MediaStaticFiles(StaticFiles):
+    """The local media mount, marking files under `immutable_dirs` as cacheable forever.
+
+    Only for directories whose keys are never rewritten (a new version gets a new
+    key); uploaded videos keep the default revalidation.
+    """
+
+    def __init__(self, *args, immutable_dirs: Iterable[str] = (), cache_control: str = "", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.immutable_prefixes = tuple(os.path.normpath(d) + os.sep for d in immutable_dirs)
+        self.cache_control = cache_control
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if self.cache_control and response.status_code in (200, 304) and path.startswith(self.immutable_prefixes):
+            response.headers["Cache-Control"] = self.cache_control
+        return response
@@ -0,0 +1,121 @@
+"""
+Ingest worker: transcribes uploaded videos and generates their questions.
+
+Run next to the API when INGEST_MODE=worker:
+
+    python -m app.worker
+
+This is the only process that loads Whisper (and torch); the API just records
+the upload with processing_status "uploaded" and the worker claims it. A video
+whose worker died mid-ingest is claimed again once INGEST_LEASE_SECONDS pass
+without a new stage. While idle it also runs the lifecycle jobs every
+LIFECYCLE_INTERVAL_SECONDS: purging deleted videos and collecting orphaned
+media files.
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, or_
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Video
+from app.services.ingest import ingest_video
+from app.services.lifecycle import run_lifecycle_jobs
+from app.services.storage import video_storage_key
+from app.services.transcription import get_whisper_model
+
+POLL_INTERVAL_SECONDS = 2.0
+# Stages a claimed video passes through before "ready" or "failed"
+INGEST_STAGES = ("transcribing", "generating_storyboard", "generating_questions")
+
+
+def claimable(now: datetime):
+    """Uploads nobody has claimed, and ingests whose worker let the lease expire."""
+    expired = now - timedelta(seconds=settings.ingest_lease_seconds)
+    return and_(
+        Video.deleted_at.is_(None),
+        or_(
+            Video.processing_status == "uploaded",
+            and_(
+                Video.processing_status.in_(INGEST_STAGES),
+                or_(Video.claimed_at.is_(None), Video.claimed_at < expired),
+            ),
+        ),
+    )
+
+
+def claim_next_upload() -> Optional[Tuple[int, str, List[float]]]:
+    """Marks the oldest claimable video as transcribing and returns (video_id, storage_key, timestamps).
+
+    The conditional update makes the claim safe with several workers: only one
+    of them sees a row count of 1, and the fresh `claimed_at` takes the row out
+    of `claimable` for everyone else.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        candidate = (
+            db.query(Video.id, Video.storage_key, Video.video_url, Video.question_timestamps, Video.processing_status)
+            .filter(claimable(now))
+            .order_by(Video.id)
+            .first()
+        )
+        if not candidate:
+            return None
+        claimed = (
+            db.query(Video)
+            .filter(Video.id == candidate.id, claimable(now))
+            .update({"processing_status": "transcribing", "claimed_at": now}, synchronize_session=False)
+        )
+        db.commit()
+        if not claimed:
+            return None
+        if candidate.processing_status != "uploaded":
+            print(f"Reclaiming video {candidate.id}: its ingest stalled in {candidate.processing_status}.")
+        storage_key = video_storage_key(candidate.storage_key, candidate.video_url)
+        return candidate.id, storage_key, list(candidate.question_timestamps or [])
+    finally:
+        db.close()
+
+
+def run(poll_interval: float = POLL_INTERVAL_SECONDS, once: bool = False) -> None:
+    """Processes uploads one at a time; with `once`, stops when none are waiting."""
+    # Pay for the model before the first job rather than during it
+    get_whisper_model()
+    print("Ingest worker ready.")
+    # Deletions requested while no worker was running are purged first
+    next_lifecycle_run = time.monotonic()
+    while True:
+        try:
+            job = claim_next_upload()
+        except Exception as e:
+            print(f"Error claiming upload: {e}")
+            job = None
+        if job is None:
+            if time.monotonic() >= next_lifecycle_run:
+                run_lifecycle_jobs()
+                next_lifecycle_run = time.monotonic() + settings.lifecycle_interval_seconds
+            if once:
+                return
+            time.sleep(poll_interval)
+            continue
+        video_id, storage_key, timestamps = job
+        print(f"Ingesting video {video_id}...")
+        ingest_video(video_id, storage_key, timestamps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TubeTutor ingest worker")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL_SECONDS)
+    parser.add_argument("--once", action="store_true", help="exit when no uploads are waiting")
+    args = parser.parse_args()
+    # Purge and storage reports, and errors from the lifecycle jobs
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    run(args.poll_interval, args.once)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Analytics read cost as graded attempts grow to --attempts (default 1M).
+
+Seeds simulated learners' progress on one video in stages, builds the counters
+with rebuild_stats, and at each stage times the admin read (get_video_analytics,
+counters only) against recomputing from every UserProgress row (what the
+endpoint would cost without the aggregate tables). Also times the per-answer
+counter update.
+
+Run from backend/: python benchmarks/bench_analytics.py [--attempts 1000000]
+Uses a throwaway SQLite file unless DATABASE_URL is set.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_analytics.db")
+os.environ.setdefault("GEMINI_API_KEY", "")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from app.database import SessionLocal, init_db
+from app.models import User, Video, Question, UserProgress
+from app.services.analytics import AnswerStats, get_video_analytics, rebuild_stats
+
+CHECKPOINTS = 10
+RETRY_LIMIT = 3
+STAGES = (10_000, 100_000, 1_000_000)
+
+
+def seed_video(db) -> int:
+    uploader = User(email="analytics@bench.local", username="analytics-bench", hashed_password="-", is_admin=True)
+    db.add(uploader)
+    db.flush()
+    video = Video(title="Analytics benchmark", video_url="videos/analytics.mp4", uploader_id=uploader.id)
+    db.add(video)
+    db.flush()
+    db.add_all([
+        Question(
+            video_id=video.id, timestamp=60.0 * (i + 1), question_type="mcq",
+            question_text=f"Checkpoint {i + 1}?", correct_answer="a", retry_limit=RETRY_LIMIT
+        )
+        for i in range(CHECKPOINTS)
+    ])
+    db.commit()
+    return video.id
+
+
+def simulate_learner(rng: random.Random, question_ids, difficulty) -> tuple:
+    """Returns (completed, failed_attempts, attempts) for one learner who may give up midway."""
+    completed, failed_attempts, attempts = [], {}, 0
+    for question_id, p_correct in zip(question_ids, difficulty):
+        failed = 0
+        while True:
+            attempts += 1
+            if rng.random() < p_correct:
+                completed.append(question_id)
+                break
+            failed += 1
+            if failed >= RETRY_LIMIT and rng.random() < 0.5:
+                break
+        if failed:
+            failed_attempts[str(question_id)] = failed
+        if question_id not in completed:
+            return completed, failed_attempts, attempts
+    return completed, failed_attempts, attempts
+
+
+def seed_learners(db, video_id: int, question_ids, target_attempts: int, rng: random.Random, first_user: int) -> tuple:
+    difficulty = [0.9 - 0.06 * i for i in range(len(question_ids))]
+    users, progress, attempts = [], [], 0
+    user_id = first_user
+    while attempts < target_attempts:
+        completed, failed_attempts, learner_attempts = simulate_learner(rng, question_ids, difficulty)
+        attempts += learner_attempts
+        is_completed = len(completed) == len(question_ids)
+        first_try = sum(1 for qid in question_ids if str(qid) not in failed_attempts)
+        users.append({"id": user_id, "email": f"a{user_id}@bench.local", "username": f"a{user_id}", "hashed_password": "-"})
+        progress.append({
+            "user_id": user_id, "video_id": video_id, "completed_questions": completed,
+            "failed_attempts": failed_attempts, "is_completed": is_completed,
+            "final_score": round(100.0 * first_try / len(question_ids), 2) if is_completed else None,
+        })
+        user_id += 1
+    db.execute(User.__table__.insert(), users)
+    db.execute(UserProgress.__table__.insert(), progress)
+    db.commit()
+    return attempts, user_id
+
+
+def time_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def time_answer_updates(db, video_id: int, question_ids, answers: int) -> float:
+    """Median ms to flush one graded answer's counter deltas and commit."""
+    samples = []
+    for i in range(answers):
+        progress = UserProgress(video_id=video_id, completed_questions=[1], failed_attempts={}, is_completed=False)
+        stats = AnswerStats(progress)
+        stats.attempt(question_ids[i % len(question_ids)], i % RETRY_LIMIT, i % 2 == 0, RETRY_LIMIT)
+        started = time.perf_counter()
+        stats.flush(db)
+        db.commit()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--attempts", type=int, default=STAGES[-1])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    init_db()
+    rng = random.Random(42)
+    db = SessionLocal()
+    try:
+        video_id = seed_video(db)
+        question_ids = [qid for (qid,) in db.query(Question.id).filter(Question.video_id == video_id).order_by(Question.timestamp)]
+        seeded, next_user = 0, 1_000_000
+        for stage in [s for s in STAGES if s < args.attempts] + [args.attempts]:
+            added, next_user = seed_learners(db, video_id, question_ids, stage - seeded, rng, next_user)
+            seeded += added
+            started = time.perf_counter()
+            learners = rebuild_stats(db, video_id)
+            scan_ms = (time.perf_counter() - started) * 1000
+            read_ms = time_ms(lambda: get_video_analytics(db, video_id), args.repeat)
+            analytics = get_video_analytics(db, video_id)
+            print(
+                f"{seeded:>9} attempts, {learners:>6} learners: counters {read_ms:.2f} ms, "
+                f"scan {scan_ms:.0f} ms (drop-off at {analytics.drop_off_timestamp:.0f}s)"
+            )
+        print(f"per-answer counter update + commit: {time_answer_updates(db, video_id, question_ids, 500):.2f} ms")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
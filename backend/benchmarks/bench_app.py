@@ -0,0 +1,111 @@
+"""
+The API app with fake Whisper/Gemini and a seeded catalog, for load tests.
+
+    BENCH_GEMINI_LATENCY_MS=400 uvicorn benchmarks.bench_app:app --port 8001
+
+Environment:
+    DATABASE_URL               defaults to a fresh SQLite file under benchmarks/
+    BENCH_WHISPER_LATENCY_MS   fake transcription time per upload (default 2000)
+    BENCH_GEMINI_LATENCY_MS    fake latency per Gemini call (default 400)
+    BENCH_LEARNERS             learner accounts to create (default 100)
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench.db")
+ADMIN_EMAIL = "admin@bench.local"
+LEARNER_EMAIL = "learner{}@bench.local"
+PASSWORD = "benchmark"
+VIDEO_TITLE = "Benchmark video"
+# Stays mid-ingest forever, so its event stream never ends (for idle SSE subscribers)
+PROCESSING_VIDEO_TITLE = "Benchmark video (processing)"
+CHECKPOINT_INTERVAL_SECONDS = 60.0
+VIDEO_DURATION_SECONDS = 600.0
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{BENCH_DB_PATH}")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+# Simulated learners answer without pausing; measure the endpoints, not the limiter
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+# Only Whisper is faked; uploads must never reach the real Gemini Files API
+os.environ.setdefault("TRANSCRIPTION_BACKEND", "whisper")
+
+from benchmarks.fakes import install_fake_whisper, install_fake_gemini, fake_transcript, fake_question
+
+# Before the first upload: ingest imports whisper when it first transcribes
+install_fake_whisper(float(os.getenv("BENCH_WHISPER_LATENCY_MS", "2000")))
+install_fake_gemini(float(os.getenv("BENCH_GEMINI_LATENCY_MS", "400")))
+
+from app.auth import get_password_hash
+from app.database import Base, SessionLocal, engine
+from app.models import User, Video, Question
+from app.services.retrieval import index_transcript
+
+
+def seed(learners: int) -> None:
+    """Creates the admin, `learners` learner accounts, one published video and one
+    that is still processing, once."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if db.query(User.id).filter(User.email == ADMIN_EMAIL).first():
+            return
+        # One hash for every account; bcrypt per row would dominate start-up
+        hashed_password = get_password_hash(PASSWORD)
+        admin = User(email=ADMIN_EMAIL, username="bench-admin", hashed_password=hashed_password, is_admin=True)
+        db.add(admin)
+        db.add_all([
+            User(email=LEARNER_EMAIL.format(i), username=f"bench-learner{i}", hashed_password=hashed_password)
+            for i in range(learners)
+        ])
+        db.flush()
+
+        transcript = fake_transcript(VIDEO_DURATION_SECONDS)
+        video = Video(
+            title=VIDEO_TITLE,
+            description="Seeded for load tests",
+            video_url="/uploads/videos/benchmark.mp4",
+            transcript=transcript["text"],
+            duration=VIDEO_DURATION_SECONDS,
+            uploader_id=admin.id,
+            is_published=True,
+            processing_status="ready",
+        )
+        db.add(video)
+        db.flush()
+        index_transcript(db, video.id, transcript["segments"])
+
+        timestamp = CHECKPOINT_INTERVAL_SECONDS
+        while timestamp < VIDEO_DURATION_SECONDS:
+            primary = Question(video_id=video.id, timestamp=timestamp, question_type="mcq", **fake_question(timestamp))
+            db.add(primary)
+            db.flush()
+            db.add_all([
+                Question(
+                    video_id=video.id, timestamp=timestamp, question_type="mcq",
+                    variant_of_id=primary.id, variant_index=i, **fake_question(timestamp, i)
+                )
+                for i in (1, 2)
+            ])
+            timestamp += CHECKPOINT_INTERVAL_SECONDS
+        db.add(Question(
+            video_id=video.id, timestamp=VIDEO_DURATION_SECONDS, question_type="mcq",
+            is_final_quiz=True, **fake_question(VIDEO_DURATION_SECONDS)
+        ))
+        db.add(Video(
+            title=PROCESSING_VIDEO_TITLE,
+            video_url="/uploads/videos/benchmark-processing.mp4",
+            uploader_id=admin.id,
+            is_published=False,
+            processing_status="transcribing",
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+seed(int(os.getenv("BENCH_LEARNERS", "100")))
+
+from app.main import app  # noqa: E402
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Grading latency while Gemini is slow, rate limited or hanging.
+Starts the fake Gemini server in-process and calls GeminiService.grade_answer
+concurrently; with the resilience layer p99 stays near the grading deadline
+and drops to the local fallback once the circuit opens. Exits 1 when p99
+exceeds --max-p99-ms (by default the grading deadline plus 500 ms).
+
+Run from backend/: python benchmarks/bench_gemini_outage.py --scenario hang
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PORT = 8765
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ["GEMINI_API_KEY"] = "fake-key"
+os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{PORT}"
+
+from benchmarks.fake_gemini_server import FaultConfig, create_app
+from app.services.gemini_service import GeminiService
+from app.services.resilience import OPERATION_DEADLINES, gemini_caller
+
+SCENARIOS = {
+    "healthy": dict(latency_ms=150, error_rate=0.0, hang=False),
+    "slow": dict(latency_ms=3000, error_rate=0.0, hang=False),
+    "rate_limited": dict(latency_ms=100, error_rate=0.8, hang=False),
+    "hang": dict(latency_ms=0, error_rate=0.0, hang=True),
+}
+
+def start_fake_server():
+    import uvicorn
+    server = uvicorn.Server(uvicorn.Config(create_app(), host="127.0.0.1", port=PORT, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+def timed_grade(_):
+    started = time.perf_counter()
+    result = GeminiService.grade_answer("What is 2 + 2?", "five", "four")
+    return (time.perf_counter() - started) * 1000, result["explanation"] == "Grading API failed. Simple string match used."
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", choices=SCENARIOS, default="rate_limited")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-p99-ms", type=float, default=OPERATION_DEADLINES["grade_answer"] * 1000 + 500)
+    args = parser.parse_args()
+
+    for key, value in SCENARIOS[args.scenario].items():
+        setattr(FaultConfig, key, value)
+    start_fake_server()
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        outcomes = list(pool.map(timed_grade, range(args.requests)))
+    latencies = sorted(ms for ms, _ in outcomes)
+    fallbacks = sum(1 for _, fell_back in outcomes if fell_back)
+
+    print(f"scenario: {args.scenario}, requests: {args.requests}, concurrency: {args.concurrency}")
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"p50: {statistics.median(latencies):.0f} ms, p99: {p99:.0f} ms, max: {latencies[-1]:.0f} ms")
+    print(f"fallbacks: {fallbacks}, breaker: {gemini_caller.breaker.state}, concurrency limit: {gemini_caller.limiter.limit:.1f}")
+    if p99 > args.max_p99_ms:
+        print(f"FAIL p99 {p99:.0f} ms is over {args.max_p99_ms:.0f} ms")
+        sys.exit(1)
+    print(f"OK p99 within {args.max_p99_ms:.0f} ms")
+
+if __name__ == "__main__":
+    main()
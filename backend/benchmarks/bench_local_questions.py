@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Throughput of the offline extractive question generator (no network).
+Run from backend/: python benchmarks/bench_local_questions.py [--sentences 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The generator needs no database; settings only have to load
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("GEMINI_API_KEY", "")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from app.services.local_questions import generate_local_questions
+
+VOCABULARY = [f"concept{i}" for i in range(3000)]
+FILLER = ["the", "of", "and", "is", "in", "to", "that", "we", "this", "about"]
+
+def synthetic_transcript(sentences: int, rng: random.Random) -> str:
+    return " ".join(
+        " ".join(rng.choice(VOCABULARY) if rng.random() < 0.5 else rng.choice(FILLER) for _ in range(rng.randint(8, 20))).capitalize() + "."
+        for _ in range(sentences)
+    )
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, default=2000, help="transcript length (about one hour of speech)")
+    parser.add_argument("--checkpoints", type=int, default=50)
+    parser.add_argument("--variants", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    transcript = synthetic_transcript(args.sentences, rng)
+    sentences = transcript.split(". ")
+    step = max(1, len(sentences) // args.checkpoints)
+
+    started = time.perf_counter()
+    generated = 0
+    for checkpoint in range(args.checkpoints):
+        # Roughly the last minute of speech before the checkpoint, as ingest passes it after trimming
+        segment = ". ".join(sentences[max(0, (checkpoint + 1) * step - 40):(checkpoint + 1) * step])
+        generated += len(generate_local_questions(segment, checkpoint * 30.0, "mcq", args.variants, corpus=transcript))
+    elapsed = time.perf_counter() - started
+
+    print(f"transcript: {args.sentences} sentences, {args.checkpoints} checkpoints x {args.variants} variants")
+    print(f"questions: {generated} in {elapsed:.2f}s ({generated / elapsed:.0f} questions/s)")
+
+if __name__ == "__main__":
+    main()
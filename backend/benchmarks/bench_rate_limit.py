@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Per-request overhead of the rate limiter (one bucket check).
+Measures the in-process limiter single-threaded and under thread contention,
+and the Redis limiter when REDIS_URL is set.
+
+Run from backend/: python benchmarks/bench_rate_limit.py [--users 10000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("GEMINI_API_KEY", "")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from app.services.rate_limit import Budget, InProcessRateLimiter, RedisRateLimiter
+
+# Generous enough that every check is granted, which is the common path
+BUDGET = Budget(capacity=1_000_000, refill_per_second=1_000_000)
+
+def time_checks(limiter, keys, checks: int) -> list:
+    latencies = []
+    for i in range(checks):
+        started = time.perf_counter()
+        limiter.acquire(keys[i % len(keys)], BUDGET)
+        latencies.append((time.perf_counter() - started) * 1_000_000)
+    return latencies
+
+def report(name: str, latencies: list) -> None:
+    latencies.sort()
+    print(f"{name}: p50 {statistics.median(latencies):.1f} us, "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1]:.1f} us over {len(latencies)} checks")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--checks", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    keys = [f"answer:{user}" for user in range(args.users)]
+    random.Random(42).shuffle(keys)
+
+    limiter = InProcessRateLimiter()
+    report("in-process", time_checks(limiter, keys, args.checks))
+
+    per_thread = args.checks // args.threads
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        results = pool.map(lambda _: time_checks(limiter, keys, per_thread), range(args.threads))
+        report(f"in-process, {args.threads} threads", [ms for result in results for ms in result])
+
+    if os.getenv("REDIS_URL"):
+        report("redis", time_checks(RedisRateLimiter(os.environ["REDIS_URL"]), keys, min(args.checks, 20000)))
+    else:
+        print("redis: skipped (set REDIS_URL)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Retrieval latency for the transcript vector index.
+Run from backend/: python benchmarks/bench_retrieval.py [--chunks 10000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The index itself needs no database; settings only have to load
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("GEMINI_API_KEY", "")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from app.services.retrieval import VectorIndex, embed_texts, CHUNK_TARGET_WORDS
+
+VOCABULARY = [f"term{i}" for i in range(5000)]
+
+def synthetic_chunks(count: int, rng: random.Random):
+    return [
+        {"start": i * 30.0, "end": (i + 1) * 30.0, "text": " ".join(rng.choices(VOCABULARY, k=CHUNK_TARGET_WORDS))}
+        for i in range(count)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    chunks = synthetic_chunks(args.chunks, rng)
+
+    started = time.perf_counter()
+    index = VectorIndex(chunks, embed_texts([c["text"] for c in chunks]))
+    build_seconds = time.perf_counter() - started
+
+    queries = [" ".join(rng.choices(VOCABULARY, k=12)) for _ in range(args.queries)]
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query, args.k)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+
+    print(f"chunks: {args.chunks}")
+    print(f"index build: {build_seconds:.2f}s ({index.matrix.nbytes / 1e6:.1f} MB matrix)")
+    print(f"query p50: {statistics.median(latencies):.2f} ms")
+    print(f"query p99: {latencies[int(len(latencies) * 0.99) - 1]:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Transcript search: indexing throughput and query latency over a synthetic catalog.
+
+Generates --hours of lecture transcripts (SEGMENTS_PER_HOUR segments of
+Zipf-distributed words, like speech), indexes them video by video as ingest
+does, then times searches for rare, mid-frequency and common terms, two-word
+queries and a deep page.
+
+Run from backend/: python benchmarks/bench_search.py [--hours 200]
+Uses a throwaway SQLite file (FTS5) unless DATABASE_URL is set; point it at
+Postgres for the tsvector/GIN path, e.g. --hours 50000 for the full-size catalog.
+"""
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_search.db")
+os.environ.setdefault("GEMINI_API_KEY", "")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from app.database import SessionLocal, init_db
+from app.models import User, Video
+from app.services.search import search_transcripts, index_segments
+
+SEGMENT_SECONDS = 5.0
+SEGMENTS_PER_HOUR = int(3600 / SEGMENT_SECONDS)
+WORDS_PER_SEGMENT = 12
+VIDEO_HOURS = 1
+VOCABULARY_SIZE = 20000
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "ta", "shi", "po", "ven", "dra", "tor", "ith", "ex", "um", "gal"]
+
+
+def vocabulary(size: int) -> list:
+    words = []
+    for length in itertools.count(2):
+        for combo in itertools.product(SYLLABLES, repeat=length):
+            words.append("".join(combo))
+            if len(words) == size:
+                return words
+
+
+def generate_segments(rng: random.Random, words: list, cum_weights: list, count: int) -> list:
+    tokens = rng.choices(words, cum_weights=cum_weights, k=count * WORDS_PER_SEGMENT)
+    return [
+        {
+            "start": i * SEGMENT_SECONDS,
+            "end": (i + 1) * SEGMENT_SECONDS,
+            "text": " ".join(tokens[i * WORDS_PER_SEGMENT:(i + 1) * WORDS_PER_SEGMENT]).capitalize() + ".",
+        }
+        for i in range(count)
+    ]
+
+
+def time_queries(db, queries: list, repeat: int, **kwargs) -> list:
+    samples = []
+    for _ in range(repeat):
+        for query in queries:
+            started = time.perf_counter()
+            search_transcripts(db, query, 20, **kwargs)
+            samples.append((time.perf_counter() - started) * 1000)
+    return sorted(samples)
+
+
+def report(name: str, samples: list) -> None:
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    print(f"{name:<22} p50 {statistics.median(samples):7.2f} ms  p95 {p95:7.2f} ms  "
+          f"({1000 / statistics.mean(samples):.0f} queries/s single-threaded)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hours", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    init_db()
+    rng = random.Random(42)
+    words = vocabulary(VOCABULARY_SIZE)
+    cum_weights = list(itertools.accumulate(1.0 / rank for rank in range(1, len(words) + 1)))
+
+    db = SessionLocal()
+    try:
+        uploader = User(email="search@bench.local", username="search-bench", hashed_password="-", is_admin=True)
+        db.add(uploader)
+        db.commit()
+
+        indexing_seconds = 0.0
+        segments_indexed = 0
+        for hour in range(0, args.hours, VIDEO_HOURS):
+            video = Video(
+                title=f"Lecture {hour}", video_url=f"videos/lecture-{hour}.mp4",
+                uploader_id=uploader.id, is_published=True, processing_status="ready"
+            )
+            db.add(video)
+            db.flush()
+            segments = generate_segments(rng, words, cum_weights, SEGMENTS_PER_HOUR * VIDEO_HOURS)
+            started = time.perf_counter()
+            segments_indexed += index_segments(db, video.id, segments)
+            db.commit()
+            indexing_seconds += time.perf_counter() - started
+        print(f"indexed {args.hours} hours ({segments_indexed} segments) in {indexing_seconds:.1f} s: "
+              f"{segments_indexed / indexing_seconds:.0f} segments/s, "
+              f"{args.hours * 3600 / indexing_seconds:.0f}x real time")
+
+        rare = words[-50:]
+        mid = words[500:550]
+        common = words[:10]
+        report("rare term", time_queries(db, rare, args.repeat))
+        report("mid-frequency term", time_queries(db, mid, args.repeat))
+        report("common term", time_queries(db, common, max(1, args.repeat // 4)))
+        report("two terms", time_queries(db, [f"{a} {b}" for a, b in zip(mid, rare)], args.repeat))
+        report("mid term, page 10", time_queries(db, mid, args.repeat, offset=180))
+        report("within one video", time_queries(db, mid, args.repeat, video_id=1))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Response building cost for payload-heavy endpoints: a 1k-video catalog listing
+and a 100-question list.
+
+Compares returning schema objects through FastAPI's response_model path
+(validated again, converted to dicts, encoded with json or orjson) with dumping
+them straight to JSON (app.utils.responses.json_response), for objects built
+from ORM rows and for cached ones, then the size and time of gzip and brotli
+on the result.
+
+Run from backend/: python benchmarks/bench_serialization.py [--videos 1000 --questions 100]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import List
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("GEMINI_API_KEY", "")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.models import Video, Question
+from app.schemas import VideoResponse, QuestionResponse
+from app.utils.compression import CompressionMiddleware
+from app.utils.responses import json_response
+
+
+def make_videos(count: int) -> list:
+    return [
+        Video(
+            id=i, title=f"Lecture {i}: an introduction to topic {i % 37}",
+            description="A recorded lecture with checkpoints every few minutes. " * 3,
+            video_url=f"videos/{i:08d}_lecture.mp4", storage_key=None, thumbnail_url=None,
+            duration=1800.0 + i, is_published=True, processing_status="ready",
+            uploader_id=1, created_at=datetime(2024, 1, 1, 12, 0, 0),
+        )
+        for i in range(count)
+    ]
+
+
+def make_questions(count: int) -> list:
+    return [
+        Question(
+            id=i, timestamp=30.0 * i, question_type="mcq",
+            question_text=f"Which statement about concept {i} matches the lecture?",
+            options=[f"Option {c} for concept {i}" for c in "ABCD"],
+            retry_limit=3, rewind_seconds=30.0, is_final_quiz=False, variant_index=0,
+        )
+        for i in range(count)
+    ]
+
+
+def time_us(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(samples)
+
+
+def compare(name: str, rows: list, schema, repeat: int) -> bytes:
+    """Endpoints validate ORM rows into schema objects (or take them from the catalog
+    cache) and return them; FastAPI then runs them through response_model again."""
+    field = create_response_field(name="Response", type_=List[schema])
+    loop = asyncio.new_event_loop()
+    cached = [schema.model_validate(row) for row in rows]
+
+    def response_model_path(models, response_class):
+        content = loop.run_until_complete(serialize_response(field=field, response_content=models, is_coroutine=True))
+        return response_class(content).body
+
+    def direct_path(models):
+        return json_response(models, List[schema]).body
+
+    print(name)
+    for label, build in (("from ORM rows", lambda: [schema.model_validate(row) for row in rows]), ("cached models", lambda: cached)):
+        baseline = time_us(lambda: response_model_path(build(), JSONResponse), repeat)
+        orjson_us = time_us(lambda: response_model_path(build(), ORJSONResponse), repeat)
+        direct_us = time_us(lambda: direct_path(build()), repeat)
+        print(f"  {label}: response_model + json {baseline / 1000:.2f} ms, "
+              f"+ orjson {orjson_us / 1000:.2f} ms ({baseline / orjson_us:.1f}x), "
+              f"json_response {direct_us / 1000:.2f} ms ({baseline / direct_us:.1f}x)")
+    body = direct_path(cached)
+    assert body == response_model_path(cached, ORJSONResponse), "json_response must match the response_model output"
+    loop.close()
+    return body
+
+
+def report_compression(body: bytes, repeat: int) -> None:
+    middleware = CompressionMiddleware(app=None)
+    print(f"  body {len(body) / 1024:8.1f} KiB")
+    encodings = ["gzip"] + (["br"] if middleware._brotli is not None else [])
+    for encoding in encodings:
+        compressed = middleware.compress(body, encoding)
+        took = time_us(lambda: middleware.compress(body, encoding), repeat)
+        print(f"  {encoding:<4} {len(compressed) / 1024:8.1f} KiB ({len(body) / len(compressed):.1f}x smaller) in {took / 1000:.2f} ms")
+    if middleware._brotli is None:
+        print("  br   skipped (pip install brotli)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--videos", type=int, default=1000)
+    parser.add_argument("--questions", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    body = compare(f"catalog, {args.videos} videos", make_videos(args.videos), VideoResponse, args.repeat)
+    report_compression(body, args.repeat)
+    body = compare(f"questions, {args.questions}", make_questions(args.questions), QuestionResponse, args.repeat * 10)
+    report_compression(body, args.repeat * 10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Compares two load test result files (benchmarks/load_test.py) endpoint by endpoint.
+Exits with status 1 if any endpoint's p95 regressed by more than --threshold percent.
+
+Run from backend/: python benchmarks/compare_results.py results/base.json results/head.json
+"""
+
+import argparse
+import json
+import sys
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+def change(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed p95 regression in percent")
+    args = parser.parse_args()
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    print(f"{base['scenario']}: {base.get('git_commit')} -> {head.get('git_commit')}")
+    print(f"throughput: {base['throughput_rps']} -> {head['throughput_rps']} req/s "
+          f"({change(base['throughput_rps'], head['throughput_rps']):+.1f}%)")
+
+    regressions = []
+    for label in sorted(set(base["endpoints"]) | set(head["endpoints"])):
+        before, after = base["endpoints"].get(label), head["endpoints"].get(label)
+        if not before or not after:
+            print(f"  {label:42} only in {'head' if after else 'base'}")
+            continue
+        cells = " ".join(
+            f"{metric[:3]} {before[metric]:.1f}->{after[metric]:.1f} ({change(before[metric], after[metric]):+.0f}%)"
+            for metric in METRICS
+        )
+        print(f"  {label:42} {cells}")
+        if change(before["p95_ms"], after["p95_ms"]) > args.threshold:
+            regressions.append(label)
+
+    if regressions:
+        print(f"p95 regressed more than {args.threshold:.0f}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the Gemini REST API with injectable latency and failures.
+Point the backend at it with GEMINI_BASE_URL=http://127.0.0.1:8765
+
+Run: python benchmarks/fake_gemini_server.py --latency-ms 200 --error-rate 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+class FaultConfig:
+    latency_ms = 0.0
+    error_rate = 0.0  # share of requests answered with 429
+    hang = False  # never answer, to exercise client deadlines
+
+
+def response_text(prompt: str) -> str:
+    if "Grade the user's answer" in prompt:
+        return json.dumps({"correct": False, "explanation": "Stand-in grader.", "hint": ""})
+    if "Generate a" in prompt:
+        return json.dumps({
+            "question_text": "Stand-in question?",
+            "options": ["A", "B", "C", "D"],
+            "correct_answer": "A",
+            "explanation": "Stand-in explanation."
+        })
+    return "Stand-in summary of the relevant lecture content."
+
+
+def create_app(config: FaultConfig = FaultConfig) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/{api_version}/models/{model_action}")
+    async def generate_content(api_version: str, model_action: str, request: Request):
+        body = await request.json()
+        if config.hang:
+            await asyncio.sleep(3600)
+        if config.latency_ms:
+            await asyncio.sleep(random.uniform(0.5, 1.5) * config.latency_ms / 1000)
+        if random.random() < config.error_rate:
+            return JSONResponse(
+                status_code=429,
+                content={"error": {"code": 429, "message": "Resource exhausted", "status": "RESOURCE_EXHAUSTED"}}
+            )
+        prompt = " ".join(
+            part.get("text", "")
+            for content in body.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        text = response_text(prompt)
+        return {
+            "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}],
+            "usageMetadata": {
+                "promptTokenCount": len(prompt) // 4,
+                "candidatesTokenCount": len(text) // 4,
+                "totalTokenCount": (len(prompt) + len(text)) // 4
+            }
+        }
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang", action="store_true")
+    args = parser.parse_args()
+
+    FaultConfig.latency_ms = args.latency_ms
+    FaultConfig.error_rate = args.error_rate
+    FaultConfig.hang = args.hang
+    uvicorn.run(create_app(), host="127.0.0.1", port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Deterministic stand-ins for Whisper and GeminiService, with configurable latency.
+
+Install them before `app` is imported:
+
+    from benchmarks.fakes import install_fakes
+    install_fakes(whisper_latency_ms=2000, gemini_latency_ms=400)
+"""
+
+import sys
+import time
+import types
+import zlib
+
+SENTENCES = [
+    "Photosynthesis converts light energy into chemical energy inside the chloroplast.",
+    "The chlorophyll pigment absorbs mostly red and blue light.",
+    "During the Calvin cycle, carbon dioxide is fixed into sugar molecules.",
+    "The light reactions produce ATP and NADPH for the Calvin cycle.",
+    "Cellular respiration breaks glucose down in the mitochondria to release energy.",
+    "Stomata on the leaf surface regulate gas exchange and water loss.",
+]
+SEGMENT_SECONDS = 10.0
+
+
+def fake_transcript(duration_seconds: float = 600.0) -> dict:
+    """A Whisper-shaped result: one sentence per SEGMENT_SECONDS, cycling through SENTENCES."""
+    segments = [
+        {"start": i * SEGMENT_SECONDS, "end": (i + 1) * SEGMENT_SECONDS, "text": " " + SENTENCES[i % len(SENTENCES)]}
+        for i in range(int(duration_seconds // SEGMENT_SECONDS))
+    ]
+    return {"text": "".join(s["text"] for s in segments).strip(), "segments": segments}
+
+
+class FakeWhisperModel:
+    def __init__(self, latency_ms: float):
+        self.latency_ms = latency_ms
+
+    def transcribe(self, path: str, **kwargs) -> dict:
+        time.sleep(self.latency_ms / 1000)
+        return fake_transcript()
+
+
+def install_fake_whisper(latency_ms: float) -> None:
+    """Registers a `whisper` module whose load_model returns FakeWhisperModel (no torch)."""
+    module = types.ModuleType("whisper")
+    module.load_model = lambda name, **kwargs: FakeWhisperModel(latency_ms)
+    sys.modules["whisper"] = module
+
+
+def fake_question(timestamp: float, index: int = 0) -> dict:
+    answer = f"Answer {int(timestamp)}-{index}"
+    return {
+        "question_text": f"Benchmark question at {int(timestamp)}s ({index})",
+        "options": [answer, "Option B", "Option C", "Option D"],
+        "correct_answer": answer,
+        "explanation": "Benchmark explanation.",
+    }
+
+
+def install_fake_gemini(latency_ms: float) -> None:
+    """Replaces the GeminiService calls with fixed answers after `latency_ms`.
+
+    Grading is correct when the answer's crc32 is even, so outcomes are
+    repeatable without depending on the answer text.
+    """
+    from app.services.gemini_service import GeminiService
+
+    def wait():
+        time.sleep(latency_ms / 1000)
+
+    def generate_question(transcript_segment, timestamp, question_type, final_quiz=False):
+        wait()
+        return fake_question(timestamp)
+
+    def generate_question_variants(transcript_segment, timestamp, question_type, count):
+        wait()
+        return [fake_question(timestamp, i) for i in range(count)]
+
+    def grade_answer(question, user_answer, correct_answer, context=""):
+        wait()
+        correct = zlib.crc32(user_answer.encode()) % 2 == 0
+        return {"correct": correct, "explanation": "Benchmark grading.", "hint": ""}
+
+    def generate_summary(transcript_segment, failed_question):
+        wait()
+        return "Benchmark summary."
+
+    GeminiService.generate_question = staticmethod(generate_question)
+    GeminiService.generate_question_variants = staticmethod(generate_question_variants)
+    GeminiService.grade_answer = staticmethod(grade_answer)
+    GeminiService.generate_summary = staticmethod(generate_summary)
+
+
+def install_fakes(whisper_latency_ms: float = 0, gemini_latency_ms: float = 0) -> None:
+    install_fake_whisper(whisper_latency_ms)
+    install_fake_gemini(gemini_latency_ms)
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Scripted load test against the API with fake Whisper and Gemini (benchmarks/bench_app.py).
+
+Scenarios:
+  learners   learners log in, load a video, send progress heartbeats and answer
+             every checkpoint, while an admin uploads videos (default)
+  session    GET /videos/{id}/session against the three calls it replaced
+  sse-idle   server memory per idle subscriber on /videos/{id}/events
+
+By default the server is started with uvicorn on a free port; --base-url targets
+one that is already running and --in-process calls the app through httpx's ASGI
+transport (no network, no SSE; uploads then include their ingest time).
+
+Results are written as JSON (throughput and p50/p95/p99 per endpoint) for
+benchmarks/compare_results.py.
+
+Run from backend/:
+  python benchmarks/load_test.py --learners 50 --gemini-latency-ms 400
+  DATABASE_URL=postgresql://... python benchmarks/load_test.py --scenario session
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+TERMINAL_STAGES = {"ready", "failed"}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(fraction * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Recorder:
+    """Latency samples and error counts per endpoint label."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def add(self, label: str, milliseconds: float, ok: bool = True) -> None:
+        self.samples[label].append(milliseconds)
+        if not ok:
+            self.errors[label] += 1
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.add(label, (time.perf_counter() - started) * 1000, ok=False)
+            return None
+        self.add(label, (time.perf_counter() - started) * 1000, ok=response.status_code < 400)
+        return response
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        endpoints = {}
+        for label, values in sorted(self.samples.items()):
+            values = sorted(values)
+            endpoints[label] = {
+                "count": len(values),
+                "errors": self.errors[label],
+                "mean_ms": round(sum(values) / len(values), 2),
+                "p50_ms": round(percentile(values, 0.50), 2),
+                "p95_ms": round(percentile(values, 0.95), 2),
+                "p99_ms": round(percentile(values, 0.99), 2),
+                "max_ms": round(values[-1], 2),
+            }
+        return endpoints
+
+
+async def login(client: httpx.AsyncClient, recorder: Recorder, email: str, password: str) -> Dict[str, str]:
+    response = await recorder.request(
+        client, "POST /auth/login", "POST", "/auth/login",
+        data={"username": email, "password": password}
+    )
+    if response is None or response.status_code != 200:
+        raise RuntimeError(f"Login failed for {email}")
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def find_video(client: httpx.AsyncClient, headers: Dict[str, str], title: str) -> int:
+    videos = (await client.get("/videos/", headers=headers)).json()
+    return next(v["id"] for v in videos if v["title"] == title)
+
+
+async def learner_session(client: httpx.AsyncClient, recorder: Recorder, args, learner: int) -> None:
+    """One learner watching the seeded video from start to end."""
+    from benchmarks.bench_app import LEARNER_EMAIL, PASSWORD, VIDEO_TITLE
+    rng = random.Random(learner)
+    headers = await login(client, recorder, LEARNER_EMAIL.format(learner % args.accounts), PASSWORD)
+
+    videos = await recorder.request(client, "GET /videos/", "GET", "/videos/", headers=headers)
+    video_id = next(v["id"] for v in videos.json() if v["title"] == VIDEO_TITLE)
+    session = await recorder.request(client, "GET /videos/{id}/session", "GET", f"/videos/{video_id}/session", headers=headers)
+    questions = sorted(session.json()["questions"], key=lambda q: q["timestamp"])
+
+    position = 0.0
+    for question in questions:
+        # Heartbeats while the video plays up to the checkpoint
+        for beat in range(1, args.heartbeats + 1):
+            current = position + (question["timestamp"] - position) * beat / args.heartbeats
+            await recorder.request(
+                client, "PUT /progress/{id}", "PUT", f"/progress/{video_id}",
+                headers=headers, json={"current_timestamp": current}
+            )
+            if args.think_ms:
+                await asyncio.sleep(args.think_ms / 1000)
+        position = question["timestamp"]
+
+        # Answer until correct or out of retries; options are picked at random (seeded per learner)
+        current_question = question
+        for _ in range(question["retry_limit"] + 1):
+            options = current_question.get("options") or ["benchmark"]
+            answer = rng.choice(options)
+            response = await recorder.request(
+                client, "POST /questions/{id}/answer", "POST", f"/questions/{question['id']}/answer",
+                headers=headers, json={"answer": answer, "current_timestamp": position}
+            )
+            if response is None or response.status_code != 200:
+                break
+            result = response.json()
+            if result["correct"] or result["retries_left"] == 0:
+                break
+            current_question = result.get("next_question") or current_question
+
+
+async def admin_uploads(client: httpx.AsyncClient, recorder: Recorder, args) -> None:
+    """Uploads `args.uploads` small files and waits for each ingest to finish."""
+    from benchmarks.bench_app import ADMIN_EMAIL, PASSWORD
+    headers = await login(client, recorder, ADMIN_EMAIL, PASSWORD)
+    for upload in range(args.uploads):
+        started = time.perf_counter()
+        response = await recorder.request(
+            client, "POST /videos/upload", "POST", "/videos/upload", headers=headers,
+            data={"title": f"Load test upload {upload}", "description": "", "question_timestamps": "[30, 60, 90]"},
+            files={"video_file": (f"upload{upload}.mp4", b"\0" * args.upload_bytes, "video/mp4")}
+        )
+        if response is None or response.status_code != 200:
+            continue
+        video_id = response.json()["video_id"]
+        status = None
+        while status not in TERMINAL_STAGES:
+            await asyncio.sleep(0.2)
+            status = (await client.get(f"/videos/{video_id}", headers=headers)).json().get("processing_status")
+        recorder.add("ingest (upload to ready)", (time.perf_counter() - started) * 1000, ok=status == "ready")
+        await client.delete(f"/videos/{video_id}", headers=headers)
+
+
+async def run_learners(client: httpx.AsyncClient, recorder: Recorder, args) -> Dict:
+    semaphore = asyncio.Semaphore(args.learners)
+
+    async def bounded(learner: int):
+        async with semaphore:
+            await learner_session(client, recorder, args, learner)
+
+    await asyncio.gather(
+        admin_uploads(client, recorder, args),
+        *(bounded(i) for i in range(args.sessions)),
+    )
+    return {}
+
+
+async def run_session_comparison(client: httpx.AsyncClient, recorder: Recorder, args) -> Dict:
+    """Learner start-up: one /session call against video + questions + progress."""
+    from benchmarks.bench_app import LEARNER_EMAIL, PASSWORD, VIDEO_TITLE
+    semaphore = asyncio.Semaphore(args.learners)
+
+    async def compare(learner: int):
+        async with semaphore:
+            headers = await login(client, recorder, LEARNER_EMAIL.format(learner % args.accounts), PASSWORD)
+            video_id = await find_video(client, headers, VIDEO_TITLE)
+            for _ in range(args.iterations):
+                started = time.perf_counter()
+                await recorder.request(client, "GET /videos/{id}/session", "GET", f"/videos/{video_id}/session", headers=headers)
+                recorder.add("flow: session", (time.perf_counter() - started) * 1000)
+
+                started = time.perf_counter()
+                await recorder.request(client, "GET /videos/{id}", "GET", f"/videos/{video_id}", headers=headers)
+                await recorder.request(client, "GET /videos/{id}/questions", "GET", f"/videos/{video_id}/questions", headers=headers)
+                await recorder.request(client, "GET /progress/{id}", "GET", f"/progress/{video_id}", headers=headers)
+                recorder.add("flow: three calls", (time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(compare(i) for i in range(args.sessions)))
+    return {}
+
+
+def process_rss_kb(pid: int) -> Optional[int]:
+    """Resident set size from /proc (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+async def run_sse_idle(client: httpx.AsyncClient, recorder: Recorder, args, server_pid: Optional[int]) -> Dict:
+    """Opens `args.subscribers` streams on a video that never finishes and holds them idle."""
+    from benchmarks.bench_app import ADMIN_EMAIL, PASSWORD, PROCESSING_VIDEO_TITLE
+    headers = await login(client, recorder, ADMIN_EMAIL, PASSWORD)
+    # Unpublished videos are not listed, so look it up by id
+    video_id = None
+    for candidate in range(1, 100):
+        response = await client.get(f"/videos/{candidate}", headers=headers)
+        if response.status_code == 200 and response.json()["title"] == PROCESSING_VIDEO_TITLE:
+            video_id = candidate
+            break
+    if video_id is None:
+        raise RuntimeError("Processing video not found; reseed benchmarks/bench.db")
+    token = headers["Authorization"].split()[1]
+
+    rss_before = process_rss_kb(server_pid) if server_pid else None
+    opened = asyncio.Event()
+    ready = 0
+
+    async def hold():
+        nonlocal ready
+        started = time.perf_counter()
+        async with client.stream("GET", f"/videos/{video_id}/events", params={"access_token": token}) as response:
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    recorder.add("GET /videos/{id}/events (first event)", (time.perf_counter() - started) * 1000,
+                                 ok=response.status_code == 200)
+                    break
+            ready += 1
+            if ready == args.subscribers:
+                opened.set()
+            await asyncio.sleep(args.hold_seconds)
+
+    streams = [asyncio.create_task(hold()) for _ in range(args.subscribers)]
+    await asyncio.wait_for(opened.wait(), timeout=60)
+    await asyncio.sleep(1)
+    rss_after = process_rss_kb(server_pid) if server_pid else None
+    for stream in streams:
+        stream.cancel()
+    await asyncio.gather(*streams, return_exceptions=True)
+
+    extra = {"subscribers": args.subscribers}
+    if rss_before is not None and rss_after is not None:
+        extra.update({
+            "server_rss_before_kb": rss_before,
+            "server_rss_after_kb": rss_after,
+            "server_kb_per_subscriber": round((rss_after - rss_before) / args.subscribers, 2),
+        })
+    return extra
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        BENCH_WHISPER_LATENCY_MS=str(args.whisper_latency_ms),
+        BENCH_GEMINI_LATENCY_MS=str(args.gemini_latency_ms),
+        BENCH_LEARNERS=str(args.accounts),
+    )
+    # Seed once up front so several workers do not race to create the same rows
+    subprocess.run([sys.executable, "-c", "import benchmarks.bench_app"], cwd=BACKEND_DIR, env=env, check=True)
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.bench_app:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+    args.base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{args.base_url}/health", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Benchmark server did not start")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args, server_pid: Optional[int]) -> Dict:
+    if args.in_process:
+        from benchmarks.bench_app import app
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+    else:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=120, limits=httpx.Limits(max_connections=None))
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    async with client:
+        if args.scenario == "learners":
+            extra = await run_learners(client, recorder, args)
+        elif args.scenario == "session":
+            extra = await run_session_comparison(client, recorder, args)
+        else:
+            extra = await run_sse_idle(client, recorder, args, server_pid)
+    elapsed = time.perf_counter() - started
+
+    endpoints = recorder.summary()
+    requests = sum(e["count"] for label, e in endpoints.items() if " /" in label and not label.startswith("flow"))
+    return {
+        "scenario": args.scenario,
+        "git_commit": git_commit(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "database": os.environ.get("DATABASE_URL", "sqlite (benchmarks/bench.db)").split(":", 1)[0],
+        "config": {
+            key: getattr(args, key) for key in (
+                "learners", "sessions", "accounts", "heartbeats", "think_ms", "uploads", "iterations",
+                "subscribers", "workers", "gemini_latency_ms", "whisper_latency_ms", "in_process"
+            )
+        },
+        "duration_seconds": round(elapsed, 3),
+        "requests": requests,
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "endpoints": endpoints,
+        "extra": extra,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", choices=["learners", "session", "sse-idle"], default="learners")
+    parser.add_argument("--learners", type=int, default=20, help="concurrent learners")
+    parser.add_argument("--sessions", type=int, default=100, help="learner sessions in total")
+    parser.add_argument("--accounts", type=int, default=100, help="seeded learner accounts")
+    parser.add_argument("--heartbeats", type=int, default=3, help="progress updates between checkpoints")
+    parser.add_argument("--think-ms", type=float, default=0)
+    parser.add_argument("--uploads", type=int, default=2, help="admin uploads during the learner scenario")
+    parser.add_argument("--upload-bytes", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=10, help="session scenario repeats per learner")
+    parser.add_argument("--subscribers", type=int, default=500, help="idle SSE streams")
+    parser.add_argument("--hold-seconds", type=float, default=5)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--gemini-latency-ms", type=float, default=400)
+    parser.add_argument("--whisper-latency-ms", type=float, default=2000)
+    parser.add_argument("--base-url", help="use a running server instead of starting one")
+    parser.add_argument("--in-process", action="store_true", help="call the app through httpx.ASGITransport")
+    parser.add_argument("--output", help="result file (default benchmarks/results/<scenario>-<commit>.json)")
+    args = parser.parse_args()
+    if args.in_process and args.scenario == "sse-idle":
+        parser.error("sse-idle needs a real server; drop --in-process")
+
+    if args.in_process:
+        os.environ["BENCH_WHISPER_LATENCY_MS"] = str(args.whisper_latency_ms)
+        os.environ["BENCH_GEMINI_LATENCY_MS"] = str(args.gemini_latency_ms)
+        os.environ["BENCH_LEARNERS"] = str(args.accounts)
+
+    server = None
+    if not args.base_url and not args.in_process:
+        server = start_server(args)
+    try:
+        result = asyncio.run(run(args, server.pid if server and args.workers == 1 else None))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{args.scenario}-{result['git_commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+
+    print(f"{result['scenario']}: {result['requests']} requests in {result['duration_seconds']}s "
+          f"({result['throughput_rps']} req/s)")
+    for label, stats in result["endpoints"].items():
+        print(f"  {label:42} n={stats['count']:<6} err={stats['errors']:<4} "
+              f"p50={stats['p50_ms']:.1f} p95={stats['p95_ms']:.1f} p99={stats['p99_ms']:.1f} ms")
+    for key, value in result["extra"].items():
+        print(f"  {key}: {value}")
+    print(f"written to {output}")
+
+
+if __name__ == "__main__":
+    main()
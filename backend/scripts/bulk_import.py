@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Imports a course's videos in one go instead of one admin upload at a time.
+
+    python scripts/bulk_import.py lectures/                 # every video file in the directory
+    python scripts/bulk_import.py course.csv --generator local
+    python scripts/bulk_import.py course.json --transcribe-workers 2 --llm-workers 4
+
+A manifest lists one video per row (CSV) or object (JSON, a list or {"videos": [...]}):
+
+    path,title,description,timestamps
+    week1/intro.mp4,Introduction,First lecture,"60;180;5:30"
+
+`path` is relative to the manifest; `title` defaults to the file name and
+`timestamps` (seconds or m:ss, separated by ";" or a JSON list) to one
+checkpoint every --every seconds of the video.
+
+Videos are ingested in parallel, with Whisper runs and question-generation
+calls bounded separately; with TRANSCRIPTION_BACKEND=auto, long clips that
+would wait for a Whisper worker are transcribed by Gemini instead. Files are
+recognised by their SHA-256: content that was already ingested (by an earlier
+run or an admin upload) is skipped, and the state file records finished and
+unfinished work, so an interrupted import is resumed by running the same
+command again. Run from backend/.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.models import Question, User, Video  # noqa: E402
+from app.services.ingest import get_video_duration, ingest_video  # noqa: E402
+from app.services.storage import content_sha256, storage  # noqa: E402
+from app.services.transcription import transcription_scheduler  # noqa: E402
+
+VIDEO_EXTENSIONS = {".mp4", ".m4v", ".mov", ".mkv", ".webm", ".avi"}
+STATE_FILE_NAME = ".bulk_import_state.json"
+DEFAULT_CHECKPOINT_INTERVAL = 300.0
+
+
+class ImportItem(NamedTuple):
+    path: str
+    title: str
+    description: Optional[str]
+    timestamps: Optional[List[float]]
+
+
+def parse_timestamp(value: str) -> float:
+    """Seconds from "90", "1:30" or "1:02:03"."""
+    seconds = 0.0
+    for part in value.strip().split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def parse_timestamps(value) -> Optional[List[float]]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return [float(value)]
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith("["):
+            value = json.loads(value)
+        else:
+            value = [part for part in value.replace(",", ";").split(";") if part.strip()]
+    return sorted(parse_timestamp(str(v)) if isinstance(v, str) else float(v) for v in value)
+
+
+def title_from_path(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0].replace("_", " ").replace("-", " ").strip()
+
+
+def load_manifest(path: str) -> List[ImportItem]:
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, newline="") as f:
+        if path.lower().endswith(".json"):
+            rows = json.load(f)
+            if isinstance(rows, dict):
+                rows = rows.get("videos", [])
+        else:
+            rows = list(csv.DictReader(f))
+    items = []
+    for number, row in enumerate(rows, start=1):
+        video_path = (row.get("path") or row.get("file") or "").strip()
+        if not video_path:
+            raise ValueError(f"{path}: entry {number} has no path")
+        video_path = os.path.join(base, video_path)
+        items.append(ImportItem(
+            path=video_path,
+            title=(row.get("title") or "").strip() or title_from_path(video_path),
+            description=(row.get("description") or "").strip() or None,
+            timestamps=parse_timestamps(row.get("timestamps")),
+        ))
+    return items
+
+
+def scan_directory(path: str) -> List[ImportItem]:
+    items = []
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in VIDEO_EXTENSIONS:
+                video_path = os.path.join(root, name)
+                items.append(ImportItem(video_path, title_from_path(name), None, None))
+    return sorted(items, key=lambda item: item.path)
+
+
+def checkpoints_every(duration: float, interval: float) -> List[float]:
+    """One checkpoint per `interval` seconds, none in the last half interval (the final quiz covers it)."""
+    timestamps = []
+    timestamp = interval
+    while timestamp < duration - interval / 2:
+        timestamps.append(timestamp)
+        timestamp += interval
+    return timestamps
+
+
+class ImportState:
+    """Progress kept in a JSON file, rewritten atomically after every change.
+
+    `files` caches hashes by path, size and mtime so a re-run does not hash
+    unchanged files again; `videos` maps content hashes to their import outcome.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.data = {"files": {}, "videos": {}}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.data.update(json.load(f))
+
+    def cached_hash(self, path: str, stat: os.stat_result) -> Optional[str]:
+        with self._lock:
+            entry = self.data["files"].get(path)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return entry["sha256"]
+        return None
+
+    def remember_hash(self, path: str, stat: os.stat_result, sha256: str) -> None:
+        self._update("files", path, {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha256})
+
+    def video(self, sha256: str) -> Optional[Dict]:
+        with self._lock:
+            return self.data["videos"].get(sha256)
+
+    def record_video(self, sha256: str, **record) -> None:
+        self._update("videos", sha256, record)
+
+    def _update(self, section: str, key: str, value: Dict) -> None:
+        with self._lock:
+            self.data[section][key] = value
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "w") as f:
+                json.dump(self.data, f, indent=1, sort_keys=True)
+            os.replace(temporary, self.path)
+
+
+class Progress:
+    """Counts outcomes and prints throughput and an ETA after each video."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.counts = {"imported": 0, "skipped": 0, "failed": 0}
+        self.media_seconds = 0.0
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def finish(self, outcome: str, title: str, media_seconds: float = 0.0, detail: str = "") -> None:
+        with self._lock:
+            self.counts[outcome] += 1
+            self.media_seconds += media_seconds
+            done = sum(self.counts.values())
+            elapsed = time.monotonic() - self.started
+            worked = self.counts["imported"] + self.counts["failed"]
+            rate = f"{worked / elapsed * 60:.1f} videos/min, {self.media_seconds / elapsed:.1f}x realtime" if worked else "-"
+            eta = format_duration(elapsed / done * (self.total - done)) if done < self.total else "0s"
+            print(f"[{done}/{self.total}] {outcome:<8} {title}{f' ({detail})' if detail else ''} | {rate} | ETA {eta}", flush=True)
+
+    def summary(self) -> str:
+        elapsed = time.monotonic() - self.started
+        counts = ", ".join(f"{count} {outcome}" for outcome, count in self.counts.items())
+        return f"{counts} in {format_duration(elapsed)}; {self.media_seconds / 3600:.2f} hours of video ingested"
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class Importer:
+    def __init__(self, args, state: ImportState, progress: Progress, uploader_id: int):
+        self.args = args
+        self.state = state
+        self.progress = progress
+        self.uploader_id = uploader_id
+        self.generation_slots = threading.Semaphore(args.llm_workers)
+        self._claimed = set()
+        self._lock = threading.Lock()
+
+    def file_hash(self, path: str) -> str:
+        stat = os.stat(path)
+        sha256 = self.state.cached_hash(path, stat)
+        if sha256 is None:
+            with open(path, "rb") as f:
+                sha256 = content_sha256(f)
+            self.state.remember_hash(path, stat, sha256)
+        return sha256
+
+    def run(self, item: ImportItem) -> None:
+        try:
+            sha256 = self.file_hash(item.path)
+        except OSError as e:
+            self.progress.finish("failed", item.title, detail=str(e))
+            return
+        with self._lock:
+            if sha256 in self._claimed:
+                self.progress.finish("skipped", item.title, detail="same file as another entry")
+                return
+            self._claimed.add(sha256)
+
+        db = SessionLocal()
+        try:
+            existing = (
+                db.query(Video)
+                .filter(Video.content_sha256 == sha256)
+                .order_by(Video.id.desc())
+                .first()
+            )
+            record = self.state.video(sha256)
+            if existing is not None and existing.processing_status == "ready":
+                self.state.record_video(sha256, path=item.path, video_id=existing.id, status="ready")
+                self.progress.finish("skipped", item.title, detail=f"already ingested as video {existing.id}")
+                return
+            resumable = existing is not None and (
+                existing.processing_status == "failed" or (record and record.get("video_id") == existing.id)
+            )
+            if existing is not None and not resumable:
+                self.progress.finish("skipped", item.title, detail=f"video {existing.id} is being ingested elsewhere")
+                return
+
+            if resumable:
+                # Unfinished (interrupted or failed) import: start its ingest over
+                video = existing
+                db.query(Question).filter(Question.video_id == video.id).delete(synchronize_session=False)
+                video.processing_status = "transcribing"
+                db.commit()
+            else:
+                video = self.create_video(db, item, sha256)
+            video_id, storage_key = video.id, video.storage_key
+            timestamps = item.timestamps
+            if timestamps is None:
+                with storage.local_path(storage_key) as video_path:
+                    timestamps = checkpoints_every(get_video_duration(video_path), self.args.every)
+        finally:
+            db.close()
+
+        self.state.record_video(sha256, path=item.path, video_id=video_id, status="ingesting")
+        ingest_video(
+            video_id, storage_key, timestamps, self.args.generator,
+            generation_slots=self.generation_slots,
+        )
+
+        db = SessionLocal()
+        try:
+            status, duration = db.query(Video.processing_status, Video.duration).filter(Video.id == video_id).one()
+        finally:
+            db.close()
+        self.state.record_video(sha256, path=item.path, video_id=video_id, status=status)
+        if status == "ready":
+            self.progress.finish("imported", item.title, duration or 0.0, detail=f"video {video_id}")
+        else:
+            self.progress.finish("failed", item.title, detail=f"video {video_id} ended {status}")
+
+    def create_video(self, db, item: ImportItem, sha256: str) -> Video:
+        storage_key = f"videos/{uuid.uuid4()}_{os.path.basename(item.path)}"
+        with open(item.path, "rb") as f:
+            storage.put(storage_key, f)
+        video = Video(
+            title=item.title,
+            description=item.description,
+            video_url=storage_key,
+            storage_key=storage_key,
+            content_sha256=sha256,
+            uploader_id=self.uploader_id,
+            is_published=False,
+            # Not "uploaded": an ingest worker would claim it too
+            processing_status="transcribing",
+            question_timestamps=item.timestamps,
+        )
+        db.add(video)
+        db.commit()
+        db.refresh(video)
+        return video
+
+
+def find_uploader(email: Optional[str]) -> int:
+    db = SessionLocal()
+    try:
+        query = db.query(User.id).filter(User.is_admin.is_(True))
+        if email:
+            query = query.filter(User.email == email)
+        uploader = query.order_by(User.id).first()
+    finally:
+        db.close()
+    if uploader is None:
+        who = f"admin user {email}" if email else "admin user"
+        raise SystemExit(f"No {who} found; create one with create_admin.py")
+    return uploader[0]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import videos into TubeTutor")
+    parser.add_argument("source", help="directory of video files, or a CSV/JSON manifest")
+    parser.add_argument("--state", help=f"state file (default: {STATE_FILE_NAME} next to the source)")
+    parser.add_argument("--uploader", help="admin email recorded as uploader (default: first admin)")
+    parser.add_argument("--generator", choices=["gemini", "local"], default=settings.question_generator)
+    parser.add_argument("--every", type=float, default=DEFAULT_CHECKPOINT_INTERVAL,
+                        help="checkpoint interval in seconds when an entry lists no timestamps")
+    parser.add_argument("--transcribe-workers", type=int, default=settings.whisper_workers,
+                        help="concurrent Whisper runs (each one keeps a CPU or GPU busy)")
+    parser.add_argument("--llm-workers", type=int, default=4, help="concurrent question-generation calls")
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.source):
+        items = scan_directory(args.source)
+        state_dir = args.source
+    else:
+        items = load_manifest(args.source)
+        state_dir = os.path.dirname(os.path.abspath(args.source))
+    state = ImportState(args.state or os.path.join(state_dir, STATE_FILE_NAME))
+    progress = Progress(len(items))
+    importer = Importer(args, state, progress, find_uploader(args.uploader))
+    # Before the first transcription, which starts the Whisper pool
+    transcription_scheduler.local.workers = args.transcribe_workers
+    print(f"Importing {len(items)} videos ({args.transcribe_workers} transcription, {args.llm_workers} LLM workers); state in {state.path}")
+
+    # Enough threads for both stages to stay busy; the Whisper pool and the semaphore do the bounding
+    with ThreadPoolExecutor(max_workers=args.transcribe_workers + args.llm_workers) as executor:
+        futures = {executor.submit(importer.run, item): item for item in items}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                progress.finish("failed", futures[future].title, detail=str(e))
+    print(progress.summary())
+    return 1 if progress.counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+End-to-end run of scripts/bulk_import.py on generated clips, with fake Whisper
+and Gemini (benchmarks/fakes.py) and a throwaway SQLite database and storage root:
+
+- a manifest with a duplicated file imports each distinct file once
+- running it again skips everything
+- an import interrupted mid-ingest is resumed without duplicating questions
+- a directory import skips content that is already in the catalog
+
+Clips are made with ffmpeg when it is installed, otherwise they are random
+bytes (the fake Whisper does not read them). Run from backend/.
+"""
+
+import csv
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORK_DIR = tempfile.mkdtemp(prefix="tubetutor-bulk-import-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'check.db')}"
+os.environ["LOCAL_STORAGE_ROOT"] = os.path.join(WORK_DIR, "uploads")
+os.environ.setdefault("GEMINI_API_KEY", "check")
+os.environ.setdefault("JWT_SECRET_KEY", "check")
+os.environ["TRANSCRIPTION_BACKEND"] = "whisper"
+
+from benchmarks.fakes import install_fakes  # noqa: E402
+
+install_fakes(whisper_latency_ms=100, gemini_latency_ms=20)
+
+from app.auth import get_password_hash  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import Question, User, Video  # noqa: E402
+from scripts import bulk_import  # noqa: E402
+
+TIMESTAMPS = "10;20"
+# Two checkpoints with their variants, plus the final quiz
+QUESTIONS_PER_VIDEO = 2 * (1 + settings.question_variants_per_checkpoint) + 1
+
+
+def make_clip(path: str, index: int) -> None:
+    if shutil.which("ffmpeg"):
+        subprocess.run([
+            "ffmpeg", "-v", "error", "-y",
+            "-f", "lavfi", "-i", "testsrc=duration=1:size=64x64:rate=5",
+            "-f", "lavfi", "-i", f"sine=frequency={220 + 40 * index}:duration=1",
+            "-shortest", path,
+        ], check=True)
+    else:
+        with open(path, "wb") as f:
+            f.write(os.urandom(4096))
+
+
+def write_manifest(path: str, files: list) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["path", "title", "description", "timestamps"])
+        for name in files:
+            writer.writerow([name, f"Lecture {name}", "Generated clip", TIMESTAMPS])
+
+
+def catalog() -> dict:
+    db = SessionLocal()
+    try:
+        videos = {v.id: v.processing_status for v in db.query(Video)}
+        questions = {
+            video_id: db.query(Question).filter(Question.video_id == video_id).count() for video_id in videos
+        }
+        return {"videos": videos, "questions": questions}
+    finally:
+        db.close()
+
+
+def expect(failures: list, condition: bool, message: str) -> None:
+    print(("ok   " if condition else "FAIL ") + message)
+    if not condition:
+        failures.append(message)
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(User(email="admin@check.local", username="admin", hashed_password=get_password_hash("check"), is_admin=True))
+    db.commit()
+    db.close()
+
+    course = os.path.join(WORK_DIR, "course")
+    os.makedirs(course)
+    for index in range(4):
+        make_clip(os.path.join(course, f"clip{index}.mp4"), index)
+    shutil.copy(os.path.join(course, "clip0.mp4"), os.path.join(course, "clip0-copy.mp4"))
+    manifest = os.path.join(course, "course.csv")
+    write_manifest(manifest, ["clip0.mp4", "clip1.mp4", "clip2.mp4", "clip3.mp4", "clip0-copy.mp4"])
+    failures = []
+
+    print("--- first import")
+    code = bulk_import.main([manifest, "--transcribe-workers", "2", "--llm-workers", "3"])
+    state = catalog()
+    expect(failures, code == 0, "first import exits 0")
+    expect(failures, len(state["videos"]) == 4, f"4 videos for 4 distinct files (got {len(state['videos'])})")
+    expect(failures, set(state["videos"].values()) == {"ready"}, "every video is ready")
+    expect(failures, set(state["questions"].values()) == {QUESTIONS_PER_VIDEO},
+           f"{QUESTIONS_PER_VIDEO} questions per video (got {sorted(set(state['questions'].values()))})")
+
+    print("--- second run")
+    code = bulk_import.main([manifest])
+    expect(failures, code == 0 and len(catalog()["videos"]) == 4, "re-running imports nothing new")
+
+    print("--- interrupted import")
+    interrupted = min(state["videos"])
+    db = SessionLocal()
+    video = db.get(Video, interrupted)
+    # As if the process died while generating questions; its earlier questions are still there
+    video.processing_status = "generating_questions"
+    db.commit()
+    db.close()
+    code = bulk_import.main([manifest])
+    state = catalog()
+    expect(failures, code == 0 and len(state["videos"]) == 4, "resuming reuses the unfinished video")
+    expect(failures, state["videos"][interrupted] == "ready", "the unfinished video is ready again")
+    expect(failures, state["questions"][interrupted] == QUESTIONS_PER_VIDEO, "its questions are not duplicated")
+
+    print("--- directory import")
+    folder = os.path.join(WORK_DIR, "folder")
+    os.makedirs(folder)
+    shutil.copy(os.path.join(course, "clip1.mp4"), os.path.join(folder, "known.mp4"))
+    make_clip(os.path.join(folder, "new_lecture.mp4"), 9)
+    code = bulk_import.main([folder, "--generator", "local"])
+    state = catalog()
+    expect(failures, code == 0 and len(state["videos"]) == 5, "a directory import adds only the new file")
+
+    print("OK" if not failures else f"{len(failures)} check(s) failed; files kept in {WORK_DIR}")
+    if not failures:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Fires concurrent duplicate requests carrying one Idempotency-Key at the API
+(in process, fake Whisper/Gemini, throwaway SQLite database) and checks that the
+work happened once:
+
+- duplicate wrong answers add one failed attempt, and every duplicate gets the same body
+- duplicate uploads create one video
+- reusing a key for a different answer is refused with 422
+- answers without a key are still counted every time
+
+Uses the in-process idempotency store, or Redis when REDIS_URL is set.
+Run from backend/: python scripts/check_idempotency.py [--duplicates 8]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORK_DIR = tempfile.mkdtemp(prefix="tubetutor-idempotency-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'check.db')}"
+os.environ["LOCAL_STORAGE_ROOT"] = os.path.join(WORK_DIR, "uploads")
+os.environ["INGEST_MODE"] = "inline"
+os.environ.setdefault("BENCH_LEARNERS", "2")
+os.environ.setdefault("BENCH_WHISPER_LATENCY_MS", "50")
+os.environ.setdefault("BENCH_GEMINI_LATENCY_MS", "50")
+
+import httpx  # noqa: E402
+from benchmarks.bench_app import app, ADMIN_EMAIL, LEARNER_EMAIL, VIDEO_TITLE  # noqa: E402
+from app.auth import create_access_token  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.models import Question, User, UserProgress, Video  # noqa: E402
+from app.services.idempotency import REPLAYED_HEADER  # noqa: E402
+
+
+def auth_headers(email: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def first_checkpoint() -> int:
+    db = SessionLocal()
+    try:
+        return (
+            db.query(Question.id)
+            .join(Video, Video.id == Question.video_id)
+            .filter(Video.title == VIDEO_TITLE, Question.variant_of_id.is_(None), Question.is_final_quiz.is_(False))
+            .order_by(Question.timestamp)
+            .first()[0]
+        )
+    finally:
+        db.close()
+
+
+def failed_attempts(email: str, question_id: int) -> int:
+    db = SessionLocal()
+    try:
+        progress = (
+            db.query(UserProgress)
+            .join(User, User.id == UserProgress.user_id)
+            .join(Question, Question.video_id == UserProgress.video_id)
+            .filter(User.email == email, Question.id == question_id)
+            .first()
+        )
+        return progress.failed_attempts.get(str(question_id), 0) if progress else 0
+    finally:
+        db.close()
+
+
+def count_videos(title: str) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(Video).filter(Video.title == title).count()
+    finally:
+        db.close()
+
+
+def check_duplicates(label: str, responses, failures: list) -> None:
+    statuses = [r.status_code for r in responses]
+    originals = [r for r in responses if REPLAYED_HEADER.lower() not in r.headers]
+    print(f"{label}: statuses {sorted(set(statuses))}, {len(originals)} original, {len(responses) - len(originals)} replayed")
+    if any(code != 200 for code in statuses):
+        failures.append(f"{label}: expected only 200s, got {statuses}")
+    if len(originals) != 1:
+        failures.append(f"{label}: expected one original response, got {len(originals)}")
+    if len({r.content for r in responses}) != 1:
+        failures.append(f"{label}: duplicates got different bodies")
+
+
+async def run(duplicates: int) -> list:
+    failures = []
+    question_id = first_checkpoint()
+    learner_email = LEARNER_EMAIL.format(0)
+    learner = auth_headers(learner_email)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://check", timeout=60) as client:
+        url = f"/questions/{question_id}/answer"
+        wrong = {"answer": "Option B", "current_timestamp": 61.0}
+
+        headers = {**learner, "Idempotency-Key": str(uuid.uuid4())}
+        responses = await asyncio.gather(*(client.post(url, json=wrong, headers=headers) for _ in range(duplicates)))
+        check_duplicates(f"{duplicates} duplicate answers", responses, failures)
+        if failed_attempts(learner_email, question_id) != 1:
+            failures.append(f"answers: expected 1 failed attempt, got {failed_attempts(learner_email, question_id)}")
+
+        mismatch = await client.post(url, json={**wrong, "answer": "Option C"}, headers=headers)
+        print(f"same key, different answer: {mismatch.status_code}")
+        if mismatch.status_code != 422:
+            failures.append(f"key reuse: expected 422, got {mismatch.status_code}")
+
+        for _ in range(2):
+            await client.post(url, json=wrong, headers=learner)
+        if failed_attempts(learner_email, question_id) != 3:
+            failures.append(f"answers without a key: expected 3 failed attempts, got {failed_attempts(learner_email, question_id)}")
+
+        title = f"Idempotency check {uuid.uuid4()}"
+        headers = {**auth_headers(ADMIN_EMAIL), "Idempotency-Key": str(uuid.uuid4())}
+
+        async def upload():
+            return await client.post(
+                "/videos/upload",
+                data={"title": title, "question_timestamps": "[30]"},
+                files={"video_file": ("lecture.mp4", b"\x00" * 65536, "video/mp4")},
+                headers=headers,
+            )
+
+        responses = await asyncio.gather(*(upload() for _ in range(duplicates)))
+        check_duplicates(f"{duplicates} duplicate uploads", responses, failures)
+        if count_videos(title) != 1:
+            failures.append(f"uploads: expected 1 video, got {count_videos(title)}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duplicates", type=int, default=8)
+    args = parser.parse_args()
+    failures = asyncio.run(run(args.duplicates))
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print("OK" if not failures else f"{len(failures)} check(s) failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Fails if importing the API entry point is slow or pulls in ingest-only libraries.
+
+Each run imports app.main in a fresh interpreter; the fastest of --runs is
+compared with --budget-seconds so a cold disk cache does not cause failures.
+
+Run from backend/: python scripts/check_import_budget.py [--budget-seconds 2]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINT = "app.main"
+# Only the ingest worker may load these
+FORBIDDEN_MODULES = ("whisper", "torch", "google.genai")
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {entry_point}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure() -> dict:
+    env = dict(os.environ)
+    # Settings only have to load; nothing is connected at import time
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("GEMINI_API_KEY", "")
+    env.setdefault("JWT_SECRET_KEY", "import-budget")
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(entry_point=ENTRY_POINT)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-seconds", type=float, default=2.0)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.runs)]
+    fastest = min(run["seconds"] for run in runs)
+    loaded = set(runs[0]["modules"])
+    forbidden = [
+        name for name in FORBIDDEN_MODULES
+        if name in loaded or any(module.startswith(name + ".") for module in loaded)
+    ]
+
+    print(f"import {ENTRY_POINT}: {fastest:.2f}s (budget {args.budget_seconds:.2f}s), {len(loaded)} modules")
+    failed = False
+    if fastest > args.budget_seconds:
+        print(f"FAIL: import time over budget by {fastest - args.budget_seconds:.2f}s")
+        failed = True
+    if forbidden:
+        print(f"FAIL: {ENTRY_POINT} imports {', '.join(forbidden)}; these belong in the ingest worker")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Checks the leaderboards (in process, fake Whisper/Gemini, throwaway SQLite database):
+
+- random completions: top-K pages and rank lookups match a brute-force sort, and
+  a repeated completion of the same video is not counted twice
+- learners who complete a video through the API are ranked by first-try
+  accuracy and by completion time, and "me" returns their own rank
+- after the boards are lost (restart, Redis flush) the API rebuilds them from
+  the database with the same ranking
+- a completion recorded while a rebuild is in progress is on the rebuilt boards
+  and counted once in the learner's totals
+- deleting a video takes it off the boards at once, without a rebuild: its
+  boards go and the global boards no longer count it; a rebuild agrees
+
+Uses the in-process boards, or Redis when REDIS_URL is set (its leaderboard:*
+keys are deleted). Run from backend/: python scripts/check_leaderboard.py
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORK_DIR = tempfile.mkdtemp(prefix="tubetutor-leaderboard-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'check.db')}"
+os.environ["LOCAL_STORAGE_ROOT"] = os.path.join(WORK_DIR, "uploads")
+os.environ["BENCH_LEARNERS"] = "5"
+os.environ.setdefault("BENCH_WHISPER_LATENCY_MS", "0")
+os.environ.setdefault("BENCH_GEMINI_LATENCY_MS", "0")
+
+import httpx  # noqa: E402
+from benchmarks.bench_app import app, ADMIN_EMAIL, LEARNER_EMAIL, VIDEO_TITLE  # noqa: E402
+from app.auth import create_access_token  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.models import Question, User, UserProgress, Video  # noqa: E402
+from app.services import leaderboard as leaderboard_module  # noqa: E402
+from app.services.grading import update_completion  # noqa: E402
+from app.services.leaderboard import (  # noqa: E402
+    GLOBAL_METRICS, Completion, InProcessLeaderboard, RedisLeaderboard, completion_for, global_board, leaderboard,
+    rebuild_leaderboards, record_completion, video_board, video_accuracy_score,
+)
+from app.services.variants import group_variant_pools, select_variant  # noqa: E402
+
+LEARNERS = 4
+# Completes the video while a rebuild is in progress
+LATE_LEARNER = 4
+
+
+def expect(failures: list, condition: bool, message: str) -> None:
+    print(("ok   " if condition else "FAIL ") + message)
+    if not condition:
+        failures.append(message)
+
+
+def check_store(failures: list) -> None:
+    rng = random.Random(7)
+    store = InProcessLeaderboard()
+    completions = {}
+    for _ in range(3000):
+        completion = Completion(rng.randrange(500), rng.randrange(5), rng.randint(0, 8), 8, rng.randrange(3600))
+        completions.setdefault((completion.user_id, completion.video_id), completion)
+        store.record_completion(completion)
+    board = video_board(2, "accuracy")
+    expected = sorted(
+        ((video_accuracy_score(c), c.user_id) for (user_id, video_id), c in completions.items() if video_id == 2),
+        key=lambda item: (-item[0], item[1]),
+    )
+    top = store.top(board, 20, 10)
+    expect(failures, [user_id for user_id, _ in top] == [user_id for _, user_id in expected[10:30]],
+           "a top-K page matches a brute-force sort")
+    ranks_match = all(store.rank(board, user_id)[0] == position for position, (_, user_id) in enumerate(expected))
+    expect(failures, ranks_match and store.size(board) == len(expected), f"rank lookups match for {len(expected)} learners")
+    per_user = sum(1 for user_id, _ in completions if user_id == 0)
+    expect(failures, store.rank(global_board("completions"), 0)[1] == per_user,
+           "repeated completions of a video are counted once")
+
+    removed = store.remove_video(2, [c for (_, video_id), c in completions.items() if video_id == 2])
+    expected_store = InProcessLeaderboard()
+    for completion in completions.values():
+        if completion.video_id != 2:
+            expected_store.record_completion(completion)
+    same = all(store.top(global_board(metric), 1000) == expected_store.top(global_board(metric), 1000) for metric in GLOBAL_METRICS)
+    expect(failures, same and store.size(board) == 0 and removed == len(expected),
+           f"removing a video drops its board and its {removed} completions from the global boards")
+
+
+def learner_headers(index: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': LEARNER_EMAIL.format(index)})}"}
+
+
+def batch_for(db, video_id: int, user_id: int, misses: int) -> list:
+    """Answers for every checkpoint: the first `misses` are answered wrong once first."""
+    pools = group_variant_pools(db.query(Question).filter(Question.video_id == video_id))
+    answers = []
+    for position, (checkpoint_id, pool) in enumerate(sorted(pools.items(), key=lambda item: item[1][0].timestamp)):
+        attempt = 0
+        if position < misses:
+            answers.append({"question_id": checkpoint_id, "answer": "Option B", "current_timestamp": pool[0].timestamp})
+            attempt = 1
+        served = select_variant(pool, user_id, checkpoint_id, attempt)
+        answers.append({"question_id": checkpoint_id, "answer": served.correct_answer, "current_timestamp": pool[0].timestamp})
+    return answers
+
+
+def forget_boards() -> None:
+    """As after an API restart (in-process boards) or a Redis flush."""
+    if isinstance(leaderboard, RedisLeaderboard):
+        keys = list(leaderboard._client.scan_iter(match="leaderboard:*"))
+        if keys:
+            leaderboard._client.delete(*keys)
+    else:
+        leaderboard.__init__()
+
+
+async def check_api(failures: list) -> None:
+    forget_boards()
+    db = SessionLocal()
+    video_id = db.query(Video.id).filter(Video.title == VIDEO_TITLE).scalar()
+    users = {
+        index: db.query(User.id).filter(User.email == LEARNER_EMAIL.format(index)).scalar()
+        for index in range(LEARNERS)
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://check", timeout=60) as client:
+        # Builds the (empty) boards, so the ranking below comes from graded answers alone
+        await client.get("/leaderboards/global", headers=learner_headers(0))
+        for index in range(LEARNERS):
+            # Opening the video starts the clock; learner 0 is the most accurate and the slowest
+            await client.get(f"/progress/{video_id}", headers=learner_headers(index))
+            progress = db.query(UserProgress).filter(UserProgress.user_id == users[index], UserProgress.video_id == video_id).one()
+            progress.started_at = datetime.utcnow() - timedelta(minutes=10 * (LEARNERS - index))
+            db.commit()
+            batch = batch_for(db, video_id, users[index], misses=index)
+            response = await client.post(f"/videos/{video_id}/answers:batch", json={"answers": batch}, headers=learner_headers(index))
+            expect(failures, response.status_code == 200 and response.json()["progress"]["is_completed"],
+                   f"learner {index} completes the video with {index} miss(es)")
+
+        async def ranking(path: str) -> list:
+            response = await client.get(path, headers=learner_headers(0))
+            return [(entry["user_id"], entry["value"]) for entry in response.json()["entries"]]
+
+        paths = {
+            "accuracy": f"/leaderboards/videos/{video_id}",
+            "time": f"/leaderboards/videos/{video_id}?metric=time",
+            "global": "/leaderboards/global",
+        }
+        live = {name: await ranking(path) for name, path in paths.items()}
+        by_accuracy = [users[index] for index in range(LEARNERS)]
+        expect(failures, [user_id for user_id, _ in live["accuracy"]] == by_accuracy,
+               f"accuracy board ranks fewer misses first ({[value for _, value in live['accuracy']]})")
+        expect(failures, [user_id for user_id, _ in live["time"]] == by_accuracy[::-1],
+               f"time board ranks faster completions first ({[value for _, value in live['time']]})")
+        expect(failures, [user_id for user_id, _ in live["global"]] == by_accuracy, "global board ranks by accuracy")
+
+        response = await client.get(f"/leaderboards/videos/{video_id}/me?metric=time", headers=learner_headers(1))
+        me = response.json()
+        expect(failures, me["entry"]["rank"] == LEARNERS - 1 and me["total"] == LEARNERS, "my rank on the time board")
+        response = await client.get("/leaderboards/global/me?metric=accuracy", headers=learner_headers(2))
+        expect(failures, response.json()["entry"]["rank"] == 3, "my rank on the global board")
+        response = await client.get(f"/leaderboards/videos/{video_id}?metric=speed", headers=learner_headers(0))
+        expect(failures, response.status_code == 422, "unknown metrics are refused")
+
+        forget_boards()
+        rebuilt = {name: await ranking(path) for name, path in paths.items()}
+        expect(failures, rebuilt == live, "boards rebuilt from the database match the live ones")
+
+        check_rebuild_race(failures, db, video_id, users)
+
+        admin = {"Authorization": f"Bearer {create_access_token({'sub': ADMIN_EMAIL})}"}
+        response = await client.delete(f"/videos/{video_id}", headers=admin)
+        expect(failures, response.status_code == 202 and leaderboard.size(video_board(video_id, "accuracy")) == 0
+               and leaderboard.size(global_board("completions")) == 0,
+               "deleting the video takes it off the video and global boards")
+        rebuild_leaderboards(db)
+        expect(failures, leaderboard.size(video_board(video_id, "accuracy")) == 0 and leaderboard.size(global_board("completions")) == 0,
+               "a rebuild leaves out the deleted video")
+    db.close()
+
+
+def check_rebuild_race(failures: list, db, video_id: int, users: dict) -> None:
+    """An answer completes the video after the rebuild read its snapshot and before
+    the snapshot replaced the boards, as a concurrent request would."""
+    late_user = db.query(User.id).filter(User.email == LEARNER_EMAIL.format(LATE_LEARNER)).scalar()
+    build_snapshot = leaderboard_module.build_snapshot
+
+    def snapshot_then_complete(session):
+        snapshot = build_snapshot(session)
+        progress = UserProgress(user_id=late_user, video_id=video_id, started_at=datetime.utcnow() - timedelta(minutes=1))
+        question_ids = [qid for (qid,) in db.query(Question.id).filter(Question.video_id == video_id, Question.variant_of_id.is_(None))]
+        progress.completed_questions = question_ids
+        progress.failed_attempts = {}
+        update_completion(progress, question_ids)
+        db.add(progress)
+        db.commit()
+        record_completion(completion_for(progress, question_ids))
+        return snapshot
+
+    leaderboard_module.build_snapshot = snapshot_then_complete
+    try:
+        rebuild_leaderboards(db)
+    finally:
+        leaderboard_module.build_snapshot = build_snapshot
+    on_board = leaderboard.rank(video_board(video_id, "accuracy"), late_user)
+    completions = leaderboard.rank(global_board("completions"), late_user)
+    expect(failures, on_board is not None and completions is not None and completions[1] == 1,
+           "a completion recorded during a rebuild is on the rebuilt boards, counted once")
+    expect(failures, leaderboard.size(video_board(video_id, "accuracy")) == LEARNERS + 1,
+           "the learners ranked before the rebuild are still on the board")
+
+
+def main():
+    failures = []
+    check_store(failures)
+    asyncio.run(check_api(failures))
+    print("OK" if not failures else f"{len(failures)} check(s) failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Checks video deletion and storage garbage collection (fake Whisper/Gemini,
+throwaway SQLite database and local storage):
+
+- DELETE /videos/{id} answers 202 and the video is gone from the API at once:
+  its questions, answers, batches and progress are 404s that write nothing and
+  spend no LLM budget, while its rows and files stay in place for the purge
+- the purge removes questions, progress, stats, transcript rows, the upload and
+  the preview sprites in batches, and reports its throughput
+- collection deletes files no video points at once past the grace period, keeps
+  newer ones and referenced ones, changes nothing in a dry run, and reports
+  videos whose upload is missing
+
+Run from backend/: python scripts/check_lifecycle.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORK_DIR = tempfile.mkdtemp(prefix="tubetutor-lifecycle-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'check.db')}"
+os.environ["LOCAL_STORAGE_ROOT"] = os.path.join(WORK_DIR, "uploads")
+os.environ["STORAGE_BACKEND"] = "local"
+# The purge is run by hand below, as the ingest worker would
+os.environ["INGEST_MODE"] = "worker"
+os.environ["BENCH_LEARNERS"] = "250"
+os.environ.setdefault("BENCH_WHISPER_LATENCY_MS", "0")
+os.environ.setdefault("BENCH_GEMINI_LATENCY_MS", "0")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import func  # noqa: E402
+from benchmarks.bench_app import app, ADMIN_EMAIL, LEARNER_EMAIL, PROCESSING_VIDEO_TITLE, VIDEO_TITLE  # noqa: E402
+from app.auth import create_access_token  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.models import (  # noqa: E402
+    Question, QuestionStats, TranscriptChunk, TranscriptSegment, User, UserProgress, Video, VideoStats,
+)
+from app.services.analytics import initialize_stats  # noqa: E402
+from app.services.lifecycle import collect_orphans, purge_deleted_videos  # noqa: E402
+from app.services.rate_limit import rate_limiter  # noqa: E402
+
+BATCH_SIZE = 100
+DAY = 86400
+
+
+def expect(failures: list, condition: bool, message: str) -> None:
+    print(("ok   " if condition else "FAIL ") + message)
+    if not condition:
+        failures.append(message)
+
+
+def write_file(key: str, size: int, age: float = 0) -> str:
+    path = os.path.join(settings.local_storage_root, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    modified = time.time() - age
+    os.utime(path, (modified, modified))
+    return path
+
+
+def answer_state(db, video_id: int) -> tuple:
+    """Everything an answer would write: attempt counters and the learners' progress."""
+    attempts = db.query(func.coalesce(func.sum(QuestionStats.attempts), 0)).filter(QuestionStats.video_id == video_id).scalar()
+    progress = db.query(UserProgress.id, UserProgress.failed_attempts, UserProgress.current_timestamp).filter(
+        UserProgress.video_id == video_id
+    ).order_by(UserProgress.id).all()
+    return attempts, [tuple(row) for row in progress]
+
+
+def child_rows(db, video_id: int) -> int:
+    return sum(
+        db.query(model).filter(model.video_id == video_id).count()
+        for model in (Question, QuestionStats, UserProgress, TranscriptChunk, TranscriptSegment, VideoStats)
+    )
+
+
+def seed_video(db) -> tuple:
+    """Progress for every learner, analytics counters, an upload and two sprite sheets."""
+    video = db.query(Video).filter(Video.title == VIDEO_TITLE).one()
+    learners = [user_id for (user_id,) in db.query(User.id).filter(User.is_admin.is_(False))]
+    db.add_all([UserProgress(user_id=user_id, video_id=video.id, current_timestamp=30.0) for user_id in learners])
+    initialize_stats(db, video.id)
+    sprites = [f"storyboards/{video.id}/v1/sprite-00{i}.jpg" for i in (1, 2)]
+    video.storyboard = {"version": "v1", "sprites": sprites}
+    db.commit()
+    # Older than the grace period, so only the purge may delete them
+    files = [write_file(key, 4096, age=2 * DAY) for key in ["videos/benchmark.mp4"] + sprites]
+    return video.id, files
+
+
+def main():
+    failures = []
+    client = TestClient(app)
+    admin = {"Authorization": f"Bearer {create_access_token({'sub': ADMIN_EMAIL})}"}
+    learner = {"Authorization": f"Bearer {create_access_token({'sub': LEARNER_EMAIL.format(0)})}"}
+
+    db = SessionLocal()
+    video_id, files = seed_video(db)
+    rows_before = child_rows(db, video_id)
+    question_id = db.query(Question.id).filter(Question.video_id == video_id, Question.variant_of_id.is_(None)).first()[0]
+    expect(failures, client.get(f"/videos/{video_id}/session", headers=learner).status_code == 200
+           and client.get(f"/videos/{video_id}/questions").status_code == 200
+           and client.get(f"/progress/{video_id}", headers=learner).status_code == 200,
+           "the video, its questions and progress are served before deletion")
+
+    response = client.delete(f"/videos/{video_id}", headers=admin)
+    expect(failures, response.status_code == 202 and response.json()["status"] == "deleting", "DELETE answers 202")
+    hidden = (
+        client.get(f"/videos/{video_id}").status_code == 404
+        and client.get(f"/videos/{video_id}/session", headers=learner).status_code == 404
+        and all(video["id"] != video_id for video in client.get("/videos/").json())
+    )
+    expect(failures, hidden, "the deleted video is gone from the catalog, detail and session endpoints")
+    expect(failures, client.delete(f"/videos/{video_id}", headers=admin).status_code == 404, "deleting it again is a 404")
+    db.expire_all()
+    before = answer_state(db, video_id)
+    llm_spent = []
+    acquire = rate_limiter.acquire
+    rate_limiter.acquire = lambda key, *args: (llm_spent.append(key) if key.startswith("llm:") else None) or acquire(key, *args)
+    answer = {"question_id": question_id, "answer": "a free-text answer for Gemini", "current_timestamp": 10.0}
+    statuses = {
+        "questions": client.get(f"/videos/{video_id}/questions").status_code,
+        "answer": client.post(f"/questions/{question_id}/answer", json=answer, headers=learner).status_code,
+        "batch": client.post(f"/videos/{video_id}/answers:batch", json={"answers": [answer]}, headers=learner).status_code,
+        "progress": client.get(f"/progress/{video_id}", headers=learner).status_code,
+        "progress update": client.put(f"/progress/{video_id}", json={"current_timestamp": 99.0}, headers=learner).status_code,
+    }
+    expect(failures, all(code == 404 for code in statuses.values()),
+           f"questions, answers, batches and progress of the deleted video are 404s {statuses}")
+    db.expire_all()
+    rate_limiter.acquire = acquire
+    expect(failures, answer_state(db, video_id) == before and not llm_spent,
+           "they write no progress or counters and spend no LLM budget")
+    db.expire_all()
+    expect(failures, child_rows(db, video_id) == rows_before and all(os.path.exists(path) for path in files),
+           f"{rows_before} rows and {len(files)} files are left for the purge")
+
+    # Files no video points at: a crashed upload past the grace period, one still in flight
+    stale = write_file("videos/crashed-upload.mp4", 8192, age=2 * DAY)
+    fresh = write_file("videos/in-flight.mp4", 8192)
+    unrelated = write_file("imports/manifest.csv", 10, age=2 * DAY)
+
+    reports = purge_deleted_videos(batch_size=BATCH_SIZE)
+    db.expire_all()
+    purged = reports[0] if len(reports) == 1 else None
+    expect(failures, bool(purged) and sum(purged.rows.values()) == rows_before + 1 and purged.files == len(files),
+           f"the purge reports {rows_before + 1} rows and {len(files)} files")
+    expect(failures, child_rows(db, video_id) == 0 and db.query(Video).filter(Video.id == video_id).count() == 0,
+           "no rows of the video remain")
+    expect(failures, not any(os.path.exists(path) for path in files), "its upload and sprites are deleted")
+    if purged:
+        print(f"     {purged.rows_per_second:.0f} rows/s in batches of {BATCH_SIZE}")
+    expect(failures, purge_deleted_videos() == [], "a second sweep has nothing to purge")
+
+    report = collect_orphans(dry_run=True)
+    expect(failures, report.orphans == 1 and report.deleted == 0 and os.path.exists(stale),
+           "a dry run reports the stale orphan and deletes nothing")
+    report = collect_orphans()
+    expect(failures, report.deleted == 1 and report.bytes_freed == 8192 and not os.path.exists(stale),
+           "the stale orphan is collected")
+    expect(failures, os.path.exists(fresh) and os.path.exists(unrelated),
+           "files within the grace period or outside the media prefixes are kept")
+    processing_id = db.query(Video.id).filter(Video.title == PROCESSING_VIDEO_TITLE).scalar()
+    expect(failures, report.missing == [processing_id], "a video whose upload is missing is reported")
+    db.close()
+
+    print("OK" if not failures else f"{len(failures)} check(s) failed; files kept in {WORK_DIR}")
+    if not failures:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
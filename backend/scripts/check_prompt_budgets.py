@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Builds every Gemini operation's prompt from an oversized, filler-heavy transcript
+(a stand-in client captures the prompts; nothing is sent) and checks:
+
+- the transcript part stays within the operation's PROMPT_BUDGET_* tokens, and
+  the whole prompt within that plus TEMPLATE_TOKENS for the fixed instructions
+- trimming keeps whole sentences, or whole segments where Whisper left no
+  punctuation, from the end the operation keeps (the latest material for
+  questions, the most relevant first for grading and summaries)
+- phrases Whisper repeated in a loop and repeated sentences appear once
+- a single segment longer than the budget is cut on a word boundary
+
+Run from backend/: python scripts/check_prompt_budgets.py
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("GEMINI_API_KEY", "check")
+os.environ.setdefault("JWT_SECRET_KEY", "check")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.services.gemini_service import GeminiService  # noqa: E402
+from app.services.prompt_builder import (  # noqa: E402
+    compact_context, dedupe_filler, estimate_tokens, prompt_budgets, split_boundaries,
+)
+
+# Upper bound on each prompt's instructions, question text and JSON schema
+TEMPLATE_TOKENS = 250
+SEGMENTS = 2000
+FILLER = "you know, you know, you know,"
+
+RESPONSES = {
+    "generate_question": {"question_text": "Q?", "options": ["a", "b", "c", "d"], "correct_answer": "a", "explanation": "e"},
+    "generate_final_quiz": {"question_text": "Q?", "options": ["a", "b", "c", "d"], "correct_answer": "a", "explanation": "e"},
+    "grade_answer": {"correct": True, "explanation": "e", "hint": ""},
+}
+
+
+def filler_transcript() -> str:
+    """Whisper-like segments, one per line: filler loops, segments repeated verbatim,
+    and every fourth segment without closing punctuation."""
+    segments = []
+    for i in range(SEGMENTS):
+        if i % 4 == 3:
+            segments.append(f"and so point {i} carries on without a full stop")
+        else:
+            segments.append(f"So {FILLER} point {i} explains step {i} of the method. It matters for part {i}.")
+        if i % 5 == 0:
+            segments.append(segments[-1])
+    return "\n".join(segments)
+
+
+class CapturingClient:
+    """Stands in for genai.Client: records the prompt and returns a canned response."""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.prompts = []
+        self.models = self
+
+    def generate_content(self, model, contents, config=None):
+        self.prompts.append(contents[0])
+        body = RESPONSES.get(self.operation)
+        text = json.dumps(body) if body is not None else "A short summary."
+        return type("Response", (), {"text": text, "usage_metadata": None})()
+
+
+def build_prompt(operation: str, transcript: str) -> str:
+    client = CapturingClient(operation)
+    GeminiService._get_client_or_fallback = staticmethod(lambda: client)
+    GeminiService._request_config = staticmethod(lambda timeout, json_output=True: None)
+    if operation in ("generate_question", "generate_final_quiz"):
+        GeminiService.generate_question(transcript, 600.0, "mcq", final_quiz=operation == "generate_final_quiz")
+    elif operation == "grade_answer":
+        GeminiService.grade_answer("What does point 3 explain?", "Step three", "Step 3 of the method", transcript)
+    else:
+        GeminiService.generate_summary(transcript, "What does point 3 explain?")
+    return client.prompts[0]
+
+
+def pieces(text: str) -> list:
+    return [text[start:end] for start, end in split_boundaries(text)]
+
+
+def expect(failures: list, condition: bool, message: str) -> None:
+    print(("ok   " if condition else "FAIL ") + message)
+    if not condition:
+        failures.append(message)
+
+
+def main():
+    failures = []
+    transcript = filler_transcript()
+    deduped = dedupe_filler(transcript)
+    source = pieces(deduped)
+    expect(failures, FILLER not in deduped and "know, you know" not in deduped,
+           "repeated filler phrases are collapsed to one")
+    expect(failures, all(a != b for a, b in zip(source, source[1:])), "repeated sentences and segments appear once")
+    print(f"     transcript: {estimate_tokens(transcript)} tokens, {estimate_tokens(deduped)} after deduping")
+
+    keeps = {"generate_question": "tail", "generate_final_quiz": "tail", "grade_answer": "head", "generate_summary": "head"}
+    for operation, budget in prompt_budgets().items():
+        prompt = build_prompt(operation, transcript)
+        tokens = estimate_tokens(prompt)
+        limit = budget + TEMPLATE_TOKENS
+        context = compact_context(transcript, operation, keep=keeps[operation])
+        kept = pieces(context)
+        expect(failures, tokens <= limit, f"{operation}: prompt is {tokens} tokens (at most {limit})")
+        expect(failures, context in prompt and 0 < estimate_tokens(context) <= budget,
+               f"{operation}: transcript part is {estimate_tokens(context)} of {budget} budget tokens")
+        end = source[-len(kept):] if keeps[operation] == "tail" else source[:len(kept)]
+        expect(failures, bool(kept) and kept == end,
+               f"{operation}: {len(kept)} whole sentences/segments from the {keeps[operation]} of the transcript")
+        expect(failures, FILLER not in prompt, f"{operation}: no filler loops in the prompt")
+
+    # One unpunctuated run longer than any budget is cut on a word boundary
+    words = [f"word{i}" for i in range(20000)]
+    context = compact_context(" ".join(words), "grade_answer", keep="head")
+    expect(failures, estimate_tokens(context) <= prompt_budgets()["grade_answer"] and context.split() == words[:len(context.split())],
+           f"an oversized segment is cut on a word boundary ({len(context.split())} words)")
+
+    print("OK" if not failures else f"{len(failures)} check(s) failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
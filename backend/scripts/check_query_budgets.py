@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Runs every endpoint in QUERY_BUDGETS under assert_max_queries (in process, fake
+Whisper/Gemini, throwaway SQLite database), on its worst paths:
+
+- cold caches: the catalog entry and the checkpoint index are loaded from the database
+- a learner's first visit, where the progress row does not exist yet
+- answers for a video without analytics counter rows (ingested before analytics)
+- the answer that completes the video while the leaderboards are not built yet
+- a batch that answers every checkpoint of the video at once, likewise
+
+A lazy load or a per-row query shows up as a FAIL with the statements executed.
+Run from backend/: python scripts/check_query_budgets.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORK_DIR = tempfile.mkdtemp(prefix="tubetutor-queries-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'check.db')}"
+os.environ["LOCAL_STORAGE_ROOT"] = os.path.join(WORK_DIR, "uploads")
+# Deletion purges in the worker; the budget covers the request alone
+os.environ["INGEST_MODE"] = "worker"
+os.environ["BENCH_LEARNERS"] = "5"
+os.environ.setdefault("BENCH_WHISPER_LATENCY_MS", "0")
+os.environ.setdefault("BENCH_GEMINI_LATENCY_MS", "0")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from benchmarks.bench_app import app, ADMIN_EMAIL, LEARNER_EMAIL, VIDEO_TITLE  # noqa: E402
+from app.auth import create_access_token  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.models import Question, QuestionStats, User, Video, VideoStats  # noqa: E402
+from app.services.catalog_cache import catalog_cache  # noqa: E402
+from app.services.leaderboard import leaderboard  # noqa: E402
+from app.services.retrieval import index_cache  # noqa: E402
+from app.services.variants import group_variant_pools, select_variant  # noqa: E402
+from app.utils.query_budget import QUERY_BUDGETS, assert_max_queries  # noqa: E402
+
+
+def headers(email: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def cold_caches(video_id: int) -> None:
+    catalog_cache.invalidate(video_id)
+    index_cache.invalidate(video_id)
+
+
+def drop_stats(video_id: int) -> None:
+    """As for a video ingested before the analytics counters existed."""
+    db = SessionLocal()
+    db.query(QuestionStats).filter(QuestionStats.video_id == video_id).delete(synchronize_session=False)
+    db.query(VideoStats).filter(VideoStats.video_id == video_id).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+def answers(video_id: int, email: str, misses: int = 0) -> list:
+    """Answers to every checkpoint in order, for the variant `email` is served: the
+    first `misses` checkpoints are answered wrong once first."""
+    db = SessionLocal()
+    user_id = db.query(User.id).filter(User.email == email).scalar()
+    pools = group_variant_pools(db.query(Question).filter(Question.video_id == video_id))
+    db.close()
+    answers = []
+    for position, (checkpoint_id, pool) in enumerate(sorted(pools.items(), key=lambda item: item[1][0].timestamp)):
+        body = {"question_id": checkpoint_id, "current_timestamp": pool[0].timestamp}
+        if position < misses:
+            answers.append({**body, "answer": "Option B"})
+        served = select_variant(pool, user_id, checkpoint_id, 1 if position < misses else 0)
+        answers.append({**body, "answer": served.correct_answer})
+    return answers
+
+
+def completed_learners(video_id: int) -> int:
+    db = SessionLocal()
+    completed = db.query(VideoStats.learners_completed).filter(VideoStats.video_id == video_id).scalar()
+    db.close()
+    return completed or 0
+
+
+def main():
+    failures = []
+    client = TestClient(app)
+    db = SessionLocal()
+    video_id = db.query(Video.id).filter(Video.title == VIDEO_TITLE).scalar()
+    db.close()
+    admin = headers(ADMIN_EMAIL)
+    learners = [headers(LEARNER_EMAIL.format(index)) for index in range(5)]
+
+    def check(label: str, endpoint: str, method: str, path: str, expected: int = 200, **kwargs) -> None:
+        try:
+            with assert_max_queries(QUERY_BUDGETS[endpoint]) as counter:
+                response = client.request(method, path, **kwargs)
+        except AssertionError as e:
+            print(f"FAIL {endpoint} ({label}): {e}")
+            failures.append(label)
+            return
+        ok = response.status_code == expected
+        print(f"{'ok  ' if ok else 'FAIL'} {endpoint} ({label}): {counter.count} of {QUERY_BUDGETS[endpoint]} queries"
+              + ("" if ok else f", status {response.status_code}"))
+        if not ok:
+            failures.append(label)
+
+    cold_caches(video_id)
+    check("catalog", "GET /videos/", "GET", "/videos/")
+    check("detail", "GET /videos/{video_id}", "GET", f"/videos/{video_id}")
+    check("questions", "GET /videos/{video_id}/questions", "GET", f"/videos/{video_id}/questions")
+    check("cold cache, first visit", "GET /videos/{video_id}/session", "GET", f"/videos/{video_id}/session", headers=learners[0])
+    check("warm cache", "GET /videos/{video_id}/session", "GET", f"/videos/{video_id}/session", headers=learners[0])
+    cold_caches(video_id)
+    check("cold cache", "GET /videos/{video_id}/checkpoints", "GET", f"/videos/{video_id}/checkpoints?after=0", headers=learners[0])
+
+    check("first visit", "GET /progress/{video_id}", "GET", f"/progress/{video_id}", headers=learners[0])
+    check("returning", "GET /progress/{video_id}", "GET", f"/progress/{video_id}", headers=learners[0])
+    check("first visit", "PUT /progress/{video_id}", "PUT", f"/progress/{video_id}",
+          json={"current_timestamp": 12.0}, headers=learners[1])
+    check("returning", "PUT /progress/{video_id}", "PUT", f"/progress/{video_id}",
+          json={"current_timestamp": 24.0}, headers=learners[1])
+
+    # One learner answers every checkpoint one at a time, each on a video without
+    # counter rows; the last answer completes it before the boards were ever read
+    leaderboard.__init__()
+    single = answers(video_id, LEARNER_EMAIL.format(2), misses=1)
+    for position, item in enumerate(single):
+        if position == 0:
+            label = "first answer, wrong, no counter rows"
+        elif position == len(single) - 1:
+            label = "completes the video, boards not built"
+        else:
+            label = "correct, no counter rows"
+        drop_stats(video_id)
+        check(label, "POST /questions/{question_id}/answer", "POST", f"/questions/{item['question_id']}/answer",
+              json={"answer": item["answer"], "current_timestamp": item["current_timestamp"]}, headers=learners[2])
+
+    # A learner without a progress row answers correctly straight away
+    drop_stats(video_id)
+    item = answers(video_id, LEARNER_EMAIL.format(4))[0]
+    check("first answer, correct, no progress or counter rows", "POST /questions/{question_id}/answer", "POST",
+          f"/questions/{item['question_id']}/answer",
+          json={"answer": item["answer"], "current_timestamp": item["current_timestamp"]}, headers=learners[4])
+
+    # Another answers them all in one batch, a miss first
+    leaderboard.__init__()
+    drop_stats(video_id)
+    batch = answers(video_id, LEARNER_EMAIL.format(3), misses=1)
+    check(f"{len(batch)} answers complete the video, no counter rows", "POST /videos/{video_id}/answers:batch", "POST",
+          f"/videos/{video_id}/answers:batch", json={"answers": batch}, headers=learners[3])
+    # The completion reached the counters, so the batch did the full work
+    if completed_learners(video_id) != 1:
+        print("FAIL the batch completion was not counted")
+        failures.append("batch completion")
+
+    check("soft delete", "DELETE /videos/{video_id}", "DELETE", f"/videos/{video_id}", expected=202, headers=admin)
+
+    print("OK" if not failures else f"{len(failures)} check(s) failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
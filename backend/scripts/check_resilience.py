@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Checks the Gemini resilience layer with simulated calls (no network):
+
+- during an outage where calls hang until their timeout, p99 latency stays
+  within the operation's deadline and the breaker opens, so later calls fail
+  fast instead of waiting
+- a local error (bad prompt, unparseable schema) on the half-open probe leaves
+  the breaker open, and the probe slot goes to the next call
+- once the service recovers, a successful probe closes the breaker
+
+Run from backend/: python scripts/check_resilience.py
+For latency against a stand-in HTTP server, see benchmarks/bench_gemini_outage.py.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("GEMINI_API_KEY", "check")
+os.environ.setdefault("JWT_SECRET_KEY", "check")
+
+from app.services.resilience import (  # noqa: E402
+    OPERATION_DEADLINES, AdaptiveConcurrencyLimiter, CircuitBreaker, ResilientCaller, ServiceUnavailableError,
+)
+
+OPERATION = "check"
+DEADLINE_SECONDS = 0.5
+RESET_SECONDS = 0.3
+REQUESTS = 200
+CONCURRENCY = 32
+# Thread scheduling on a loaded machine, on top of the deadline
+SLACK_SECONDS = 0.25
+
+
+def hanging_call(timeout: float):
+    """An HTTP call to a service that never answers: waits out its timeout."""
+    time.sleep(timeout)
+    raise TimeoutError("read timed out")
+
+
+def expect(failures: list, condition: bool, message: str) -> None:
+    print(("ok   " if condition else "FAIL ") + message)
+    if not condition:
+        failures.append(message)
+
+
+def check_outage(failures: list) -> None:
+    caller = ResilientCaller(CircuitBreaker(failure_threshold=5, reset_timeout=60), AdaptiveConcurrencyLimiter())
+
+    def timed(_):
+        started = time.perf_counter()
+        try:
+            caller.call(OPERATION, hanging_call)
+        except (TimeoutError, ServiceUnavailableError):
+            pass
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        latencies = sorted(pool.map(timed, range(REQUESTS)))
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    fast = sum(1 for latency in latencies if latency < 0.05)
+    expect(failures, p99 <= DEADLINE_SECONDS + SLACK_SECONDS,
+           f"hanging service: p99 {p99 * 1000:.0f} ms within the {DEADLINE_SECONDS * 1000:.0f} ms deadline")
+    expect(failures, caller.breaker.state == "open" and fast >= REQUESTS // 2,
+           f"the breaker opens and {fast} of {REQUESTS} calls fail fast")
+
+
+def check_probe(failures: list) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET_SECONDS)
+    caller = ResilientCaller(breaker, AdaptiveConcurrencyLimiter())
+    try:
+        caller.call(OPERATION, hanging_call)
+    except TimeoutError:
+        pass
+    time.sleep(RESET_SECONDS)
+
+    def local_bug(timeout: float):
+        raise ValueError("prompt template is broken")
+
+    try:
+        caller.call(OPERATION, local_bug)
+    except ValueError:
+        pass
+    expect(failures, breaker.state != "closed", f"a local error on the probe leaves the breaker {breaker.state}")
+    expect(failures, caller.call(OPERATION, lambda timeout: "ok") == "ok" and breaker.state == "closed",
+           "the next call gets the probe, and its success closes the breaker")
+
+
+def main():
+    failures = []
+    OPERATION_DEADLINES[OPERATION] = DEADLINE_SECONDS
+    check_outage(failures)
+    check_probe(failures)
+    print("OK" if not failures else f"{len(failures)} check(s) failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
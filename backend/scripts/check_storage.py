@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Round-trips an object through the configured media storage backend.
+
+Puts a small object, finds it with size/list, reads back a byte range, resolves its URL (fetching it
+when it is absolute, e.g. presigned) and deletes it. Against MinIO:
+
+    docker compose --profile s3 up -d minio
+    STORAGE_BACKEND=s3 S3_BUCKET=tubetutor-media S3_ENDPOINT_URL=http://localhost:9000 \\
+        S3_ACCESS_KEY_ID=minioadmin S3_SECRET_ACCESS_KEY=minioadmin python scripts/check_storage.py
+
+Run from backend/ (the bucket must exist).
+"""
+
+import io
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.services.storage import storage  # noqa: E402
+
+PAYLOAD = bytes(range(256)) * 64
+
+
+def main():
+    key = f"checks/{uuid.uuid4()}.bin"
+    print(f"backend: {settings.storage_backend}, key: {key}")
+    failed = False
+    try:
+        size = storage.put(key, io.BytesIO(PAYLOAD), "application/octet-stream")
+        if size != len(PAYLOAD):
+            print(f"FAIL: put stored {size} bytes, expected {len(PAYLOAD)}")
+            failed = True
+
+        if storage.size(key) != len(PAYLOAD) or key not in {item.key for item in storage.list("checks/")}:
+            print("FAIL: size/list do not report the object")
+            failed = True
+
+        ranged = b"".join(storage.get_range(key, 100, 1123))
+        if ranged != PAYLOAD[100:1124]:
+            print(f"FAIL: range 100-1123 returned {len(ranged)} bytes that do not match")
+            failed = True
+
+        with storage.local_path(key) as path:
+            with open(path, "rb") as f:
+                if f.read() != PAYLOAD:
+                    print("FAIL: local_path content does not match")
+                    failed = True
+
+        url = storage.url(key)
+        print(f"url: {url}")
+        if url.startswith("http"):
+            response = httpx.get(url, headers={"Range": "bytes=0-15"})
+            if response.status_code not in (200, 206) or not PAYLOAD.startswith(response.content[:16]):
+                print(f"FAIL: GET url returned {response.status_code}")
+                failed = True
+    finally:
+        storage.delete(key)
+    storage.delete(key)  # deleting a missing object is not an error
+    if storage.size(key) is not None:
+        print("FAIL: the deleted object still has a size")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
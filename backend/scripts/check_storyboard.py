@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Generates seek-preview storyboards for synthetic ffmpeg clips and checks them:
+
+- sprite sheets have the configured grid of tiles, and no more sheets than needed
+- the WebVTT index has one cue per frame, covers the whole clip without gaps and
+  points every cue inside its sprite
+- long videos get a stretched interval, so the frame count stays bounded
+- generation cost, reported in seconds per hour of video, stays under --budget
+- the API serves the index and the sprites with immutable cache headers, and
+  the video itself without them
+
+Needs ffmpeg on PATH (prints SKIP otherwise). Run from backend/:
+python scripts/check_storyboard.py [--budget 60]
+"""
+
+import argparse
+import math
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORK_DIR = tempfile.mkdtemp(prefix="tubetutor-storyboard-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'check.db')}"
+os.environ["LOCAL_STORAGE_ROOT"] = os.path.join(WORK_DIR, "uploads")
+os.environ["STORAGE_BACKEND"] = "local"
+os.environ["BENCH_LEARNERS"] = "1"
+
+# (label, seconds, size): widescreen, 4:3 and an hour-long lecture
+CLIPS = [
+    ("short 16:9", 95, "320x180"),
+    ("4:3", 30, "240x180"),
+    ("one hour", 3600, "128x72"),
+]
+
+
+def make_clip(path: str, seconds: int, size: str) -> None:
+    # A keyframe every 2s, like a typical lecture encode
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc=duration={seconds}:size={size}:rate=5",
+        "-c:v", "libx264", "-preset", "ultrafast", "-g", "10", path,
+    ], check=True)
+
+
+def jpeg_size(path: str) -> tuple:
+    """(width, height) from the JPEG's start-of-frame marker."""
+    with open(path, "rb") as f:
+        data = f.read()
+    position = 2
+    while position < len(data):
+        marker, length = struct.unpack(">HH", data[position:position + 4])
+        if marker in (0xFFC0, 0xFFC1, 0xFFC2):
+            height, width = struct.unpack(">HH", data[position + 5:position + 9])
+            return width, height
+        position += 2 + length
+    raise ValueError(f"no frame header in {path}")
+
+
+def parse_cues(vtt: str) -> list:
+    cues = []
+    lines = vtt.splitlines()
+    for line, target in zip(lines, lines[1:]):
+        if "-->" not in line:
+            continue
+        start, end = (seconds(part) for part in line.split("-->"))
+        url, fragment = target.split("#xywh=")
+        x, y, w, h = (int(value) for value in fragment.split(","))
+        cues.append((start, end, url, x, y, w, h))
+    return cues
+
+
+def seconds(timestamp: str) -> float:
+    hours, minutes, rest = timestamp.strip().split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + float(rest)
+
+
+def expect(failures: list, condition: bool, message: str) -> None:
+    print(("ok   " if condition else "FAIL ") + message)
+    if not condition:
+        failures.append(message)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=float, default=60.0, help="max generation seconds per hour of video")
+    args = parser.parse_args()
+    if not shutil.which("ffmpeg"):
+        print("SKIP ffmpeg is not installed")
+        return
+
+    from fastapi.testclient import TestClient
+    from benchmarks.bench_app import app, VIDEO_TITLE
+    from app.config import settings
+    from app.database import SessionLocal
+    from app.models import Video
+    from app.services.storage import storage
+    from app.services.storyboard import IMMUTABLE_CACHE_CONTROL, create_storyboard, render_vtt, storyboard_interval
+
+    failures = []
+    per_sheet = settings.storyboard_columns * settings.storyboard_rows
+    grid = (settings.storyboard_tile_width * settings.storyboard_columns,
+            settings.storyboard_tile_height * settings.storyboard_rows)
+    layouts = {}
+    for index, (label, duration, size) in enumerate(CLIPS):
+        clip = os.path.join(WORK_DIR, f"clip{index}.mp4")
+        make_clip(clip, duration, size)
+        layout = create_storyboard(1000 + index, clip, duration)
+        if layout is None:
+            expect(failures, False, f"{label}: storyboard generated")
+            continue
+        layouts[label] = layout
+        paths = [storage._path(key) for key in layout["sprites"]]
+        frames = math.ceil(duration / storyboard_interval(duration))
+        expect(failures, len(paths) == math.ceil(frames / per_sheet) and layout["frames"] == frames,
+               f"{label}: {frames} frames in {len(paths)} sprite sheet(s)")
+        expect(failures, all(jpeg_size(path) == grid for path in paths), f"{label}: every sheet is {grid[0]}x{grid[1]}")
+
+        cues = parse_cues(render_vtt(layout, storage.url))
+        contiguous = all(abs(a[1] - b[0]) < 0.002 for a, b in zip(cues, cues[1:]))
+        covers = cues[0][0] == 0 and abs(cues[-1][1] - duration) < 0.002
+        inside = all(x + w <= grid[0] and y + h <= grid[1] for _, _, _, x, y, w, h in cues)
+        expect(failures, len(cues) == frames and contiguous and covers and inside,
+               f"{label}: {len(cues)} cues cover 0-{duration}s inside their sprites")
+        cost = layout["generation_seconds"] * 3600 / duration
+        expect(failures, cost <= args.budget, f"{label}: {cost:.1f}s per hour of video (budget {args.budget:g}s)")
+
+    hour = layouts.get("one hour")
+    expect(failures, bool(hour) and hour["frames"] <= settings.storyboard_max_frames
+           and hour["interval"] > settings.storyboard_interval_seconds,
+           f"an hour-long video is capped at {settings.storyboard_max_frames} frames")
+
+    db = SessionLocal()
+    video = db.query(Video).filter(Video.title == VIDEO_TITLE).one()
+    video.storyboard = layouts.get("short 16:9")
+    db.commit()
+    video_id = video.id
+    db.close()
+    os.makedirs(os.path.join(settings.local_storage_root, "videos"), exist_ok=True)
+    shutil.copy(os.path.join(WORK_DIR, "clip0.mp4"), os.path.join(settings.local_storage_root, "videos", "clip0.mp4"))
+    video_url = f"{settings.local_storage_url}/videos/clip0.mp4"
+
+    client = TestClient(app)
+    listed = client.get(f"/videos/{video_id}").json()
+    index = client.get(listed["storyboard_url"] or "/missing")
+    expect(failures, index.status_code == 200 and index.headers["content-type"].startswith("text/vtt")
+           and index.headers.get("cache-control") == IMMUTABLE_CACHE_CONTROL,
+           "the index is served as text/vtt with immutable caching")
+    sprite = client.get(parse_cues(index.text)[0][2])
+    expect(failures, sprite.status_code == 200 and sprite.headers.get("cache-control") == IMMUTABLE_CACHE_CONTROL,
+           "sprites are served with immutable caching")
+    media = client.get(video_url, headers={"Range": "bytes=0-99"})
+    expect(failures, media.status_code in (200, 206) and "immutable" not in media.headers.get("cache-control", ""),
+           "the video file keeps the default caching")
+
+    print("OK" if not failures else f"{len(failures)} check(s) failed; files kept in {WORK_DIR}")
+    if not failures:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Checks the transcription backends and scheduler against fake backends (no
+Whisper, no network):
+
+- the Gemini Files backend polls with growing delays and deletes its upload on
+  success, FAILED state, timeout, model errors and cancellation
+- many remote jobs wait on one event loop without a thread each
+- the scheduler keeps short clips and idle-worker jobs local, offloads long
+  clips when Whisper is backed up, and retries failed remote jobs locally
+- with Whisper saturated, "auto" finishes a burst of lectures sooner than Whisper alone
+
+Fake time: a second of audio costs WHISPER_FACTOR * SCALE real seconds locally,
+Gemini OVERHEAD + GEMINI_FACTOR per second of audio, times SCALE.
+Run from backend/: python scripts/check_transcription.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("GEMINI_API_KEY", "")
+os.environ.setdefault("JWT_SECRET_KEY", "check")
+
+from app.services.transcription import (  # noqa: E402
+    GeminiFilesBackend, TranscriptionError, TranscriptionScheduler, WhisperBackend,
+)
+
+SCALE = 0.002
+WHISPER_FACTOR = 0.5
+GEMINI_OVERHEAD = 30.0
+GEMINI_FACTOR = 0.1
+LECTURE_SECONDS = 600.0
+
+
+class FakeFiles:
+    """The `client.aio.files` surface: a file turns ACTIVE after `states` polls."""
+
+    def __init__(self, states):
+        self.states = list(states)
+        self.polls = []
+        self.deleted = []
+
+    async def upload(self, file):
+        await asyncio.sleep(0)
+        return SimpleNamespace(name=f"files/{os.path.basename(file)}")
+
+    async def get(self, name):
+        self.polls.append(time.monotonic())
+        state = self.states.pop(0) if self.states else "ACTIVE"
+        return SimpleNamespace(name=name, state=SimpleNamespace(name=state), error=SimpleNamespace(message="bad media"))
+
+    async def delete(self, name):
+        await asyncio.sleep(0)
+        self.deleted.append(name)
+
+
+class FakeModels:
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.delay = delay
+        self.error = error
+
+    async def generate_content(self, model, contents, config=None):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        segments = [{"start": 0, "end": 4.5, "text": "Remote transcript."}]
+        return SimpleNamespace(text=json.dumps({"segments": segments}))
+
+
+def fake_client(files: FakeFiles, models: FakeModels):
+    return lambda: SimpleNamespace(aio=SimpleNamespace(files=files, models=models))
+
+
+def gemini(files, models, timeout=5.0, **kwargs) -> GeminiFilesBackend:
+    return GeminiFilesBackend(
+        GEMINI_OVERHEAD, GEMINI_FACTOR, timeout, client_factory=fake_client(files, models),
+        poll_initial_seconds=0.01, poll_max_seconds=0.08, **kwargs,
+    )
+
+
+def fake_whisper(path: str) -> dict:
+    duration = float(os.path.basename(path).split("-")[0])
+    time.sleep(duration * WHISPER_FACTOR * SCALE)
+    return {"text": "Local transcript.", "segments": [{"start": 0.0, "end": 4.5, "text": "Local transcript."}]}
+
+
+class FakeRemote(GeminiFilesBackend):
+    """Gemini-shaped costs without the Files API; optionally failing."""
+
+    def __init__(self, fail: bool = False):
+        super().__init__(GEMINI_OVERHEAD, GEMINI_FACTOR, 60.0, client_factory=lambda: None)
+        self.fail = fail
+
+    async def transcribe(self, video_path, duration):
+        await asyncio.sleep((GEMINI_OVERHEAD + duration * GEMINI_FACTOR) * SCALE)
+        if self.fail:
+            raise TranscriptionError("remote failure")
+        return {"text": "Remote transcript.", "segments": []}
+
+
+def scheduler(mode: str, remote=None) -> TranscriptionScheduler:
+    return TranscriptionScheduler(
+        WhisperBackend(1, WHISPER_FACTOR, transcribe_file=fake_whisper),
+        remote if remote is not None else FakeRemote(), mode=mode, remote_min_duration=120.0,
+    )
+
+
+def run_burst(target: TranscriptionScheduler, durations) -> float:
+    started = time.monotonic()
+    with ThreadPoolExecutor(len(durations)) as pool:
+        results = list(pool.map(lambda d: target.transcribe(f"{d:g}-clip.mp4", d), durations))
+    assert all(results), "every clip gets a transcript"
+    return time.monotonic() - started
+
+
+def expect(failures: list, condition: bool, message: str) -> None:
+    print(("ok   " if condition else "FAIL ") + message)
+    if not condition:
+        failures.append(message)
+
+
+async def check_gemini(failures: list) -> None:
+    files = FakeFiles(["PROCESSING"] * 4)
+    transcript = await gemini(files, FakeModels()).transcribe("lecture.mp4", 600)
+    gaps = [b - a for a, b in zip(files.polls, files.polls[1:])]
+    expect(failures, transcript["segments"][0]["text"] == "Remote transcript.", "Gemini transcript is parsed into segments")
+    expect(failures, all(later >= earlier * 1.5 for earlier, later in zip(gaps, gaps[1:])),
+           f"polling backs off ({', '.join(f'{gap * 1000:.0f}' for gap in gaps)} ms)")
+    expect(failures, files.deleted == ["files/lecture.mp4"], "upload deleted after success")
+
+    cases = {
+        "FAILED state": (FakeFiles(["PROCESSING", "FAILED"]), FakeModels(), 5.0),
+        "timeout": (FakeFiles(["PROCESSING"] * 1000), FakeModels(), 0.2),
+        "model error": (FakeFiles([]), FakeModels(error=RuntimeError("boom")), 5.0),
+    }
+    for label, (files, models, timeout) in cases.items():
+        try:
+            await gemini(files, models, timeout=timeout).transcribe("lecture.mp4", 600)
+            raised = False
+        except Exception:
+            raised = True
+        expect(failures, raised and files.deleted == ["files/lecture.mp4"], f"upload deleted after {label}")
+
+    files = FakeFiles(["PROCESSING"] * 1000)
+    task = asyncio.ensure_future(gemini(files, FakeModels()).transcribe("lecture.mp4", 600))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    expect(failures, files.deleted == ["files/lecture.mp4"], "upload deleted after cancellation")
+
+    threads_before = threading.active_count()
+    started = time.monotonic()
+    jobs = [gemini(FakeFiles(["PROCESSING"] * 3), FakeModels(delay=0.1)).transcribe(f"clip{i}.mp4", 600) for i in range(50)]
+    await asyncio.gather(*jobs)
+    elapsed = time.monotonic() - started
+    expect(failures, elapsed < 1.0 and threading.active_count() == threads_before,
+           f"50 concurrent remote jobs in {elapsed:.2f}s without extra threads")
+
+
+def check_scheduler(failures: list) -> None:
+    target = scheduler("auto")
+    expect(failures, target.choose(LECTURE_SECONDS) is target.local, "idle Whisper keeps a lecture local")
+    target.local.jobs, target.local.queued_seconds = 3, 3 * LECTURE_SECONDS
+    expect(failures, target.choose(LECTURE_SECONDS) is target.remote, "backed-up Whisper sends a lecture to Gemini")
+    expect(failures, target.choose(60.0) is target.local, "short clips stay local even when Whisper is busy")
+    target.local.jobs, target.local.queued_seconds = 0, 0.0
+    expect(failures, scheduler("whisper").choose(LECTURE_SECONDS).name == "whisper", "whisper mode never offloads")
+
+    failing = scheduler("gemini", remote=FakeRemote(fail=True))
+    transcript = failing.transcribe(f"{LECTURE_SECONDS:g}-clip.mp4", LECTURE_SECONDS)
+    expect(failures, transcript and transcript["text"] == "Local transcript.", "a failed remote job is transcribed locally")
+
+    burst = [LECTURE_SECONDS] * 8
+    local_only = run_burst(scheduler("whisper"), burst)
+    auto = scheduler("auto")
+    mixed = run_burst(auto, burst)
+    print(f"     8 lectures: whisper only {local_only:.2f}s, auto {mixed:.2f}s ({auto.counts})")
+    expect(failures, mixed < local_only / 2, "auto finishes the burst in under half the time")
+
+
+def main():
+    failures = []
+    asyncio.run(check_gemini(failures))
+    check_scheduler(failures)
+    print("OK" if not failures else f"{len(failures)} check(s) failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Purges deleted videos and collects media files no video points at.
+
+The ingest worker runs both every LIFECYCLE_INTERVAL_SECONDS; with INGEST_MODE=inline
+(no worker) run this from cron instead. DELETE /videos/{id} purges right away in
+inline mode, so here it only catches up on purges interrupted by a restart.
+
+Run from backend/: python scripts/collect_garbage.py [--dry-run] [--min-age SECONDS]
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.lifecycle import collect_orphans, purge_deleted_videos  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dry-run", action="store_true", help="report orphaned files without deleting anything")
+    parser.add_argument("--min-age", type=float, help="only collect files older than this many seconds "
+                        "(default STORAGE_GC_MIN_AGE_SECONDS)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if not args.dry_run:
+        reports = purge_deleted_videos()
+        rows = sum(sum(report.rows.values()) for report in reports)
+        seconds = sum(report.seconds for report in reports)
+        print(f"Purged {len(reports)} deleted videos: {rows} rows in {seconds:.2f}s"
+              + (f" ({rows / seconds:.0f} rows/s)." if seconds else "."))
+    report = collect_orphans(args.min_age, dry_run=args.dry_run)
+    if report.missing:
+        print(f"Videos whose file is missing from storage: {', '.join(map(str, report.missing))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Recomputes the analytics counters from user progress.
+
+Answers keep the counters current; run this once after deploying analytics
+(to count answers given before it) or to repair them.
+
+Run from backend/: python scripts/rebuild_analytics.py [--video-id 12]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal  # noqa: E402
+from app.services.analytics import rebuild_stats  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--video-id", type=int, help="only this video (default: all)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        read = rebuild_stats(db, args.video_id)
+    finally:
+        db.close()
+    print(f"Rebuilt analytics from {read} progress rows.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Recomputes the leaderboards from user progress.
+
+Completions keep the boards current; run this after deploying leaderboards (to
+rank learners who finished videos before), after Redis lost its data, or to
+repair the boards. The API also rebuilds on first use when the boards are missing.
+
+Run from backend/: python scripts/rebuild_leaderboards.py [--if-missing]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal  # noqa: E402
+from app.services.leaderboard import leaderboard, rebuild_leaderboards  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--if-missing", action="store_true", help="only if the boards were never built or were flushed")
+    args = parser.parse_args()
+
+    if args.if_missing and leaderboard.is_built():
+        print("Leaderboards are already built.")
+        return
+    db = SessionLocal()
+    try:
+        read = rebuild_leaderboards(db)
+    finally:
+        db.close()
+    print(f"Rebuilt leaderboards from {read} completed progress rows.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Fills the transcript search index for videos ingested before search existed.
+
+New uploads are indexed by ingest. Older videos have no Whisper segments
+stored, so their timed retrieval chunks (about 80 words each) are indexed
+instead, or the transcript's sentences when even those are missing.
+
+Run from backend/: python scripts/reindex_search.py [--all]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal  # noqa: E402
+from app.models import Video, TranscriptChunk, TranscriptSegment  # noqa: E402
+from app.services.retrieval import segments_from_text  # noqa: E402
+from app.services.search import index_segments  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--all", action="store_true", help="also re-index videos that already have segments")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        videos = db.query(Video.id).filter(Video.transcript.isnot(None))
+        if not args.all:
+            videos = videos.filter(~Video.id.in_(db.query(TranscriptSegment.video_id)))
+        video_ids = [video_id for (video_id,) in videos]
+        for video_id in video_ids:
+            chunks = (
+                db.query(TranscriptChunk.start_time, TranscriptChunk.end_time, TranscriptChunk.text)
+                .filter(TranscriptChunk.video_id == video_id)
+                .order_by(TranscriptChunk.position)
+                .all()
+            )
+            if chunks:
+                segments = [{"start": c.start_time, "end": c.end_time, "text": c.text} for c in chunks]
+            else:
+                segments = segments_from_text(db.query(Video.transcript).filter(Video.id == video_id).scalar())
+            count = index_segments(db, video_id, segments)
+            db.commit()
+            print(f"Video {video_id}: {count} segments")
+    finally:
+        db.close()
+    print(f"Indexed {len(video_ids)} videos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,31 @@
-import React from 'react'
+import React, { useState } from 'react'
 import { Play, CheckCircle, Clock } from 'lucide-react'
+import { cueAt } from '../../hooks/useStoryboard.jsx'
 
-const ProgressBar = ({ progress, questions, currentTime, duration }) => {
+const formatTime = (seconds) => `${Math.floor(seconds / 60)}:${(seconds % 60).toFixed(0).padStart(2, '0')}`
+
+const ProgressBar = ({ progress, questions, currentTime, duration, storyboard = [], onSeek }) => {
   const completedCount = progress.completed_questions?.length || 0
   const totalQuestions = questions.length
   const progressPercentage = duration ? (currentTime / duration) * 100 : 0
+  // Where the pointer is over the bar: the preview is drawn from the sprite, no request to the video
+  const [hover, setHover] = useState(null)
+
+  const timeAt = (event) => {
+    const rect = event.currentTarget.getBoundingClientRect()
+    const ratio = Math.min(Math.max((event.clientX - rect.left) / rect.width, 0), 1)
+    return { ratio, time: ratio * duration }
+  }
+
+  const handleHover = (event) => {
+    if (duration) setHover(timeAt(event))
+  }
+
+  const handleClick = (event) => {
+    if (duration && onSeek) onSeek(timeAt(event).time)
+  }
+
+  const hoverCue = hover ? cueAt(storyboard, hover.time) : null
 
   return (
     <div className="bg-white rounded-lg p-6 shadow-md">
@@ -28,11 +49,35 @@ const ProgressBar = ({ progress, questions, currentTime, duration }) => {
           <span>Video Progress</span>
           <span>{Math.floor(currentTime / 60)}:{(currentTime % 60).toFixed(0).padStart(2, '0')} / {duration ? `${Math.floor(duration / 60)}:${(duration % 60).toFixed(0).padStart(2, '0')}` : '--:--'}</span>
         </div>
-        <div className="w-full bg-gray-200 rounded-full h-2">
+        <div
+          className={`relative w-full bg-gray-200 rounded-full h-2 ${onSeek ? 'cursor-pointer' : ''}`}
+          onMouseMove={handleHover}
+          onMouseLeave={() => setHover(null)}
+          onClick={handleClick}
+        >
           <div 
             className="bg-primary-600 h-2 rounded-full transition-all duration-300"
             style={{ width: `${progressPercentage}%` }}
           />
+          {hover && (
+            <div
+              className="absolute bottom-4 -translate-x-1/2 flex flex-col items-center pointer-events-none"
+              style={{ left: `${hover.ratio * 100}%` }}
+            >
+              {hoverCue && (
+                <div
+                  className="rounded shadow-md border border-gray-300"
+                  style={{
+                    width: hoverCue.w,
+                    height: hoverCue.h,
+                    backgroundImage: `url(${hoverCue.url})`,
+                    backgroundPosition: `-${hoverCue.x}px -${hoverCue.y}px`,
+                  }}
+                />
+              )}
+              <span className="mt-1 px-1 text-xs text-white bg-gray-900 rounded">{formatTime(hover.time)}</span>
+            </div>
+          )}
         </div>
       </div>
 
@@ -1,12 +1,16 @@
 import React, { useState, useEffect, useRef } from 'react'
-import { useParams } from 'react-router-dom'
+import { useParams, useSearchParams } from 'react-router-dom'
 import { videoService, questionService, progressService } from '../../services/auth.jsx'
 import QuestionModal from './QuestionModal.jsx'
 import ProgressBar from './ProgressBar.jsx'
+import { useStoryboard } from '../../hooks/useStoryboard.jsx'
 import toast from 'react-hot-toast'
 
 const VideoPlayer = () => {
   const { id } = useParams()
+  // ?t= comes from search results; the seek rules still apply to it
+  const [searchParams] = useSearchParams()
+  const startAt = Number(searchParams.get('t')) || 0
   const videoRef = useRef(null)
   const [video, setVideo] = useState(null)
   const [questions, setQuestions] = useState([])
@@ -16,6 +20,7 @@ const VideoPlayer = () => {
   const [currentQuestion, setCurrentQuestion] = useState(null)
   const [isBlocked, setIsBlocked] = useState(false)
   const [loading, setLoading] = useState(true)
+  const storyboard = useStoryboard(video?.storyboard_url)
 
   useEffect(() => {
     loadVideoData()
@@ -29,21 +34,20 @@ const VideoPlayer = () => {
 
   const loadVideoData = async () => {
     try {
-      const [videoData, questionsData, progressData] = await Promise.all([
-        videoService.getVideo(id),
-        videoService.getVideoQuestions(id),
-        progressService.getProgress(id),
-      ])
+      // Video, ordered questions and progress arrive in a single round trip
+      const session = await videoService.getVideoSession(id)
+      const { video: videoData, questions: questionsData, progress: progressData } = session
       
       setVideo(videoData)
       setQuestions(questionsData)
       setProgress(progressData)
       
-      // Set video to last known position
-      if (progressData.current_timestamp > 0) {
+      // Set video to the linked moment, or else the last known position
+      const resumeAt = startAt || progressData.current_timestamp
+      if (resumeAt > 0) {
         setTimeout(() => {
           if (videoRef.current) {
-            videoRef.current.currentTime = progressData.current_timestamp
+            videoRef.current.currentTime = resumeAt
           }
         }, 1000)
       }
@@ -94,6 +98,10 @@ const VideoPlayer = () => {
       } else {
         if (response.retries_left > 0) {
           toast.error(`Incorrect. ${response.retries_left} retries left.`)
+          // The retry asks a different variant of the same checkpoint
+          if (response.next_question) {
+            setCurrentQuestion(response.next_question)
+          }
         } else {
           // Rewind video
           const newTime = Math.max(0, currentTime - response.rewind_seconds)
@@ -106,6 +114,10 @@ const VideoPlayer = () => {
         }
       }
     } catch (error) {
+      if (error.response?.status === 429) {
+        toast.error(`Too many attempts. Try again in ${error.response.headers['retry-after']}s.`)
+        return
+      }
       toast.error('Failed to submit answer')
       console.error(error)
     }
@@ -143,6 +155,13 @@ const VideoPlayer = () => {
     return true
   }
 
+  // Seeking from the previewed progress bar follows the same rules as the native controls
+  const seekTo = (newTime) => {
+    if (handleSeek(newTime) && videoRef.current) {
+      videoRef.current.currentTime = newTime
+    }
+  }
+
   const handleTimeUpdate = (e) => {
     setCurrentTime(e.target.currentTime)
   }
@@ -175,7 +194,7 @@ const VideoPlayer = () => {
       <div className="bg-black rounded-lg overflow-hidden mb-6">
         <video
           ref={videoRef}
-          src={`${import.meta.env.VITE_API_URL}${video.video_url}`}
+          src={/^https?:\/\//.test(video.video_url) ? video.video_url : `${import.meta.env.VITE_API_URL}${video.video_url}`}
           onTimeUpdate={handleTimeUpdate}
           onSeeked={handleSeeked}
           controls={!isBlocked}
@@ -189,9 +208,12 @@ const VideoPlayer = () => {
         questions={questions}
         currentTime={currentTime}
         duration={video.duration}
+        storyboard={storyboard}
+        onSeek={seekTo}
       />
 
       <QuestionModal
+        key={currentQuestion?.question_text}
         isOpen={showModal}
         question={currentQuestion}
         onSubmit={handleAnswerSubmit}
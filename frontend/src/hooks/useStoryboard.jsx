@@ -0,0 +1,61 @@
+import { useEffect, useState } from 'react'
+
+const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
+
+const parseTimestamp = (value) => {
+  const parts = value.trim().split(':').map(Number)
+  return parts.reduce((total, part) => total * 60 + part, 0)
+}
+
+// Cues of a WebVTT thumbnail index: "start --> end" followed by "sprite.jpg#xywh=x,y,w,h"
+export const parseStoryboard = (text, baseUrl) => {
+  const cues = []
+  const lines = text.split(/\r?\n/)
+  for (let i = 0; i < lines.length - 1; i++) {
+    if (!lines[i].includes('-->')) continue
+    const [start, end] = lines[i].split('-->')
+    const [src, fragment] = lines[i + 1].trim().split('#xywh=')
+    if (!fragment) continue
+    const [x, y, w, h] = fragment.split(',').map(Number)
+    cues.push({
+      start: parseTimestamp(start),
+      end: parseTimestamp(end),
+      url: new URL(src, baseUrl).href,
+      x, y, w, h,
+    })
+  }
+  return cues
+}
+
+// Loads a video's seek-preview cues once; [] while loading or when it has none
+export const useStoryboard = (storyboardUrl) => {
+  const [cues, setCues] = useState([])
+
+  useEffect(() => {
+    setCues([])
+    if (!storyboardUrl) return
+    const url = new URL(storyboardUrl, API_BASE_URL).href
+    const controller = new AbortController()
+    // Served with immutable cache headers, so revisits come from the browser cache
+    fetch(url, { signal: controller.signal })
+      .then((response) => (response.ok ? response.text() : ''))
+      .then((text) => setCues(parseStoryboard(text, url)))
+      .catch(() => {})
+    return () => controller.abort()
+  }, [storyboardUrl])
+
+  return cues
+}
+
+export const cueAt = (cues, time) => {
+  // Cues are in time order and evenly spaced, so a binary search finds the tile
+  let low = 0
+  let high = cues.length - 1
+  while (low <= high) {
+    const mid = (low + high) >> 1
+    if (time < cues[mid].start) high = mid - 1
+    else if (time >= cues[mid].end) low = mid + 1
+    else return cues[mid]
+  }
+  return cues.length ? cues[Math.min(Math.max(low, 0), cues.length - 1)] : null
+}
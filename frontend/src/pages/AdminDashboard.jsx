@@ -83,6 +83,32 @@ const AdminDashboard = () => {
     }
   }
 
+  const watchIngest = (videoId) => {
+    const source = videoService.streamIngestEvents(videoId)
+    const toastId = toast.loading('Processing video...')
+    const labels = {
+      uploaded: () => 'Upload received',
+      transcribing: (data) => `Transcribing${data.percent != null ? ` (${data.percent}%)` : ''}...`,
+      generating_storyboard: () => 'Generating seek previews...',
+      generating_questions: (data) => `Generating question ${data.question}/${data.total}...`,
+    }
+
+    Object.entries(labels).forEach(([stage, label]) => {
+      source.addEventListener(stage, (event) => {
+        toast.loading(label(JSON.parse(event.data)), { id: toastId })
+      })
+    })
+    source.addEventListener('ready', () => {
+      toast.success('Video is ready', { id: toastId })
+      source.close()
+      loadVideos()
+    })
+    source.addEventListener('failed', () => {
+      toast.error('Video processing failed', { id: toastId })
+      source.close()
+    })
+  }
+
   const handleSubmit = async (e) => {
     e.preventDefault()
     
@@ -100,8 +126,9 @@ const AdminDashboard = () => {
       formData.append('question_timestamps', JSON.stringify(uploadData.questionTimestamps))
       formData.append('video_file', uploadData.videoFile)
 
-      await videoService.uploadVideo(formData)
+      const { video_id: videoId } = await videoService.uploadVideo(formData)
       toast.success('Video uploaded successfully!')
+      watchIngest(videoId)
       setShowUploadForm(false)
       setUploadData({
         title: '',
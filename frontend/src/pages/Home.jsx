@@ -1,11 +1,14 @@
 import React, { useState, useEffect } from 'react'
 import { Link } from 'react-router-dom'
 import { videoService } from '../services/auth'
-import { Play, Clock, User } from 'lucide-react'
+import { Play, Clock, User, Search } from 'lucide-react'
 
 const Home = () => {
   const [videos, setVideos] = useState([])
   const [loading, setLoading] = useState(true)
+  const [query, setQuery] = useState('')
+  const [search, setSearch] = useState(null)
+  const [searching, setSearching] = useState(false)
 
   useEffect(() => {
     loadVideos()
@@ -22,8 +25,37 @@ const Home = () => {
     }
   }
 
+  const runSearch = async (e, offset = 0) => {
+    e?.preventDefault()
+    if (!query.trim()) {
+      setSearch(null)
+      return
+    }
+    setSearching(true)
+    try {
+      const data = await videoService.searchTranscripts(query.trim(), offset)
+      setSearch(offset > 0 ? { ...data, results: [...search.results, ...data.results] } : data)
+    } catch (error) {
+      console.error('Search failed:', error)
+    } finally {
+      setSearching(false)
+    }
+  }
+
+  // Snippets mark matches with <mark>; split them out instead of injecting HTML
+  const renderSnippet = (snippet) =>
+    snippet.split(/(<mark>.*?<\/mark>)/g).map((part, index) =>
+      part.startsWith('<mark>')
+        ? <mark key={index} className="bg-primary-100 text-primary-700 rounded px-0.5">{part.slice(6, -7)}</mark>
+        : part
+    )
+
   const formatDuration = (seconds) => {
     if (!seconds) return '--:--'
+    return formatTimestamp(seconds)
+  }
+
+  const formatTimestamp = (seconds) => {
     const minutes = Math.floor(seconds / 60)
     const remainingSeconds = Math.floor(seconds % 60)
     return `${minutes}:${remainingSeconds.toString().padStart(2, '0')}`
@@ -48,6 +80,53 @@ const Home = () => {
         </p>
       </div>
 
+      <form onSubmit={runSearch} className="max-w-2xl mx-auto mb-10 flex gap-2">
+        <div className="relative flex-1">
+          <Search className="w-5 h-5 text-gray-400 absolute left-3 top-1/2 -translate-y-1/2" />
+          <input
+            type="search"
+            value={query}
+            onChange={(e) => setQuery(e.target.value)}
+            placeholder="Search what was said in any lecture"
+            className="w-full pl-10 pr-4 py-3 rounded-xl border border-gray-200 focus:outline-none focus:ring-2 focus:ring-primary-500"
+          />
+        </div>
+        <button
+          type="submit"
+          disabled={searching}
+          className="bg-primary-600 hover:bg-primary-500 text-white font-medium px-5 rounded-xl disabled:opacity-50"
+        >
+          Search
+        </button>
+      </form>
+
+      {search && (
+        <div className="max-w-3xl mx-auto mb-12 bg-white rounded-2xl shadow-soft divide-y divide-gray-100">
+          {search.results.length === 0 ? (
+            <p className="p-6 text-gray-600 text-center">No lectures mention "{search.query}".</p>
+          ) : (
+            search.results.map((result, index) => (
+              <Link key={index} to={result.link} className="block p-5 hover:bg-gray-50 transition-colors">
+                <div className="flex items-center justify-between mb-1">
+                  <span className="font-semibold text-gray-900">{result.video_title}</span>
+                  <span className="text-sm text-primary-600 font-medium">{formatTimestamp(result.start_time || 0)}</span>
+                </div>
+                <p className="text-gray-600 text-sm">{renderSnippet(result.snippet)}</p>
+              </Link>
+            ))
+          )}
+          {search.has_more && (
+            <button
+              onClick={(e) => runSearch(e, search.offset + search.limit)}
+              disabled={searching}
+              className="w-full p-4 text-primary-600 font-medium hover:bg-gray-50 disabled:opacity-50"
+            >
+              More results
+            </button>
+          )}
+        </div>
+      )}
+
       {videos.length === 0 ? (
         <div className="max-w-md mx-auto text-center py-16 px-4 bg-white rounded-2xl shadow-soft">
           <div className="bg-primary-50 w-20 h-20 mx-auto rounded-xl flex items-center justify-center mb-6">
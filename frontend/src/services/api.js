@@ -31,4 +31,21 @@ api.interceptors.response.use(
   }
 )
 
+// POSTs with an Idempotency-Key, resending with the same key when the request
+// timed out, the connection dropped or the server failed: the API runs the work
+// once and answers repeats with the first response
+export async function postIdempotent(url, data, config = {}, retries = 2) {
+  const headers = { ...config.headers, 'Idempotency-Key': crypto.randomUUID() }
+  for (let attempt = 0; ; attempt++) {
+    try {
+      return await api.post(url, data, { ...config, headers })
+    } catch (error) {
+      const status = error.response?.status
+      const retryable = !error.response || status >= 500 || status === 409
+      if (!retryable || attempt >= retries) throw error
+      await new Promise((resolve) => setTimeout(resolve, 1000 * 2 ** attempt))
+    }
+  }
+}
+
 export default api
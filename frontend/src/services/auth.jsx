@@ -1,4 +1,4 @@
-import api from './api'
+import api, { postIdempotent } from './api'
 
 export const authService = {
   async login(email, password) {
@@ -39,7 +39,7 @@ export const videoService = {
   },
 
   async uploadVideo(formData) {
-    const response = await api.post('/videos/upload', formData, {
+    const response = await postIdempotent('/videos/upload', formData, {
       headers: {
         'Content-Type': 'multipart/form-data',
       },
@@ -47,11 +47,27 @@ export const videoService = {
     return response.data
   },
 
+  // EventSource cannot send headers, so the token goes in the query string
+  streamIngestEvents(videoId) {
+    const token = localStorage.getItem('access_token')
+    return new EventSource(`${api.defaults.baseURL}/videos/${videoId}/events?access_token=${token}`)
+  },
+
+  async getVideoSession(videoId) {
+    const response = await api.get(`/videos/${videoId}/session`)
+    return response.data
+  },
+
   async getVideoQuestions(videoId) {
     const response = await api.get(`/videos/${videoId}/questions`)
     return response.data
   },
 
+  async searchTranscripts(query, offset = 0) {
+    const response = await api.get('/search/', { params: { q: query, offset } })
+    return response.data
+  },
+
   // Add to videoService in auth.jsx
 async deleteVideo(id) {
   const response = await api.delete(`/videos/${id}`)
@@ -70,7 +86,7 @@ async updateVideo(id, formData) {
 
 export const questionService = {
   async submitAnswer(questionId, answer, currentTimestamp) {
-    const response = await api.post(`/questions/${questionId}/answer`, {
+    const response = await postIdempotent(`/questions/${questionId}/answer`, {
       answer,
       current_timestamp: currentTimestamp,
     })